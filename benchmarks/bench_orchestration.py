@@ -0,0 +1,320 @@
+"""
+Benchmark and regression suite for the orchestration path, run without any DCC installed.
+
+Generates synthetic sequences of 1k, 10k and 100k frames with gaps and mixed extensions, then
+times frame range gathering, knob schema and argument parser construction, knob payload
+building and the Nuke launcher's graph build and render (nuke/main.py) against the stand-in
+`nuke` module of benchmarks/stand_in. Results can be saved as a JSON baseline and later runs
+compared against it; the comparison exits with 1 when a case got slower than the tolerance,
+so it can gate CI on a given host. Baselines are only comparable on the host that recorded
+them, so they are not committed: each host saves its own under benchmarks/baselines.
+
+    python benchmarks/bench_orchestration.py --save-baseline
+    python benchmarks/bench_orchestration.py --compare --tolerance 0.25
+    python benchmarks/bench_orchestration.py --sizes 1000 10000 --case gather --runs 10
+
+The pipeline package (mvl_core_pipeline) is replaced by the stand-in of benchmarks/stand_in
+too, so only the Python dependencies (PyYAML) need to be importable.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import socket
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+STAND_IN_DIR = os.path.join(BENCH_DIR, "stand_in")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "orchestration.json")
+BASELINE_VERSION = 1
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+FIRST_FRAME = 1001
+# Every GAP_EVERY-th frame of a synthetic sequence is missing.
+GAP_EVERY = 97
+# Frames of a synthetic sequence also written as a JPEG proxy and as DPX, in the same directory.
+JPEG_EVERY = 10
+DPX_FRAMES = 100
+# Frames rendered by the end to end launcher case.
+RENDER_FRAMES = 1000
+
+DAILY_ARGS = [
+    "--f_version_name", "v012", "--f_shot_name", "sh010", "--f_show", "GEN63", "--f_vendor", "MyStudio",
+    "--f_submission_note", "Lighting pass update", "--colorspace_in", "linear", "--colorspace_out", "sRGB",
+    "--mov64_codec", "h264", "--mov64_fps", "24",
+]
+
+
+def get_padding(size) -> int:
+    return max(4, len(str(FIRST_FRAME + size)))
+
+
+def make_sequence(root, size) -> str:
+    """
+    Write an empty-file sequence of size frames from FIRST_FRAME, every GAP_EVERY-th frame
+    missing, with a sparser JPEG sequence, a few DPX frames and non image files next to it.
+    A directory written by a previous run is reused.
+
+    Returns:
+        str: Pattern of the EXR sequence, e.g. "<root>/seq_1000/plate.####.exr".
+    """
+    directory = os.path.join(root, f"seq_{size}")
+    padding = get_padding(size)
+    pattern = os.path.join(directory, f"plate.{'#' * padding}.exr")
+    marker = os.path.join(directory, ".complete")
+    if os.path.exists(marker):
+        return pattern
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    for offset in range(size):
+        if offset % GAP_EVERY == GAP_EVERY - 1:
+            continue
+        frame = f"{FIRST_FRAME + offset:0{padding}d}"
+        open(os.path.join(directory, f"plate.{frame}.exr"), "wb").close()
+        if offset % JPEG_EVERY == 0:
+            open(os.path.join(directory, f"plate.{frame}.jpg"), "wb").close()
+        if offset < DPX_FRAMES:
+            open(os.path.join(directory, f"plate.{frame}.dpx"), "wb").close()
+    for name in ("plate.nk", "notes.txt", "Thumbs.db", f"plate.{FIRST_FRAME:0{padding}d}.exr.tmp"):
+        open(os.path.join(directory, name), "wb").close()
+    open(marker, "wb").close()
+    return pattern
+
+
+def time_case(func, runs, setup=None) -> dict:
+    """
+    Call func runs times after one untimed warm-up call, setup (untimed) before every call.
+
+    Returns:
+        dict: Median, min and max wall time in ms and the number of runs.
+    """
+    if setup:
+        setup()
+    func()
+    timings = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "runs": runs,
+    }
+
+
+def get_cases(work_dir, sizes) -> list:
+    """
+    Build the benchmark cases.
+
+    Returns:
+        list: (name, func, setup) tuples, setup being None or a callable run before every call.
+    """
+    from mvl_make_dailies import common_utils, generate_movie, movie_commands
+    from mvl_make_dailies.nuke import main as nuke_main
+
+    cache_dir = os.path.join(work_dir, "cache")
+    patterns = {size: make_sequence(os.path.join(work_dir, "sequences"), size) for size in sizes}
+
+    def clear_sequence_index():
+        shutil.rmtree(os.path.join(cache_dir, "sequence_index"), ignore_errors=True)
+
+    def clear_schema():
+        common_utils.get_knob_schema.cache_clear()
+
+    def clear_schema_cache():
+        clear_schema()
+        os.environ["MVL_MAKE_DAILIES_SCHEMA_CACHE"] = "0"
+
+    def restore_schema_cache():
+        clear_schema()
+        os.environ.pop("MVL_MAKE_DAILIES_SCHEMA_CACHE", None)
+
+    cases = []
+    for size, pattern in sorted(patterns.items()):
+        args_dict = {"input": pattern, "slate": True, "cache_dir": cache_dir}
+        cases += [
+            (f"gather_frame_range/pattern/{size}", lambda p=pattern: common_utils.gather_frame_range(p), None),
+            (f"gather_frame_range/directory/{size}",
+             lambda p=pattern: common_utils.gather_frame_range(os.path.dirname(p)), None),
+            (f"resolve_frame_range/unindexed/{size}",
+             lambda a=args_dict: movie_commands.resolve_frame_range(a), clear_sequence_index),
+            (f"resolve_frame_range/indexed/{size}", lambda a=args_dict: movie_commands.resolve_frame_range(a), None),
+        ]
+
+    parser = generate_movie.build_parser()
+    source = patterns[min(patterns)]
+    output = os.path.join(work_dir, "dailies", "sh010.mov")
+    argv = ["daily", "--input", source, "--output", output, "--cache-dir", cache_dir] + DAILY_ARGS
+    cases += [
+        ("knob_schema/compile", common_utils.get_knob_schema, clear_schema_cache),
+        ("knob_schema/cached", common_utils.get_knob_schema, restore_schema_cache),
+        ("build_parser", generate_movie.build_parser, None),
+        ("parse_args/daily", lambda: parser.parse_args(argv), None),
+    ]
+
+    args_dict = vars(parser.parse_args(argv + ["--previews", "--deliverable", f"output={output[:-4]}_web.mov,fps=24"]))
+    frame_range = range(FIRST_FRAME - 1, FIRST_FRAME + RENDER_FRAMES)
+    cases += [
+        ("build_node_payloads", lambda: movie_commands.build_node_payloads(args_dict), None),
+        ("build_nuke_job", lambda: movie_commands.build_nuke_job(args_dict, frame_range), None),
+    ]
+
+    job = movie_commands.build_nuke_job(args_dict, frame_range)
+    template_job = dict(job, template=dict(job["template"], baked=None))
+
+    def remove_baked():
+        if os.path.exists(job["template"]["baked"]):
+            os.remove(job["template"]["baked"])
+
+    def build_graph(nuke_job):
+        nuke_main.generate_movie(
+            file_in_path=nuke_job["src"], file_out_path=nuke_job["dst"], slate_data=nuke_job["slate"],
+            overlay_data=nuke_job["burnin"], reformat_data=nuke_job["reformat"],
+            colorspace_data=nuke_job["colorspace"], write_data=nuke_job["write"],
+            first_frame=nuke_job["first"], last_frame=nuke_job["last"], save_script=True,
+            template_data=nuke_job["template"], slate_cache_data=nuke_job["slate_cache"],
+            deliverables_data=nuke_job["deliverables"], previews_data=nuke_job["previews"],
+        )
+
+    cases += [
+        ("nuke.generate_movie/template", lambda: build_graph(template_job), None),
+        ("nuke.generate_movie/bake", lambda: build_graph(job), remove_baked),
+        ("nuke.generate_movie/baked", lambda: build_graph(job), None),
+        (f"nuke.render_job/{RENDER_FRAMES}", lambda: nuke_main.render_job(job), None),
+    ]
+    return cases
+
+
+def compare_results(results, baseline, tolerance, min_delta_ms) -> list:
+    """
+    Compare results against a baseline.
+
+    Returns:
+        list: Names of the cases whose median got slower than the baseline median by more than
+        tolerance (a fraction) and min_delta_ms.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        delta = result["median_ms"] - base["median_ms"]
+        result["baseline_median_ms"] = base["median_ms"]
+        result["change"] = round(delta / base["median_ms"], 3) if base["median_ms"] else None
+        if delta > min_delta_ms and delta > base["median_ms"] * tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def get_environment() -> dict:
+    return {"host": socket.gethostname(), "python": platform.python_version(), "platform": platform.platform()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the orchestration path against a stand-in nuke module.")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Frame counts of the synthetic sequences.")
+    parser.add_argument("--case", default=None, help="Only run the cases whose name matches this regular expression.")
+    parser.add_argument("--work-dir", default=None,
+                        help="Directory for the synthetic sequences and caches, kept and reused between runs "
+                             "(default: a temporary directory).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline.")
+    parser.add_argument("--compare", action="store_true",
+                        help="Compare the results with --baseline and exit with 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Slowdown of a case median over the baseline, as a fraction, counted as a regression.")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Slowdowns under this many milliseconds are ignored, whatever the tolerance.")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        if not os.path.isfile(args.baseline):
+            parser.error(f"No baseline at {args.baseline}, run with --save-baseline first")
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BASELINE_VERSION:
+            parser.error(f"Baseline {args.baseline} has version {baseline.get('version')}, expected {BASELINE_VERSION}")
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="mvl_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    sys.path.insert(0, STAND_IN_DIR)
+    sys.path.insert(1, os.path.join(REPO_ROOT, "python"))
+    # Set by rez in production.
+    os.environ.setdefault("REZ_MVL_MAKE_DAILIES_ROOT", REPO_ROOT)
+    os.environ["MVL_MAKE_DAILIES_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    os.environ.pop("MVL_MAKE_DAILIES_TRACE", None)
+    # Scripts saved by the launcher go to the work directory.
+    tempfile.tempdir = os.path.join(work_dir, "tmp")
+    shutil.rmtree(tempfile.tempdir, ignore_errors=True)
+    os.makedirs(tempfile.tempdir)
+    logging.disable(logging.WARNING)
+
+    results = {}
+    try:
+        print(f"Generating sequences of {', '.join(str(size) for size in args.sizes)} frames in {work_dir}")
+        cases = get_cases(work_dir, args.sizes)
+        case_filter = re.compile(args.case) if args.case else None
+        for name, func, setup in cases:
+            if case_filter and not case_filter.search(name):
+                continue
+            results[name] = time_case(func, args.runs, setup)
+            result = results[name]
+            print(f"{name:40s} median {result['median_ms']:9.2f} ms  "
+                  f"min {result['min_ms']:9.2f} ms  max {result['max_ms']:9.2f} ms")
+    finally:
+        logging.disable(logging.NOTSET)
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"version": BASELINE_VERSION, "environment": get_environment(), "sizes": args.sizes,
+              "results": {name: dict(result) for name, result in results.items()}}
+    failed = False
+    if baseline is not None:
+        if baseline.get("environment", {}).get("host") != report["environment"]["host"]:
+            print(f"Warning: the baseline was recorded on {baseline.get('environment', {}).get('host')}, "
+                  f"timings from other hosts are not comparable")
+        regressions = compare_results(results, baseline, args.tolerance, args.min_delta_ms)
+        print()
+        for name, result in results.items():
+            if "baseline_median_ms" not in result:
+                print(f"{name:40s} not in the baseline")
+                continue
+            status = "REGRESSION" if name in regressions else "ok"
+            change = f"{result['change']:+.1%}" if result["change"] is not None else "n/a"
+            print(f"{name:40s} {result['baseline_median_ms']:9.2f} -> {result['median_ms']:9.2f} ms  "
+                  f"{change:>8s}  [{status}]")
+        failed = bool(regressions)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Startup benchmark for the make_movie command line.
+
+Runs `make_movie --help` and an argument error in fresh interpreters, checks that none of the
+heavy modules (rez, mvl_rezboot and the DCC modules) were imported and that the median wall
+time stays within the budget. Exits with 1 when either check fails, so it can gate CI.
+
+    python benchmarks/bench_startup.py --runs 20 --budget-ms 100
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules a command line call must not import before a command actually runs.
+HEAVY_MODULES = ("rez", "mvl_rezboot", "nuke", "hou", "maya")
+
+SCENARIOS = {
+    "help": ["--help"],
+    "argument-error": ["daily"],
+}
+
+CHILD_SCRIPT = """
+import io, sys, json, contextlib
+from mvl_make_dailies import generate_movie
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    try:
+        generate_movie.main(json.loads(sys.argv[1]))
+    except SystemExit:
+        pass
+heavy = json.loads(sys.argv[2])
+print(json.dumps(sorted(name for name in sys.modules if name.split('.')[0] in heavy)))
+"""
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    python_path = os.path.join(REPO_ROOT, "python")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [python_path, env.get("PYTHONPATH")]))
+    # Set by rez in production; without it the package root would be looked up through rez.
+    env.setdefault("REZ_MVL_MAKE_DAILIES_ROOT", REPO_ROOT)
+    return env
+
+
+def run_once(argv, env) -> tuple:
+    """
+    Run the command line once in a fresh interpreter.
+
+    Returns:
+        tuple: (wall time in ms, list of heavy modules imported)
+    """
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, json.dumps(argv), json.dumps(HEAVY_MODULES)],
+                            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"make_movie {' '.join(argv)} failed:\n{result.stderr}")
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def time_interpreter(env) -> float:
+    """Wall time in ms of an empty interpreter run, the floor of any make_movie call."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark make_movie startup time.")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per scenario.")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Maximum median wall time per scenario.")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    env = child_env()
+    results = {}
+    failed = False
+
+    baseline = statistics.median(time_interpreter(env) for _ in range(args.runs))
+    print(f"{'interpreter':16s} median {baseline:7.1f} ms  (python -c pass, for reference)")
+    for name, scenario_argv in SCENARIOS.items():
+        # Untimed warm-up run, fills the knob schema cache and the bytecode cache.
+        run_once(scenario_argv, env)
+        timings = []
+        heavy = set()
+        for _ in range(args.runs):
+            elapsed, imported = run_once(scenario_argv, env)
+            timings.append(elapsed)
+            heavy.update(imported)
+
+        median = statistics.median(timings)
+        over_budget = median > args.budget_ms
+        failed = failed or over_budget or bool(heavy)
+        results[name] = {
+            "median_ms": round(median, 2),
+            "min_ms": round(min(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "heavy_modules": sorted(heavy),
+        }
+        status = "FAIL" if over_budget or heavy else "ok"
+        print(f"{name:16s} median {median:7.1f} ms  min {min(timings):7.1f} ms  max {max(timings):7.1f} ms  [{status}]")
+        if heavy:
+            print(f"{'':16s} imported heavy modules: {', '.join(sorted(heavy))}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "runs": args.runs, "interpreter_ms": round(baseline, 2),
+                       "results": results}, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Stand-in for the mvl_core_pipeline package, for running the orchestration benchmark outside a
+rez environment.
+
+Only the parts mvl_make_dailies uses are implemented: the Logger wrapper, the Fig config
+loader and rez_utils.get_repo_root. The package root comes from REZ_<PACKAGE>_ROOT, which the
+benchmark sets to the repository.
+
+Benchmarks put the stand_in directory first on sys.path, it is never installed with the package.
+"""
@@ -0,0 +1,24 @@
+"""Stand-in for mvl_core_pipeline.fig: reads configs/<name>.yaml from the package root."""
+
+import os
+
+import yaml
+
+from mvl_core_pipeline.rez_utils import get_repo_root
+
+
+class YAMLConfigDriver:
+
+    def load(self, path) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+
+
+class Fig:
+
+    def __init__(self, package_name, config_name, driver):
+        self.path = os.path.join(get_repo_root(package_name), "configs", f"{config_name}.yaml")
+        self.driver = driver
+
+    def get_config(self) -> dict:
+        return self.driver.load(self.path)
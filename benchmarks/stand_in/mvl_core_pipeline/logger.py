@@ -0,0 +1,13 @@
+"""Stand-in for mvl_core_pipeline.logger: a plain logging.Logger without the pipeline handlers."""
+
+import logging
+
+
+class Logger:
+
+    def __init__(self, name, repo_name=None):
+        self.name = name
+        self.repo_name = repo_name
+
+    def get_logger(self) -> logging.Logger:
+        return logging.getLogger(self.name)
@@ -0,0 +1,11 @@
+"""Stand-in for mvl_core_pipeline.rez_utils."""
+
+import os
+
+
+def get_repo_root(package_name) -> str:
+    """Root of a package, from the REZ_<PACKAGE>_ROOT variable rez sets."""
+    variable = f"REZ_{package_name.upper()}_ROOT"
+    if variable not in os.environ:
+        raise RuntimeError(f"{variable} is not set")
+    return os.environ[variable]
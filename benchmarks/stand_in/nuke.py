@@ -0,0 +1,394 @@
+"""
+Stand-in for the Nuke Python module, for running the dailies launcher (nuke/main.py) without Nuke.
+
+Only the part of the API the launcher uses is implemented, on a plain in-memory node graph:
+nodePaste reads the top-level nodes, knob values and connections of a .nk file, nodeCopy and
+scriptSaveAs write them back in the same form, and execute only calls the frame callbacks and
+records the frames each Write node would render. Nothing is decoded or encoded, so timings
+measure the launcher's own work (template parsing, graph edits, knob values).
+
+Benchmarks put this directory first on sys.path, it is never installed with the package.
+"""
+
+import os
+import re
+
+INPUTS = 1
+HIDDEN_INPUTS = 2
+
+# Knobs every node of a class has, on top of the ones saved in the .nk file.
+COMMON_KNOBS = ("name", "disable", "label", "xpos", "ypos", "selected")
+CLASS_KNOBS = {
+    "Root": ("first_frame", "last_frame", "format", "fps"),
+    "Read": ("file", "file_type", "format", "first", "last", "frame_mode", "frame", "raw", "colorspace"),
+    "Write": ("file", "file_type", "raw", "colorspace", "channels", "datatype", "mov64_codec", "mov64_fps",
+              "mov64_bitrate", "mov64_gop_size", "_jpeg_quality", "use_limit", "first", "last"),
+    "Reformat": ("type", "format", "scale", "box_width", "box_height", "box_fixed", "resize", "filter",
+                 "black_outside", "clamp", "pbb"),
+    "Colorspace": ("colorspace_in", "colorspace_out"),
+    "Switch": ("which",),
+    "FrameHold": ("first_frame",),
+    "ContactSheet": ("width", "height", "rows", "columns", "roworder", "gap"),
+}
+# Format registered by default, by name: (width, height, pixel aspect).
+DEFAULT_FORMATS = {"HD_1080": (1920, 1080, 1.0), "HD_720": (1280, 720, 1.0), "UHD_4K": (3840, 2160, 1.0),
+                   "2K_Super_35(full-ap)": (2048, 1556, 1.0), "square_1K": (1024, 1024, 1.0)}
+
+NODE_START = re.compile(r'^(?P<cls>[A-Z]\w*) \{$')
+STACK_SET = re.compile(r'^set (?P<var>\w+) \[stack (?P<index>\d+)\]$')
+STACK_PUSH = re.compile(r'^push (?:\$(?P<var>\w+)|0)$')
+USER_KNOB = re.compile(r'^addUserKnob \{\d+ (?P<name>\w+)')
+
+# Frames rendered by execute and executeMultiple, as (write node name, frame).
+rendered = []
+
+
+class Format:
+    def __init__(self, name, width, height, pixel_aspect=1.0):
+        self._name = name
+        self._width = width
+        self._height = height
+        self._pixel_aspect = pixel_aspect
+
+    def name(self):
+        return self._name
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def pixelAspect(self):
+        return self._pixel_aspect
+
+
+class Knob:
+    def __init__(self, name, value=None):
+        self._name = name
+        self._value = value
+        self._expression = None
+
+    def name(self):
+        return self._name
+
+    def value(self):
+        return self._value
+
+    getValue = value
+
+    def setValue(self, value):
+        self._value = value
+        self._expression = None
+        return True
+
+    def setExpression(self, expression):
+        self._expression = expression
+        return True
+
+    def toScript(self):
+        if self._expression is not None:
+            return f"{{{self._expression}}}"
+        return "" if self._value is None else str(self._value)
+
+    def fromScript(self, script):
+        if script.startswith("{") and script.endswith("}"):
+            self._expression = script[1:-1]
+        else:
+            self._value = script or None
+        return True
+
+    def evaluate(self, frame=None):
+        """File knobs: the path of a frame, with the #### and %04d padding replaced."""
+        value = "" if self._value is None else str(self._value)
+        if frame is None:
+            return value
+        value = re.sub(r'#+', lambda match: f"{int(frame):0{len(match.group())}d}", value)
+        return re.sub(r'%0?(\d*)d', lambda match: f"{int(frame):0{match.group(1) or 1}d}", value)
+
+
+class String_Knob(Knob):
+    def __init__(self, name, label=None, value=None):
+        Knob.__init__(self, name, value)
+
+
+class Node:
+    def __init__(self, node_class, name=None, knobs=None):
+        self._class = node_class
+        self._knobs = {}
+        for knob_name in COMMON_KNOBS + CLASS_KNOBS.get(node_class, ()):
+            self._knobs[knob_name] = Knob(knob_name)
+        for knob_name, value in (knobs or {}).items():
+            self._knobs[knob_name] = Knob(knob_name, value)
+        self._knobs["name"].setValue(name or _unique_name(node_class))
+        self._inputs = []
+
+    def Class(self):
+        return self._class
+
+    def name(self):
+        return self._knobs["name"].value()
+
+    def knobs(self):
+        return self._knobs
+
+    def knob(self, name):
+        return self._knobs.get(name)
+
+    def __getitem__(self, name):
+        # Nuke creates the knobs of a Write's file type when it is set; any knob is created on use.
+        if name not in self._knobs:
+            self._knobs[name] = Knob(name)
+        return self._knobs[name]
+
+    def addKnob(self, knob):
+        self._knobs[knob.name()] = knob
+
+    def setInput(self, index, node):
+        while len(self._inputs) <= index:
+            self._inputs.append(None)
+        self._inputs[index] = node
+        return True
+
+    def input(self, index):
+        return self._inputs[index] if index < len(self._inputs) else None
+
+    def inputs(self):
+        return len(self._inputs)
+
+    def dependent(self, what=INPUTS, forceEvaluate=True):
+        return [node for node in _graph.values() if node is not self and self in node._inputs]
+
+    def setSelected(self, selected):
+        self._knobs["selected"].setValue(bool(selected))
+
+    def isSelected(self):
+        return bool(self._knobs["selected"].value())
+
+    def format(self):
+        value = self["format"].value() or "HD_1080"
+        return _get_format(value)
+
+    def __repr__(self):
+        return f"<{self._class} {self.name()}>"
+
+
+class _NodeFactory:
+    """nuke.nodes.<Class>(name=..., **knobs) creates a node of any class."""
+
+    def __getattr__(self, node_class):
+        def create(name=None, **knobs):
+            node = Node(node_class, name, knobs)
+            _graph[node.name()] = node
+            return node
+        return create
+
+
+nodes = _NodeFactory()
+
+_graph = {}
+_root = Node("Root", "root")
+_formats = {name: Format(name, *size) for name, size in DEFAULT_FORMATS.items()}
+_callbacks = {"before": [], "after": []}
+_this_node = None
+_frame = 0
+
+
+def _unique_name(node_class):
+    index = 1
+    while f"{node_class}{index}" in _graph:
+        index += 1
+    return f"{node_class}{index}"
+
+
+def _get_format(value):
+    value = str(value).strip()
+    if value in _formats:
+        return _formats[value]
+    fields = value.strip('"').split()
+    if len(fields) >= 2 and fields[0].isdigit():
+        return Format(fields[-1], int(fields[0]), int(fields[1]))
+    return _formats["HD_1080"]
+
+
+def _parse_knob_value(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def _read_script(path):
+    """
+    Read the top-level nodes of a .nk file, with their saved knob values and connections.
+    Nodes inside groups are skipped, the group itself is kept.
+    """
+    created = []
+    stack = []
+    variables = {}
+    node = None
+    group_open = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if node is not None:
+                # Knob lines of a node header are indented by exactly one space.
+                if line == "}":
+                    # The script settings of a pasted file are not applied, like in Nuke.
+                    if node.Class() != "Root":
+                        node_inputs = int(node["inputs"].value() or 1)
+                        popped = [stack.pop() if stack else None for _ in range(node_inputs)]
+                        for index, input_node in enumerate(popped):
+                            if input_node is not None:
+                                node.setInput(index, input_node)
+                        stack.append(node)
+                        created.append(node)
+                    group_open = node.Class() == "Group"
+                    node = None
+                elif line.startswith(" ") and not line.startswith("  "):
+                    key, _, value = line[1:].partition(" ")
+                    if key == "addUserKnob":
+                        user_knob = USER_KNOB.match(line[1:])
+                        if user_knob:
+                            node._knobs.setdefault(user_knob.group("name"), Knob(user_knob.group("name")))
+                    elif key.isidentifier():
+                        node._knobs[key] = Knob(key, _parse_knob_value(value))
+                continue
+            if group_open:
+                if line == "end_group":
+                    group_open = False
+                continue
+            match = NODE_START.match(line)
+            if match:
+                node = Node(match.group("cls"))
+                continue
+            match = STACK_SET.match(line)
+            if match and stack:
+                variables[match.group("var")] = stack[-1 - int(match.group("index"))]
+                continue
+            match = STACK_PUSH.match(line)
+            if match:
+                stack.append(variables.get(match.group("var")) if match.group("var") else None)
+    return created
+
+
+def _write_script(path, script_nodes):
+    """Write nodes in the .nk form _read_script reads, inputs pushed by variable."""
+    lines = []
+    names = {}
+    for index, node in enumerate(script_nodes):
+        names[node] = f"N{index:08x}"
+        node_inputs = list(node._inputs)
+        for input_node in reversed(node_inputs):
+            lines.append(f"push ${names[input_node]}" if input_node in names else "push 0")
+        lines.append(f"{node.Class()} {{")
+        lines.append(f" inputs {len(node_inputs)}")
+        for name, knob in node.knobs().items():
+            script = knob.toScript().replace("\n", "\\n")
+            if name not in ("inputs", "selected") and script not in ("", "None"):
+                lines.append(f" {name} \"{script}\"" if " " in script else f" {name} {script}")
+        lines.append("}")
+        if node.Class() == "Group":
+            # The nodes inside the group are not kept.
+            lines.append("end_group")
+        lines.append(f"set {names[node]} [stack 0]")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def root():
+    return _root
+
+
+def toNode(name):
+    return _root if name == "root" else _graph.get(name)
+
+
+def allNodes(filter=None, group=None):
+    return [node for node in _graph.values() if filter is None or node.Class() == filter]
+
+
+def selectedNodes():
+    return [node for node in _graph.values() if node.isSelected()]
+
+
+def delete(node):
+    _graph.pop(node.name(), None)
+    for other in _graph.values():
+        other._inputs = [None if input_node is node else input_node for input_node in other._inputs]
+
+
+def scriptClear():
+    global _root
+    _graph.clear()
+    _root = Node("Root", "root")
+
+
+def nodePaste(path):
+    for node in _read_script(path):
+        if node.name() in _graph:
+            node["name"].setValue(_unique_name(node.Class()))
+        _graph[node.name()] = node
+
+
+def nodeCopy(path):
+    _write_script(path, selectedNodes())
+    return True
+
+
+def scriptSaveAs(path, overwrite=1):
+    _write_script(path, list(_graph.values()))
+
+
+def addFormat(format_spec):
+    fields = format_spec.split()
+    width, height = int(fields[0]), int(fields[1])
+    pixel_aspect = float(fields[2]) if len(fields) > 3 else 1.0
+    _formats[fields[-1]] = Format(fields[-1], width, height, pixel_aspect)
+    return _formats[fields[-1]]
+
+
+def tcl(command, *args):
+    if command.strip() == "frames ranges":
+        return f"{int(_root['first_frame'].value() or 1)}-{int(_root['last_frame'].value() or 1)}"
+    return ""
+
+
+def addBeforeFrameRender(callback, args=(), kwargs={}, nodeClass="Write"):
+    _callbacks["before"].append(callback)
+
+
+def addAfterFrameRender(callback, args=(), kwargs={}, nodeClass="Write"):
+    _callbacks["after"].append(callback)
+
+
+def thisNode():
+    return _this_node
+
+
+def frame():
+    return _frame
+
+
+def _render_frame(node, frame_number):
+    global _this_node, _frame
+    _this_node, _frame = node, frame_number
+    for callback in _callbacks["before"]:
+        callback()
+    rendered.append((node.name(), frame_number))
+    for callback in _callbacks["after"]:
+        callback()
+
+
+def execute(node, first, last, incr=1):
+    node = toNode(node) if isinstance(node, str) else node
+    os.makedirs(os.path.dirname(os.path.abspath(node["file"].evaluate(first))), exist_ok=True)
+    for frame_number in range(int(first), int(last) + 1, int(incr)):
+        _render_frame(node, frame_number)
+
+
+def executeMultiple(write_nodes, ranges=(), views=None, continueOnError=False):
+    for first, last, incr in ranges:
+        for frame_number in range(int(first), int(last) + 1, int(incr)):
+            for node in write_nodes:
+                _render_frame(node, frame_number)
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+
+CACHE_DIR_ENV = "MVL_MAKE_DAILIES_CACHE_DIR"
+
+
+def get_cache_root(cache_dir=None) -> str:
+    """
+    Get the root directory of the mvl_make_dailies persistent caches.
+    The directory comes from the cache_dir argument, the MVL_MAKE_DAILIES_CACHE_DIR
+    environment variable, or defaults to ~/.cache/mvl_make_dailies.
+
+    Args:
+        cache_dir (str, optional): Explicit cache root, e.g. from --cache-dir.
+
+    Returns:
+        str: The cache root directory.
+    """
+    return cache_dir or os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "mvl_make_dailies")
+
+
+def get_cache_dir(name, cache_dir=None) -> str:
+    """
+    Get (and create) the directory of a named cache under the cache root.
+
+    Args:
+        name (str): Cache name, e.g. "sequence_index".
+        cache_dir (str, optional): Explicit cache root.
+
+    Returns:
+        str: The cache directory.
+    """
+    path = os.path.join(get_cache_root(cache_dir), name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_key(*parts) -> str:
+    """Return a stable hex digest for the given strings."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def read_json(path):
+    """Read a JSON file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def atomic_write_json(path, data):
+    """
+    Write a JSON file atomically.
+    The data is written to a temporary file in the same directory and renamed over the
+    destination, so concurrent readers (including other hosts on a network share) never
+    see a partial file.
+    """
+    temp_path = f"{path}.{os.urandom(16).hex()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def touch(path):
+    """Mark a cache file as recently used. Errors are ignored."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def evict_lru(directory, max_bytes=None, max_entries=None, suffix=None, min_age=None) -> int:
+    """
+    Remove the least recently used files of a cache directory until it fits the limits.
+    Recency is the file modification time, refreshed with touch() on every cache hit.
+    Files removed concurrently by another process are skipped.
+
+    Args:
+        directory (str): Cache directory.
+        max_bytes (int, optional): Maximum total size of the cache files.
+        max_entries (int, optional): Maximum number of cache files.
+        suffix (str, optional): Only consider files ending with this suffix.
+        min_age (float, optional): Never remove files used within this many seconds, e.g. because
+            another host sharing the cache may be about to read them.
+
+    Returns:
+        int: Number of files removed.
+    """
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if suffix and not entry.name.endswith(suffix):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    files.sort()
+    recent = time.time() - min_age if min_age else None
+    total_bytes = sum(size for _, size, _ in files)
+    total_entries = len(files)
+    removed = 0
+    for mtime, size, path in files:
+        over_bytes = max_bytes is not None and total_bytes > max_bytes
+        over_entries = max_entries is not None and total_entries > max_entries
+        if not (over_bytes or over_entries):
+            break
+        if recent is not None and mtime > recent:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        total_bytes -= size
+        total_entries -= 1
+    return removed
+
+
+@contextmanager
+def file_lock(path, timeout=600, poll_interval=0.2):
+    """
+    Hold an exclusive lock while the context is active.
+    The lock is a file created with O_EXCL, which works across processes and across hosts on
+    shared storage. A lock older than the timeout is considered stale and broken.
+
+    Args:
+        path (str): Lock file path.
+        timeout (float): Seconds to wait for the lock, also the age of a stale lock.
+        poll_interval (float): Seconds between attempts.
+
+    Raises:
+        TimeoutError: If the lock could not be acquired in time.
+    """
+    import socket
+
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if age > timeout:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}")
+            time.sleep(poll_interval)
+            continue
+        os.write(fd, f"{socket.gethostname()} {os.getpid()}".encode("utf-8"))
+        os.close(fd)
+        break
+
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,132 @@
+import os
+import math
+import shutil
+import tempfile
+import subprocess
+
+from mvl_make_dailies.tracing import span
+
+FFMPEG_ENV = "MVL_FFMPEG"
+
+# Default keyframe interval of the Nuke mov64 writer.
+DEFAULT_GOP_SIZE = 12
+
+# Codecs where every frame is a keyframe, so segments can start on any frame.
+INTRA_ONLY_CODECS = ("prores", "ap4h", "ap4x", "apch", "apcn", "apcs", "apco", "dnxhd", "dnxhr", "mjpeg", "jpeg", "png", "rle")
+
+
+def get_gop_size(write_data) -> int:
+    """
+    Get the keyframe interval the movie writer encodes with.
+
+    Args:
+        write_data (dict): Knob values of the MVL_MOV_WRITER node.
+
+    Returns:
+        int: Frames per GOP, 1 for intra-only codecs.
+    """
+    codec = str(write_data.get("mov64_codec", "")).lower()
+    if any(codec.startswith(intra) for intra in INTRA_ONLY_CODECS):
+        return 1
+    return int(write_data.get("mov64_gop_size") or DEFAULT_GOP_SIZE)
+
+
+def get_common_gop_size(write_datas) -> int:
+    """Smallest GOP every writer can be cut on: the least common multiple of their GOP sizes."""
+    gop_size = 1
+    for write_data in write_datas:
+        size = get_gop_size(write_data)
+        gop_size = gop_size * size // math.gcd(gop_size, size)
+    return gop_size
+
+
+def align_chunk_size(chunk_size, gop_size) -> int:
+    """Round a segment size up to a whole number of GOPs."""
+    return max(gop_size, math.ceil(chunk_size / gop_size) * gop_size)
+
+
+def split_frame_range(frame_range, chunks=None, chunk_size=None, gop_size=1) -> list:
+    """
+    Split a frame range into contiguous segments rendered independently.
+    Segment sizes are rounded up to a multiple of the GOP size, so every segment starts on
+    a keyframe of the full movie and stream-copied segments play back frame accurately.
+
+    Args:
+        frame_range (range): Frames to render, slate frame included.
+        chunks (int, optional): Number of segments wanted.
+        chunk_size (int, optional): Frames per segment, takes precedence over chunks.
+        gop_size (int): Keyframe interval of the codec.
+
+    Returns:
+        list: One range per segment.
+    """
+    total = len(frame_range)
+    if not total:
+        return []
+    if not chunk_size:
+        chunk_size = math.ceil(total / max(int(chunks or 1), 1))
+    chunk_size = align_chunk_size(chunk_size, gop_size)
+    return [range(start, min(start + chunk_size, frame_range.stop))
+            for start in range(frame_range.start, frame_range.stop, chunk_size)]
+
+
+def find_ffmpeg() -> str:
+    """
+    Locate the ffmpeg executable used to join segments, from $MVL_FFMPEG or the PATH.
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not available.
+    """
+    ffmpeg = os.environ.get(FFMPEG_ENV) or shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise FileNotFoundError(f"ffmpeg not found. Add it to the PATH or set {FFMPEG_ENV} to use chunked rendering.")
+    return ffmpeg
+
+
+def create_segment_dir(output_path, kind="segments") -> str:
+    """Create a hidden directory next to the output movie to hold its segments, or its source frames."""
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(output_path))[0]
+    return tempfile.mkdtemp(prefix=f".{base_name}_{kind}_", dir=output_dir)
+
+
+def get_segment_path(segment_dir, index, extension="mov", output=0) -> str:
+    """Path of a segment of the main movie, or of the movie of another output of the same render."""
+    if output:
+        return os.path.join(segment_dir, f"segment.{index:04d}.output{output}.{extension}")
+    return os.path.join(segment_dir, f"segment.{index:04d}.{extension}")
+
+
+def concat_segments(segment_paths, output_path, ffmpeg=None):
+    """
+    Join movie segments into one movie without re-encoding (ffmpeg concat demuxer, stream copy).
+
+    Args:
+        segment_paths (list): Segment movies, in playback order.
+        output_path (str): Final movie path.
+        ffmpeg (str, optional): ffmpeg executable, see find_ffmpeg.
+
+    Raises:
+        RuntimeError: If ffmpeg fails.
+    """
+    ffmpeg = ffmpeg or find_ffmpeg()
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_file = f.name
+
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "concat", "-safe", "0", "-i", list_file,
+        "-map", "0", "-c", "copy", "-movflags", "+faststart",
+        output_path,
+    ]
+    try:
+        with span("ffmpeg concat", "encode", segments=len(segment_paths), output=output_path):
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    finally:
+        os.remove(list_file)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to join {len(segment_paths)} segments into {output_path}: {result.stderr.strip()}")
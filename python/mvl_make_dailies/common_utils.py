@@ -1,24 +1,77 @@
 import sys 
 import os
-import logging
-import tempfile
-import re
+import functools
 from enum import Enum
 
-from mvl_core_pipeline import rez_utils
-from mvl_core_pipeline.fig import Fig, YAMLConfigDriver
-from mvl_core_pipeline.logger import Logger
+from mvl_make_dailies.knob_schema import KnobSchema, load_knob_schema
 
 
-logger = Logger(name='movie_generator', repo_name='rez-make-dailies').get_logger()
-logger.setLevel(logging.DEBUG)
+# The pipeline logger, the config system, rez and the modules only some commands need (logging,
+# tempfile, sequence_utils) are imported when first used, so that importing this module (and
+# running `make_movie --help`) stays cheap.
 
-error_handler = logging.StreamHandler(sys.stderr)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
-error_handler.setFormatter(formatter)
-logger.addHandler(error_handler)
+@functools.lru_cache(maxsize=None)
+def get_logger():
+    """
+    Returns the movie_generator logger (logging.Logger), creating it and its stderr handler on first use.
+    """
+    import logging
+    from mvl_core_pipeline.logger import Logger
+
+    movie_logger = Logger(name='movie_generator', repo_name='rez-make-dailies').get_logger()
+    movie_logger.setLevel(logging.DEBUG)
+
+    error_handler = logging.StreamHandler(sys.stderr)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    error_handler.setFormatter(formatter)
+    movie_logger.addHandler(error_handler)
+    return movie_logger
+
+class _LazyLogger:
+    """Stand-in for the movie_generator logger that creates it on first use."""
+
+    def __getattr__(self, name):
+        return getattr(get_logger(), name)
+
+logger = _LazyLogger()
+
+# Exit code of the DCC launcher scripts (nuke, houdini and maya main.py) when the job itself
+# failed: a bad scene or template, a render error. Launches exiting with it are not retried,
+# unlike licence checkout failures, crashes and signals.
+JOB_ERROR_EXIT_CODE = 3
+# Exit code of a launcher script when the job was set up but rendering its frames failed, e.g.
+# a Mantra or Karma error in a chunk. Such failures may not happen again, so they are retried.
+RENDER_ERROR_EXIT_CODE = 4
+
+class LaunchError(RuntimeError):
+    """
+    Raised when a DCC process could not be launched through rez, or failed.
+
+    Args:
+        message (str): Error message.
+        transient (bool): Whether launching again may succeed: the process could not start, was
+            killed or exited on its own (e.g. no licence). False when the launcher script
+            rejected or failed the job, see JOB_ERROR_EXIT_CODE.
+    """
+
+    def __init__(self, message, transient=True):
+        super().__init__(message)
+        self.transient = transient
+
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """
+    Returns the knobs_template config of the mvl_make_dailies package, created on first use.
+    """
+    from mvl_core_pipeline.fig import Fig, YAMLConfigDriver
+    return Fig('mvl_make_dailies', 'knobs_template', YAMLConfigDriver())
+
+def __getattr__(name):
+    # Keeps the former module level `cfg` available without creating it at import time.
+    if name == 'cfg':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-cfg = Fig('mvl_make_dailies', 'knobs_template', YAMLConfigDriver())
 class NukeTemplate(Enum):
     MVL_VFX_TEMPLATE_SLATE_AND_BURNIN = "MVL_VFX_Template_Slate_Overlay_v0.0.1.nk"
 
@@ -26,19 +79,28 @@ def getNodeAtrribs(list_of_dicts)->list:
     attr = [d["name"].replace("--", "").replace('no-', "") for d in list_of_dicts if "name" in d]
     return attr
 
+@functools.lru_cache(maxsize=None)
+def get_knob_schema() -> KnobSchema:
+    """
+    Returns the compiled knobs_template.yaml schema.
+    The schema is loaded once per process and cached on disk keyed by the YAML content,
+    so the config is neither parsed nor walked again by the *_keys() and *_args() helpers.
+    """
+    return load_knob_schema(os.path.join(get_config_path(), 'knobs_template.yaml'), lambda: get_config().get_config())
+
 def writer_keys():
     """
     Returns a list of keys used for writer metadata in the Nuke template.
     These keys are used to extract writer related arguments from the command line arguments.
     """
-    return getNodeAtrribs(cfg.get_config()['template']['Nodes']['write'])
+    return get_knob_schema().nodes['write'].keys
 
 def reformat_keys():
     """
     Returns a list of keys used for reformat metadata in the Nuke template.
     These keys are used to extract reformat related arguments from the command line arguments.
     """
-    return getNodeAtrribs(cfg.get_config()['template']['Nodes']['reformat'])
+    return get_knob_schema().nodes['reformat'].keys
 
 def colorspace_keys():
     """
@@ -46,23 +108,21 @@ def colorspace_keys():
     These keys are used to extract colorspace related arguments from the command line arguments.
     These keys same as the knobs in the Nuke template.
     """
-    return getNodeAtrribs(cfg.get_config()['template']['Nodes']['colorspace'])
+    return get_knob_schema().nodes['colorspace'].keys
 
 def burn_in_keys():
     """
     Returns a list of keys used for burn-in metadata in the Nuke template.
     These keys are used to extract burn-in related arguments from the command line arguments.
     """
-
-    #return (cfg.get_config()['template']['Nodes']['burnin']).keys()
-    return getNodeAtrribs(cfg.get_config()['template']['Nodes']['burnin'])
+    return get_knob_schema().nodes['burnin'].keys
 
 def slate_keys():
     """
     Returns a list of keys used for slate metadata in the Nuke template.
     These keys are used to extract slate related arguments from the command line arguments.
     """
-    return getNodeAtrribs(cfg.get_config()['template']['Nodes']['slate'])
+    return get_knob_schema().nodes['slate'].keys
 
 def read_keys():   
     """
@@ -74,20 +134,20 @@ def read_keys():
     ]
 
 def writer_args():
-    return cfg.get_config()['template']['Nodes']['write']
+    return get_knob_schema().nodes['write'].args
 
 def reformat_args():
-    return cfg.get_config()['template']['Nodes']['reformat']
+    return get_knob_schema().nodes['reformat'].args
 
 def colorspace_args():
-    return cfg.get_config()['template']['Nodes']['colorspace']
+    return get_knob_schema().nodes['colorspace'].args
  
 def burnin_args():
 
-    return cfg.get_config()['template']['Nodes']['burnin']
+    return get_knob_schema().nodes['burnin'].args
 
 def slate_args():
-    return cfg.get_config()['template']['Nodes']['slate']
+    return get_knob_schema().nodes['slate'].args
 
 def get_package_path()->str:
     """
@@ -98,6 +158,11 @@ def get_package_path()->str:
     Returns:
         str: The path to the mvl_make_dailies package directory.
     """
+    package_root = os.environ.get('REZ_MVL_MAKE_DAILIES_ROOT')
+    if package_root:
+        return package_root
+
+    from mvl_core_pipeline import rez_utils
     return rez_utils.get_repo_root('mvl_make_dailies')
 
 def get_python_package_path()->str:
@@ -166,55 +231,44 @@ def get_nuke_executable_path()->str:
 def gather_frame_range(sequence_path) -> range:
     """
     Collect the frame range from a file sequence path.
-    This function assumes the sequence is named with a pattern like
-    "image.####.exr" or "image_####.exr" where #### is the frame number.
-    If the sequence is a folder, it will gather all files in that folder
-    and determine the frame range based on the file names.
+    The sequence may be given as a pattern like "image.####.exr" or "image.%04d.exr",
+    in which case only the frames of that sequence are considered.
+    If the sequence is a folder, the sequences in that folder are scanned and the
+    longest one is used.
     If the sequence is a single file, it will return a range with that single frame.
 
     Args:
-        sequecence_path (str): Path to the image sequence or folder containing the sequence.
+        sequence_path (str): Path to the image sequence, a frame of it or folder containing the sequence.
+
+    Returns:
+        range: Frames from first to last, last frame included.
     """
-    frame_pattern = re.compile(r'(\d+)\.[a-zA-Z0-9]+$') # Matches digits before the last dot and extension
+    from mvl_make_dailies.sequence_utils import FRAME_FILE_PATTERN, FrameSet, iter_sequences, find_sequence
 
-    frames = []
     if os.path.isdir(sequence_path):
-        files = sorted(os.listdir(sequence_path))
-        for file in files:
-            full_file_path = os.path.join(sequence_path, file)
-            if os.path.isfile(full_file_path) and file.lower().endswith(('.exr', '.jpg', '.png')):
-                match = frame_pattern.search(file)
-                if match:
-                    try:
-                        frame_number = int(match.group(1))
-                        frames.append(frame_number)
-                    except ValueError as e:
-                        logger.warning(f"Could not convert frame number '{match.group(1)}' from file '{file}': {e}")
-                else:
-                    logger.warning(f"No frame number found in file: {file} matching pattern.")
+        sequences = list(iter_sequences(sequence_path))
+        if not sequences:
+            raise ValueError(f"No valid image files found in directory: {sequence_path}")
+        sequence = max(sequences, key=lambda seq: len(seq.frames))
+        if len(sequences) > 1:
+            logger.warning(f"Found {len(sequences)} sequences in {sequence_path}, using {sequence.pattern}")
+        frames = sequence.frames
     elif os.path.isfile(sequence_path):
         file_name = os.path.basename(sequence_path)
-        match = frame_pattern.search(file_name)
-        if match:
-            try:
-                frame_number = int(match.group(1))
-                frames.append(frame_number)
-            except ValueError as e:
-                raise ValueError(f"Could not convert frame number '{match.group(1)}' from file '{file_name}': {e}")
-        else:
+        match = FRAME_FILE_PATTERN.match(file_name)
+        if not match:
             raise ValueError(f"No frame number found in file: {file_name} matching expected pattern.")
+        frame_number = int(match.group("frame"))
+        frames = FrameSet([(frame_number, frame_number)])
     else:
-        raise ValueError(f"Invalid sequence path: {sequence_path}. Must be a file or directory.")
+        frames = find_sequence(sequence_path).frames
 
-    if not frames:
-        raise ValueError(f"No valid image files found in directory: {sequence_path}")
+    if frames.has_gaps():
+        logger.warning(f"Sequence {sequence_path} is missing frames: {frames.missing()}")
 
-    start = min(frames)
-    end = max(frames)
+    logger.info(f"Gathered frame range from {sequence_path}: {frames.first} to {frames.last}")
 
-    logger.info(f"Gathered frame range from {sequence_path}: {start} to {end}")
-
-    return range(start, end ) 
+    return frames.frame_range
 
 def is_valid_frame_range(start, stop):
     """
@@ -253,7 +307,8 @@ def create_temp_file(prefix="mvl_make_dailies", suffix="nk") -> str:
     Returns:
         str: The path to the created temporary file.
     """
-    
+    import tempfile
+
     temp_file = tempfile.NamedTemporaryFile(prefix="mvl_make_dailies_", suffix=".mov", delete=False)
     temp_file.close()  # Close the file so it can be used later
     logger.info(f"Created temporary file: {temp_file.name}")
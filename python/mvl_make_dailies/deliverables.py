@@ -0,0 +1,93 @@
+import os
+
+from mvl_make_dailies.common_utils import get_knob_schema
+
+# Short deliverable spec keys and the movie writer knob they set.
+WRITER_ALIASES = {"codec": "mov64_codec", "fps": "mov64_fps"}
+BOOL_VALUES = {"1": True, "true": True, "yes": True, "on": True,
+               "0": False, "false": False, "no": False, "off": False}
+
+
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    try:
+        return BOOL_VALUES[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Invalid deliverable burnin value {value}, use on or off")
+
+
+def parse_deliverable(value) -> dict:
+    """
+    Parse a --deliverable value, comma separated key=value pairs, e.g.
+    "output=/dailies/sh010_editorial.mov,codec=appr,fps=24,format=HD_1080,burnin=off".
+
+    Returns:
+        dict: The deliverable spec.
+
+    Raises:
+        ValueError: If a pair has no value.
+    """
+    spec = {}
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        key, sep, item = pair.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Invalid deliverable {value}: expected key=value pairs, not {pair}")
+        spec[key.strip()] = item.strip()
+    return spec
+
+
+def build_deliverable_payloads(specs, node_payloads, output) -> list:
+    """
+    Describe the extra movies rendered from the same pass as the main one.
+    Each deliverable writes the main movie's writer knob values, overridden by its own codec,
+    fps and other writer knobs, at its own format and with or without the burn-in.
+
+    Args:
+        specs (list): Deliverable specs, dicts or --deliverable strings (see parse_deliverable),
+            with an output and optional codec, fps, format, burnin and writer knob keys.
+        node_payloads (dict): Knob values of the main movie, see movie_commands.build_node_payloads.
+        output (str): Main movie path.
+
+    Returns:
+        list: One payload per deliverable: dst, write, format (None for the main format) and burnin.
+
+    Raises:
+        ValueError: If a deliverable has no .mov output, reuses another output or has unknown keys.
+    """
+    write_schema = get_knob_schema().nodes["write"]
+    main_burnin = node_payloads["burnin"].get("burnin") is not False
+    outputs = {os.path.abspath(output)}
+    payloads = []
+    for spec in specs or ():
+        spec = dict(parse_deliverable(spec) if isinstance(spec, str) else spec)
+        dst = spec.pop("output", None)
+        if not dst or not dst.lower().endswith(".mov"):
+            raise ValueError(f"Deliverable output must be a .mov file: {dst}")
+        if os.path.abspath(dst) in outputs:
+            raise ValueError(f"Deliverable output {dst} is already written by this daily")
+        outputs.add(os.path.abspath(dst))
+
+        main_format = node_payloads["reformat"].get("format")
+        deliverable_format = spec.pop("format", None)
+        burnin = parse_bool(spec.pop("burnin")) if "burnin" in spec else main_burnin
+        write_data = dict(node_payloads["write"])
+        for key, value in spec.items():
+            knob = WRITER_ALIASES.get(key, key)
+            if knob not in write_schema.keys:
+                raise ValueError(f"Unknown deliverable key {key} for {dst}")
+            converter = write_schema.converters.get(knob)
+            try:
+                write_data[knob] = converter(value) if converter and isinstance(value, str) else value
+            except ValueError:
+                raise ValueError(f"Invalid deliverable {key} {value} for {dst}")
+
+        payloads.append({
+            "dst": dst,
+            "write": write_data,
+            "format": deliverable_format if deliverable_format != main_format else None,
+            "burnin": burnin,
+        })
+    return payloads
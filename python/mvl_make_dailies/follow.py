@@ -0,0 +1,126 @@
+import os
+import time
+
+from mvl_make_dailies.sequence_utils import Sequence, FrameSet, parse_sequence_path, iter_sequences, match_sequence
+
+DEFAULT_FOLLOW_TIMEOUT = 600
+DEFAULT_POLL_INTERVAL = 1.0
+# A frame is complete once its size and mtime have not changed for this long.
+DEFAULT_STABLE_AGE = 2.0
+
+
+class FrameFollower:
+    """
+    Follow an image sequence while it is being rendered.
+    Frames are yielded in order once they exist and are stable: not empty, last written at least
+    stable_age seconds ago and, when already seen, with the size and mtime of the previous poll.
+    Frames still being written are therefore not picked up, while frames that were already
+    complete are yielded without waiting.
+
+    Args:
+        sequence_path (str): Sequence pattern, e.g. "/renders/shot.####.exr".
+        first (int, optional): First frame. Defaults to the first frame that appears.
+        last (int, optional): Last frame. Without it, following stops on timeout.
+        timeout (float): Seconds without a new frame after which following stops.
+        poll_interval (float): Seconds between checks.
+        stable_age (float): Seconds a frame must stay unchanged to be considered complete.
+        finished (threading.Event, optional): Set by the caller once nothing writes the sequence
+            anymore; frames on disk are then complete and following stops at the first missing
+            frame instead of waiting for the timeout.
+
+    Raises:
+        ValueError: If the sequence path has no frame number or padding.
+    """
+
+    def __init__(self, sequence_path, first=None, last=None, timeout=DEFAULT_FOLLOW_TIMEOUT,
+                 poll_interval=DEFAULT_POLL_INTERVAL, stable_age=DEFAULT_STABLE_AGE, finished=None):
+        parsed = parse_sequence_path(sequence_path)
+        if parsed is None:
+            raise ValueError(f"No frame number or padding found in sequence path: {sequence_path}")
+        self.sequence_path = sequence_path
+        self.sequence = Sequence(*parsed, FrameSet())
+        self.first = first
+        self.last = last
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stable_age = stable_age
+        self.finished = finished
+        self.last_frame = None
+        self.timed_out = False
+        self.stopped = False
+        self._seen = {}
+
+    def _is_finished(self) -> bool:
+        return self.finished is not None and self.finished.is_set()
+
+    def _is_stable(self, frame, finished=False) -> bool:
+        try:
+            stat = os.stat(self.sequence.frame_path(frame))
+        except OSError:
+            return False
+        if finished:
+            return stat.st_size > 0
+        state = (stat.st_size, stat.st_mtime_ns)
+        previous = self._seen.get(frame)
+        self._seen[frame] = state
+        return (stat.st_size > 0 and previous in (None, state)
+                and time.time() - stat.st_mtime_ns / 1e9 >= self.stable_age)
+
+    def _find_first(self):
+        try:
+            sequence = match_sequence(self.sequence_path, iter_sequences(self.sequence.directory))
+        except (ValueError, OSError):
+            return None
+        return sequence.first
+
+    def wait_for_first(self):
+        """
+        Wait for the first frame of the sequence to be complete, so that its header can be read.
+        Without a first frame, the first frame to appear is used.
+
+        Returns:
+            int: The first frame, or None if it did not complete before the timeout.
+        """
+        deadline = time.time() + self.timeout
+        while True:
+            finished = self._is_finished()
+            if self.first is None:
+                self.first = self._find_first()
+            if self.first is not None and self._is_stable(self.first, finished):
+                return self.first
+            if finished:
+                self.stopped = True
+                return None
+            if time.time() > deadline:
+                self.timed_out = True
+                return None
+            time.sleep(self.poll_interval)
+
+    def iter_frames(self):
+        """
+        Yield the frames of the sequence in order as they become complete.
+        Stops after --last, when no new frame completed within the timeout, or at the first
+        missing frame once the sequence is finished.
+        """
+        if self.wait_for_first() is None:
+            return
+
+        frame = self.first
+        last_progress = time.time()
+        while self.last is None or frame <= self.last:
+            # Read before the frame: a frame written just before the event is set is still seen.
+            finished = self._is_finished()
+            if self._is_stable(frame, finished):
+                self._seen.pop(frame, None)
+                self.last_frame = frame
+                last_progress = time.time()
+                yield frame
+                frame += 1
+                continue
+            if finished:
+                self.stopped = True
+                return
+            if time.time() - last_progress > self.timeout:
+                self.timed_out = True
+                return
+            time.sleep(self.poll_interval)
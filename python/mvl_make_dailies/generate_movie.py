@@ -1,45 +1,62 @@
 # python/mvl_make_dailies/generate_movie.py
 
-import argparse
 import sys
-import os
-import subprocess
-import tempfile
-import re
+import argparse
+import contextlib
 
-from mvl_make_dailies.common_utils import (slate_args, burnin_args, reformat_args, colorspace_args, writer_args)
+from mvl_make_dailies.common_utils import get_knob_schema
 from mvl_make_dailies.common_utils import logger 
-from mvl_make_dailies.movie_commands import APP_MODE_COMMANDS
-
-def add_arguments_from_keys(parser, keys):
-    type_map = {
-        "str": str,
-        "int": int,
-        "float": float,
-        "bool": bool
-    }
 
-    for arg in keys:
-        arg = arg.copy()  # so you don't mutate the input
-        name = arg.pop("name")
+def add_arguments_from_schema(parser, schema):
+    """
+    Add the knob arguments of a compiled knob schema to a parser.
+    Types are already converted in the schema, so arguments are added as-is.
+    """
+    for error in schema.errors:
+        logger.error(error)
 
+    for name, kwargs in schema.argparse_spec:
         try:
-            # Convert "type" string to callable
-            if "type" in arg and isinstance(arg["type"], str):
-                arg["type"] = type_map[arg["type"].strip().lower()]
-            if "type" in arg and isinstance(arg['type'], float):
-                logger.info(f"add_arguments_from_keys float type {arg['type']} for node {name}")
-                
-            parser.add_argument(name, **arg)
-        except KeyError as e:
-            logger.error(f"Invalid type in argument '{name}': {e}")
+            parser.add_argument(name, **kwargs)
         except Exception as e:
             logger.error(f"Failed to add argument '{name}': {e}")
-                  
-def main(argv=None):
-    if argv is None:
-        argv = sys.argv[1:]
 
+# Arguments each app mode needs on top of the common ones.
+REQUIRED_MODE_ARGS = {
+    "daily": ("input", "output"),
+    "batch": ("manifest",),
+    "watch": ("watch_root",),
+    "houdini": ("input", "output"),
+    "maya": ("input", "output", "first", "last"),
+}
+
+# Application modes and their help text. The commands themselves live in movie_commands,
+# which is only imported once a command runs so that --help and argument errors stay fast.
+MODE_ACTIONS = {
+    "queue": ("add", "work", "status"),
+    "serve": ("start", "status", "stop"),
+}
+
+APP_MODES = {
+    "daily": "Use Nuke to render a movie from an image sequence.",
+    "batch": "Render every shot of a --manifest in a single Nuke session.",
+    "clear-rez-cache": "Remove the cached rez contexts used to launch Nuke.",
+    "bake": "Bake the Nuke template variant for the show settings given on the command line.",
+    "queue": "Queue dailies and run them within the host-wide DCC limits (actions: add, work, status).",
+    "watch": "Watch --watch-root directories and render a daily of every sequence once its frames stopped landing.",
+    "serve": "Keep --workers warm Nuke processes rendering the dailies of this host (actions: start, status, stop).",
+    "houdini": "Render the --input Houdini scene and encode its frames into a daily as they are rendered.",
+    "maya": "Playblast the --input Maya scene in parallel mayapy processes and encode it into a daily.",
+}
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the make_movie command line parser.
+    Only the knob schema is loaded, none of the rez or DCC modules.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
     parser = argparse.ArgumentParser(
         description="Generate a movie from an image sequence or Maya scene, adhering to dailies best practices.",
         formatter_class=argparse.RawTextHelpFormatter
@@ -48,23 +65,113 @@ def main(argv=None):
     parser.add_argument(
         "app_mode",
         default="daily",
-        choices=list(APP_MODE_COMMANDS.keys()),
-        help="Specify the application mode:\n"
-             " daily: Use Nuke to render a movie from an image sequence."
+        choices=list(APP_MODES.keys()),
+        help="Specify the application mode:\n" + "\n".join(f" {mode}: {text}" for mode, text in APP_MODES.items())
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=sorted({action for actions in MODE_ACTIONS.values() for action in actions}),
+        help="Queue mode action: add a daily, work through the queue or show its status (default).\n"
+             "Serve mode action: start the worker pool (default), show its status or stop it."
     )
 
-    parser.add_argument("--input", required=True, help="Path to the input image sequence (e.g., /path/to/sequence.####.exr).") 
-    parser.add_argument("--output", required=True, help="Path for the output movie file (e.g., /path/to/output.mov).")
+    parser.add_argument("--input", help="Path to the input image sequence (e.g., /path/to/sequence.####.exr), or the scene in houdini and maya modes.") 
+    parser.add_argument("--output", help="Path for the output movie file (e.g., /path/to/output.mov).")
     parser.add_argument("--first", type=int, help="Start frame.")
     parser.add_argument("--last", type=int, help="End frame.")
+    parser.add_argument("--chunks", type=int, default=None, help="Split the frame range into N segments (N chunks in the houdini and maya modes) rendered in parallel DCC processes; no more run at once than the host's slots of the DCC (see --dcc-limit).")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Frames per parallel segment (rounded up to the codec GOP size).")
+    parser.add_argument("--chunk-retries", type=int, default=None, help="Houdini and Maya modes: times a failed chunk is rendered again on its own (default: 2).")
+    parser.add_argument("--incremental", action="store_true", help="Keep the movie as segments next to the output and only re-render the segments whose frames or slate changed.")
+    parser.add_argument("--follow", action="store_true", help="Start while the sequence is still being rendered: encode frames as they land and finish when --last arrives or on --follow-timeout.")
+    parser.add_argument("--follow-timeout", type=float, default=None, help="Follow mode: seconds without a new frame before the daily is finished (default: 600).")
+    parser.add_argument("--max-parallel", type=int, default=None, help="Maximum number of DCC processes rendering segments or chunks at once, capped by the host's slots of the DCC (see --dcc-limit).")
+    parser.add_argument("--manifest", help="Batch mode: YAML or JSON file listing the shots to render.")
+    parser.add_argument("--report", help="Batch mode: write a JSON summary report to this path.")
+    parser.add_argument("--cache-dir", default=None, help="Directory for persistent caches (default: $MVL_MAKE_DAILIES_CACHE_DIR or ~/.cache/mvl_make_dailies).")
+    parser.add_argument("--rez-cache", action="store_true", help="Launch the DCCs in a cached rez context of the DCC package and $REZ_USED_REQUEST instead of resolving through mvl_rezboot. The cached request may resolve other package versions than mvl_rezboot.")
+    parser.add_argument("--rez-cache-ttl", type=float, default=None, help="Seconds a cached rez context stays valid (default: $MVL_MAKE_DAILIES_REZ_CACHE_TTL or 3600).")
+    parser.add_argument("--no-template-cache", action="store_true", help="Build the graph from the source template instead of a baked template variant.")
+    parser.add_argument("--slate-cache-dir", default=None, help="Directory of the rendered slate frame cache, can be shared between hosts (default: $MVL_MAKE_DAILIES_SLATE_CACHE_DIR or <cache dir>/slate_frames).")
+    parser.add_argument("--no-slate-cache", action="store_true", help="Render the slate frame instead of reusing a cached one.")
+    parser.add_argument("--deliverable", dest="deliverables", action="append", default=None, help="Extra movie rendered from the same pass as --output, as key=value pairs: output, codec, fps, format, burnin (on/off) or a writer knob argument such as mov64_fps, e.g. output=/dailies/sh010_edit.mov,codec=appr,burnin=off. Can be repeated.")
+    parser.add_argument("--previews", action="store_true", help="Also write a poster frame and a JPEG sprite sheet with its JSON index next to the movie, from the same Nuke pass.")
+    parser.add_argument("--poster-frame", type=int, default=None, help="Source frame of the poster (default: the middle frame).")
+    parser.add_argument("--sprite-interval", type=int, default=None, help="Sample a sprite sheet tile every N source frames (default: 10).")
+    parser.add_argument("--sprite-columns", type=int, default=None, help="Tiles per sprite sheet row (default: 10).")
+    parser.add_argument("--sprite-width", type=int, default=None, help="Width of a sprite sheet tile in pixels (default: 160).")
+    parser.add_argument("--proxy", default=None, help="Run the graph at the output resolution from the Read on: auto (the scale of the reformat) or a scale, e.g. 0.5. Proxy sequences next to the source are read when they exist.")
+    parser.add_argument("--bad-frames", choices=("fail", "hold", "checkerboard"), default=None, help="Missing, empty or truncated source frames found before launching Nuke: fail the daily (default), hold the previous good frame or render a checkerboard.")
+    parser.add_argument("--min-frame-size", type=int, default=None, help="Source frames smaller than this many bytes are bad (default: 1, only empty frames).")
+    parser.add_argument("--preflight-report", default=None, help="Write the JSON report of the source frame check to this path.")
+    parser.add_argument("--no-preflight", action="store_true", help="Launch Nuke without checking the source frames first.")
+    parser.add_argument("--watch-root", action="append", default=None, help="Watch mode: render root to watch recursively, can be repeated.")
+    parser.add_argument("--output-template", default=None, help="Watch mode: movie path of a sequence, with {directory}, {parent}, {name} and {extension} fields (default: {directory}/dailies/{name}.mov).")
+    parser.add_argument("--settle", type=float, default=None, help="Watch mode: seconds without new frames before a sequence is rendered (default: 30).")
+    parser.add_argument("--max-jobs", type=int, default=None, help="Watch mode and queue workers: maximum number of dailies rendering at once (default: 2).")
+    parser.add_argument("--poll-interval", type=float, default=None, help="Watch mode: seconds between scans when inotify is not available (default: 10).")
+    parser.add_argument("--priority", type=int, default=0, help="Queue mode: priority of the queued daily, higher runs first (default: 0).")
+    parser.add_argument("--max-attempts", type=int, default=None, help="Queue mode: attempts of a daily failing to launch before it is given up (default: 3).")
+    parser.add_argument("--drain", action="store_true", help="Queue worker: exit once the queue is empty instead of waiting for new jobs.")
+    parser.add_argument("--queue-db", default=None, help="Queue mode: job database (default: $MVL_MAKE_DAILIES_QUEUE_DB or <cache dir>/queue/jobs.sqlite).")
+    parser.add_argument("--dcc-limit", action="append", default=None, help="Host-wide limit of concurrent DCC processes, e.g. nuke=2; can be repeated (default: $MVL_MAKE_DAILIES_DCC_LIMITS, then nuke=2 and no limit for houdini and maya; 0 is unlimited). Parallel segments and chunks of a DCC never run more processes at once.")
+    parser.add_argument("--workers", type=int, default=None, help="Serve mode: number of warm Nuke worker processes (default: 2).")
+    parser.add_argument("--max-worker-jobs", type=int, default=None, help="Serve mode: jobs a worker renders before it is replaced by a fresh Nuke (default: 50).")
+    parser.add_argument("--max-worker-rss", type=float, default=None, help="Serve mode: resident memory in MB above which a worker is replaced after its job (default: no limit).")
+    parser.add_argument("--pool-socket", default=None, help="Address of the Nuke worker pool, a Unix socket path or host:port (default: $MVL_MAKE_DAILIES_POOL_SOCKET or <cache dir>/serve/nuke.sock).")
+    parser.add_argument("--pool-wait", type=float, default=None, help="Seconds a job waits for a free worker of the pool before Nuke is launched instead (default: 30).")
+    parser.add_argument("--no-pool", action="store_true", help="Launch a new Nuke process even when a worker pool is running.")
+    parser.add_argument("--strategy", choices=("rop", "flipbook"), default=None, help="Houdini mode: render through a Mantra/Karma ROP in hython processes (default) or flipbook the viewport of the current Houdini session.")
+    parser.add_argument("--rop-type", choices=("ifd", "karma"), default=None, help="Houdini mode: ROP rendering the frames, ifd (Mantra, default) or karma.")
+    parser.add_argument("--view", default=None, help="Houdini and Maya modes: name of the camera to render through (default: the first camera in Houdini, persp in Maya).")
+    parser.add_argument("--res-x", dest="resX", type=int, default=None, help="Houdini and Maya modes: horizontal render resolution (default: the camera or scene render resolution).")
+    parser.add_argument("--res-y", dest="resY", type=int, default=None, help="Houdini and Maya modes: vertical render resolution (default: the camera or scene render resolution).")
+    parser.add_argument("--flipbook-format", choices=("jpg", "exr"), default=None, help="Houdini mode: image format of flipbook frames, 8-bit jpg (default) or half-float exr.")
+    parser.add_argument("--trace", default=None, help="Write a Chrome trace-event JSON of the run (orchestrator and DCC processes) to this path, for chrome://tracing or ui.perfetto.dev.")
+    parser.add_argument("--force-polling", action="store_true", help="Watch mode: scan directories instead of using inotify, e.g. for NFS mounts written by other hosts.")
  
-    add_arguments_from_keys(parser, slate_args())
-    add_arguments_from_keys(parser, burnin_args())
-    add_arguments_from_keys(parser, reformat_args())
-    add_arguments_from_keys(parser, colorspace_args())
-    add_arguments_from_keys(parser, writer_args())        
+    add_arguments_from_schema(parser, get_knob_schema())
+    return parser
+
+def get_trace_path(argv):
+    """
+    The --trace value of a command line, read before the parser is built.
+    Scanned by hand, as every extra ArgumentParser costs gettext lookups at startup.
+    """
+    for index, arg in enumerate(argv):
+        if arg == "--trace" and index + 1 < len(argv):
+            return argv[index + 1]
+        if arg.startswith("--trace="):
+            return arg.split("=", 1)[1]
+    return None
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Started before the parser is built, so that loading the knob schema is traced too.
+    trace_path = get_trace_path(argv)
+    if trace_path:
+        from mvl_make_dailies.tracing import start_trace, span
+        start_trace(trace_path)
+        parse_span = span("parse arguments", "config")
+    else:
+        # Untraced runs do not import tracing (threading, shutil) just for a no-op span.
+        parse_span = contextlib.nullcontext()
+    with parse_span:
+        parser = build_parser()
+        args = parser.parse_args(argv)
+    missing = [f"--{name.replace('_', '-')}" for name in REQUIRED_MODE_ARGS.get(args.app_mode, ()) if getattr(args, name) is None]
+    if missing:
+        parser.error(f"{args.app_mode} mode requires {', '.join(missing)}")
+    if args.action and args.action not in MODE_ACTIONS.get(args.app_mode, ()):
+        if args.app_mode in MODE_ACTIONS:
+            parser.error(f"{args.app_mode} mode actions are {', '.join(MODE_ACTIONS[args.app_mode])}, not {args.action}")
+        parser.error(f"{args.app_mode} mode takes no action, only {' and '.join(MODE_ACTIONS)} modes do")
+
+    from mvl_make_dailies.movie_commands import APP_MODE_COMMANDS
 
-    args = parser.parse_args(argv)
     if args.app_mode in APP_MODE_COMMANDS:
         APP_MODE_COMMANDS[args.app_mode](vars(args))
     else:
@@ -0,0 +1,105 @@
+import os
+import time
+import socket
+from contextlib import contextmanager
+
+from mvl_make_dailies.cache_utils import get_cache_dir
+from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.tracing import record_span
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Host-wide limits on concurrent DCC processes, e.g. "nuke=2,houdini=1". 0 means unlimited.
+DCC_LIMITS_ENV = "MVL_MAKE_DAILIES_DCC_LIMITS"
+# Only Nuke is limited by default. Houdini and Maya chunks are sized by the cores of the host
+# (see movie_commands.get_parallel_budget); a limit for them is opt-in, e.g. for licences.
+DEFAULT_DCC_LIMITS = {"nuke": 2}
+# Launched tool name to the DCC whose limit applies.
+DCC_TOOL_NAMES = {"hython": "houdini", "mayapy": "maya"}
+SLOT_POLL_INTERVAL = 1.0
+
+
+def parse_dcc_limits(values) -> dict:
+    """
+    Parse "dcc=limit" pairs, e.g. ["nuke=2", "maya=1"] or ["nuke=2,maya=1"].
+
+    Raises:
+        ValueError: If a pair is malformed.
+    """
+    limits = {}
+    for value in values:
+        for pair in filter(None, (part.strip() for part in value.split(","))):
+            name, _, limit = pair.partition("=")
+            try:
+                limits[name.strip().lower()] = int(limit)
+            except ValueError:
+                raise ValueError(f"Invalid DCC limit '{pair}', expected <dcc>=<number of processes>")
+    return limits
+
+
+def get_dcc_limits(overrides=None) -> dict:
+    """
+    Get the host-wide DCC process limits: the defaults, then $MVL_MAKE_DAILIES_DCC_LIMITS,
+    then the overrides (e.g. --dcc-limit values).
+    """
+    limits = dict(DEFAULT_DCC_LIMITS)
+    limits.update(parse_dcc_limits([os.environ.get(DCC_LIMITS_ENV, "")]))
+    limits.update(parse_dcc_limits(overrides or []))
+    return limits
+
+
+def get_slot_dir(cache_dir=None) -> str:
+    """Directory of the slot lock files of this host."""
+    return get_cache_dir(os.path.join("dcc_slots", socket.gethostname()), cache_dir)
+
+
+@contextmanager
+def dcc_slot(tool, limits=None, cache_dir=None, poll_interval=SLOT_POLL_INTERVAL):
+    """
+    Hold one of the host-wide slots of a DCC while its process runs, waiting for a free one.
+    A slot is an flock on <slot dir>/<dcc>.<n>.lock; the kernel releases it when the holding
+    process dies, so a crashed render never leaks a slot. Without fcntl (Windows) or with a
+    limit of 0 the DCC is not throttled.
+
+    Args:
+        tool (str): Launched tool, e.g. "nuke".
+        limits (dict, optional): DCC limits, see get_dcc_limits.
+        cache_dir (str, optional): Cache root.
+        poll_interval (float): Seconds between attempts while every slot is taken.
+
+    Yields:
+        int: The slot number, or None when the DCC is not throttled.
+    """
+    dcc = DCC_TOOL_NAMES.get(tool, tool)
+    limit = (limits if limits is not None else get_dcc_limits()).get(dcc, 0)
+    if fcntl is None or limit <= 0:
+        yield None
+        return
+
+    slot_dir = get_slot_dir(cache_dir)
+    waited = False
+    started = time.time()
+    while True:
+        for slot in range(limit):
+            fd = os.open(os.path.join(slot_dir, f"{dcc}.{slot}.lock"), os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            if waited:
+                logger.info(f"Got {dcc} slot {slot} after waiting {time.time() - started:.1f}s")
+                record_span(f"wait for {dcc} slot", started, category="launch", slot=slot)
+            try:
+                yield slot
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+            return
+        if not waited:
+            logger.info(f"All {limit} {dcc} slots of this host are busy, waiting for one")
+            waited = True
+        time.sleep(poll_interval)
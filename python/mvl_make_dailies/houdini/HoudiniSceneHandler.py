@@ -3,11 +3,17 @@ import sys
 import hou
 
 from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.houdini.scene_metadata import SceneMetadataCache
+
 class HoudiniSceneHandler:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache_dir=None):
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"Houdini file not found: {file_path}")
         self.file_path = file_path
+        self.cache_dir = cache_dir
+        # Children of the queried parent networks by type and by name, built once per loaded scene.
+        self._node_index = {}
+        self._loaded_mtime_ns = None
 
 
     def get_scene_frame_range(self):
@@ -21,7 +27,11 @@ class HoudiniSceneHandler:
             bool: True if loaded successfully, False otherwise.
         """
         try:
+            # Taken before loading: a file changed during the load is not cached as this content.
+            loaded_mtime_ns = os.stat(self.file_path).st_mtime_ns
             hou.hipFile.load(self.file_path, suppress_save_prompt=True)
+            self._node_index = {}
+            self._loaded_mtime_ns = loaded_mtime_ns
             return True
         except Exception as e:
             logger.error(f"Failed to load Houdini file '{self.file_path}': {e}")
@@ -65,17 +75,48 @@ class HoudiniSceneHandler:
         if isinstance(type_names, str):
             type_names = [type_names]
 
-        found_nodes = []
-        parent_node = hou.node(parent_path)
+        index = self.get_node_index(parent_path)
+        if len(type_names) == 1:
+            return list(index["paths_by_type"].get(type_names[0], ()))
+        # Several types keep the order of the children.
+        return [path for path, type_name in index["paths"] if type_name in type_names]
 
-        if not parent_node:
-            raise ValueError(f"Invalid parent path: {parent_path}")
+    def get_node_index(self, parent_path="/obj"):
+        """
+        Return the index of the children of a network, built on first use and kept until
+        the next load_scene. Nodes created or deleted in between need invalidate_index.
 
-        for node in parent_node.children():
-            if node.type().name() in type_names:
-                found_nodes.append(node.path())
+        Args:
+            parent_path (str): Network path, default is "/obj".
+
+        Returns:
+            dict: "by_type" (type name to nodes, in children order), "by_name" (name to node),
+                "paths_by_type" (type name to node paths) and "paths" ((path, type name) of every child).
 
-        return found_nodes
+        Raises:
+            ValueError: If the network does not exist.
+        """
+        index = self._node_index.get(parent_path)
+        if index is None:
+            parent_node = hou.node(parent_path)
+            if not parent_node:
+                raise ValueError(f"Invalid parent path: {parent_path}")
+            index = {"by_type": {}, "by_name": {}, "paths_by_type": {}, "paths": []}
+            for node in parent_node.children():
+                type_name, path = node.type().name(), node.path()
+                index["by_type"].setdefault(type_name, []).append(node)
+                index["by_name"][node.name()] = node
+                index["paths_by_type"].setdefault(type_name, []).append(path)
+                index["paths"].append((path, type_name))
+            self._node_index[parent_path] = index
+        return index
+
+    def invalidate_index(self, parent_path=None):
+        """Forget the node index of a network, or of every network."""
+        if parent_path is None:
+            self._node_index = {}
+        else:
+            self._node_index.pop(parent_path, None)
            
     def get_fps(self):
         """Return the frame rate of the current scene."""
@@ -89,21 +130,26 @@ class HoudiniSceneHandler:
 
     def get_resolution(self):
         """Return the resolution from camera render settings (first cam found)."""
-        for cam_path in self.list_cameras():
-            cam = hou.node(cam_path)
+        for cam in self.get_node_index()["by_type"].get("cam", ()):
             resx = cam.parm("resx").eval()
             resy = cam.parm("resy").eval()
             return resx, resy
         return None, None
 
     def get_scene_metadata(self):
-        """Return all basic info as a dictionary."""
-        return {
+        """
+        Return all basic info as a dictionary, and store it in the metadata cache so that it
+        can be read without loading the scene, see scene_metadata.get_cached_scene_metadata.
+        """
+        metadata = {
             "fps": self.get_fps(),
             "frame_range": self.get_frame_range(),
             "cameras": self.list_cameras(),
             "resolution": self.get_resolution(),
         }
+        if self._loaded_mtime_ns is not None:
+            SceneMetadataCache(self.cache_dir).store(self.file_path, metadata, self._loaded_mtime_ns)
+        return metadata
 
     def getCameraPath(self, view=None):
         """
@@ -111,11 +157,13 @@ class HoudiniSceneHandler:
         Returns None if the viewport is in perspective/non-camera mode.
         """
         if hou.isUIAvailable() is False:
-            #camera = [n for n in hou.node("/obj").children() if n.type().name().lower() == view.lower()] if view else []
-            for camera in hou.node("/obj").children():
-                logger.info(f"Checking camera: {camera.name()} of type {camera.type().name()}")
-                if camera.type().name() == "cam" and (view is None or camera.name() == view):
-                    return camera.path()
+            index = self.get_node_index()
+            if view is None:
+                cameras = index["by_type"].get("cam")
+                return cameras[0].path() if cameras else None
+            camera = index["by_name"].get(view)
+            if camera is not None and camera.type().name() == "cam":
+                return camera.path()
             # if camera:
             #     return camera[0].path()
             # else:
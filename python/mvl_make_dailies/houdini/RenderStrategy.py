@@ -4,6 +4,46 @@ import hou
 import os
 
 from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.tracing import get_tracer
+
+# Python pre/post frame scripts of a ROP timing every rendered frame in the trace.
+TRACE_FRAME_SCRIPTS = {
+    "preframe": "from mvl_make_dailies import tracing; tracing.begin_frame(int(hou.frame()), key=hou.pwd().path(), rop=hou.pwd().path())",
+    "postframe": "from mvl_make_dailies import tracing; tracing.end_frame(key=hou.pwd().path())",
+}
+
+# Parms limiting the render threads of a ROP type: (use every core toggle, thread count).
+RENDER_THREAD_PARMS = {
+    "ifd": ("vm_usemaxthreads", "vm_threadcount"),
+}
+
+def set_render_threads(rop, rop_type, threads):
+    """
+    Limit the threads a ROP renders with. ROP types without thread parms rely on
+    $HOUDINI_MAXTHREADS, which the renderer they start inherits.
+    """
+    if not threads or rop_type not in RENDER_THREAD_PARMS:
+        return
+    toggle_parm, count_parm = RENDER_THREAD_PARMS[rop_type]
+    if rop.parm(toggle_parm) is None or rop.parm(count_parm) is None:
+        logger.warning(f"{rop.path()} has no {count_parm} parm, it renders with $HOUDINI_MAXTHREADS threads")
+        return
+    rop.parm(toggle_parm).set(False)
+    rop.parm(count_parm).set(threads)
+
+def add_frame_tracing(rop):
+    """Time every frame rendered by a ROP when the run is traced, see tracing.begin_frame."""
+    if get_tracer() is None:
+        return
+    for parm_name, script in TRACE_FRAME_SCRIPTS.items():
+        if rop.parm(parm_name) is None:
+            logger.warning(f"{rop.path()} has no {parm_name} script, its frames are not traced")
+            continue
+        rop.parm(parm_name).set(script)
+        rop.parm(f"l{parm_name}").set("python")
+        if rop.parm(f"t{parm_name}") is not None:
+            rop.parm(f"t{parm_name}").set(True)
+
 class BaseRenderStrategy(ABC):
     @abstractmethod
     def render(self, **kwargs):
@@ -22,7 +62,11 @@ class FlipbookRenderStrategy(BaseRenderStrategy):
                 return pane
         raise RuntimeError("No Scene Viewer available.")
 
-    def render(self, camera_path=None, output_path=None, start_frame=None, end_frame=None, res_x=1920, res_y=1080):
+    def render(self, camera_path=None, output_path=None, start_frame=None, end_frame=None, res_x=1920, res_y=1080, image_format="exr"):
+        """
+        Flipbook the viewport into <output dir>/flipbook_temp/frame.$F4.<image_format>.
+        The image format follows the extension: "exr" (half float) or an 8-bit format such as "jpg".
+        """
         if camera_path is None:
             cameras = self.scene.list_cameras()
             if not cameras:
@@ -38,7 +82,7 @@ class FlipbookRenderStrategy(BaseRenderStrategy):
 
         flipbook_dir = os.path.join(os.path.dirname(output_path), "flipbook_temp")
         os.makedirs(flipbook_dir, exist_ok=True)
-        flip_path = os.path.join(flipbook_dir, "frame.$F4.exr")
+        flip_path = os.path.join(flipbook_dir, f"frame.$F4.{image_format}")
 
         opts = self.viewer.flipbookSettings()
         #opts.camera(cam)
@@ -136,8 +180,8 @@ class RopRenderStrategy(BaseRenderStrategy):
         rop.parm("f2").set(end_frame)
         if output_path:
             output_path = os.path.join(output_path, "render")
-            if not os.path.exists(output_path):
-                os.makedirs(output_path)
+            # Chunks rendering the same scene in parallel create it at the same time.
+            os.makedirs(output_path, exist_ok=True)
             output_path = os.path.join(output_path, "image.$F4.exr")
             rop.parm("vm_picture").set(output_path)
         #rop.parm("resolutionx").set(res_x)
@@ -152,14 +196,13 @@ class RopRenderStrategy(BaseRenderStrategy):
         rop.parm("f2").set(end_frame)
         if output_path:
             output_path = os.path.join(output_path, "render")
-            if not os.path.exists(output_path):
-                os.makedirs(output_path)
+            os.makedirs(output_path, exist_ok=True)
             output_path = os.path.join(output_path, "image.$F4.exr")
             rop.parm("picture").set(output_path)
         rop.parm("resolutionx").set(res_x)
         rop.parm("resolutiony").set(res_y)
 
-    def render(self, camera_path=None, rop_type=None, start_frame=None, end_frame=None, output_path=None, res_x=None, res_y=None):
+    def render(self, camera_path=None, rop_type=None, start_frame=None, end_frame=None, output_path=None, res_x=None, res_y=None, threads=None):
         rop = self.get_or_create_default_rop(
             rop_type=rop_type,
             rop_name="mvl_mantra" if rop_type == "ifd" else "mvl_karma"
@@ -175,6 +218,8 @@ class RopRenderStrategy(BaseRenderStrategy):
         else:
             raise ValueError(f"Unsupported ROP type: {rop_type}")
 
+        set_render_threads(rop, rop_type, threads)
         logger.info(f"Rendering via ROP: {rop.path()} outpath")
+        add_frame_tracing(rop)
         rop.render(frame_range=(start_frame, end_frame))
         logger.info("ROP render complete.")
\ No newline at end of file
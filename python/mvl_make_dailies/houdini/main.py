@@ -0,0 +1,111 @@
+# python/mvl_make_dailies/houdini/main.py
+
+import argparse
+import os
+import sys
+
+from mvl_make_dailies.common_utils import logger, JOB_ERROR_EXIT_CODE, RENDER_ERROR_EXIT_CODE
+from mvl_make_dailies.tracing import init_trace, span
+from mvl_make_dailies.houdini.HoudiniSceneHandler import HoudiniSceneHandler
+from mvl_make_dailies.houdini.RenderStrategy import RopRenderStrategy
+from mvl_make_dailies.houdini.scene_metadata import SceneMetadataCache
+
+# Thread limit of the renderers a ROP starts (mantra, husk), read by every Houdini process.
+MAX_THREADS_ENV = "HOUDINI_MAXTHREADS"
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Render a frame chunk of a Houdini scene through a Mantra or Karma ROP.")
+    parser.add_argument("--input", required=True, help="Houdini scene file (.hip).")
+    parser.add_argument("--output", help="Render directory, frames are written to <output>/render/image.$F4.exr.")
+    parser.add_argument("--first", type=int, help="First frame of the chunk.")
+    parser.add_argument("--last", type=int, help="Last frame of the chunk.")
+    parser.add_argument("--rop-type", default="ifd", choices=("ifd", "karma"), help="ROP rendering the chunk: ifd (Mantra) or karma.")
+    parser.add_argument("--view", default=None, help="Name of the camera to render through (default: the first camera).")
+    parser.add_argument("--res-x", type=int, default=None, help="Horizontal resolution.")
+    parser.add_argument("--res-y", type=int, default=None, help="Vertical resolution.")
+    parser.add_argument("--threads", type=int, default=None, help="Render threads of the chunk (default: every core).")
+    parser.add_argument("--metadata", action="store_true", help="Only read the scene metadata into the metadata cache, nothing is rendered.")
+    parser.add_argument("--cache-dir", default=None, help="Cache root of the scene metadata cache.")
+    return parser
+
+def cache_scene_metadata(args):
+    """
+    Load the scene and store its metadata in the metadata cache, see scene_metadata.
+
+    Returns:
+        int: Exit code, JOB_ERROR_EXIT_CODE when the scene cannot be read.
+    """
+    try:
+        scene = HoudiniSceneHandler(args.input, cache_dir=args.cache_dir)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return JOB_ERROR_EXIT_CODE
+    with span("load houdini scene", "houdini", scene=args.input):
+        if not scene.load_scene():
+            return JOB_ERROR_EXIT_CODE
+    metadata = scene.get_scene_metadata()
+    logger.info(f"Metadata of {args.input}: {metadata}")
+    return 0
+
+def render_chunk(args):
+    """
+    Load the scene and render the frames of one chunk through a new ROP.
+    The scene is not saved, chunks of the same scene render at the same time.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments, see build_parser.
+
+    Returns:
+        int: Exit code: JOB_ERROR_EXIT_CODE when the scene cannot be read or has no camera, which
+        launching again would repeat, RENDER_ERROR_EXIT_CODE when the ROP render failed, which is
+        retried.
+    """
+    if args.threads:
+        # Set before the ROP starts its renderer, which inherits the environment.
+        os.environ[MAX_THREADS_ENV] = str(args.threads)
+
+    try:
+        scene = HoudiniSceneHandler(args.input, cache_dir=args.cache_dir)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return JOB_ERROR_EXIT_CODE
+    with span("load houdini scene", "houdini", scene=args.input):
+        if not scene.load_scene():
+            return JOB_ERROR_EXIT_CODE
+    # Every chunk loads the scene anyway, so the first one to get here caches its metadata.
+    if SceneMetadataCache(args.cache_dir).get(args.input) is None:
+        scene.get_scene_metadata()
+
+    camera_path = scene.getCameraPath(args.view)
+    if camera_path is None:
+        logger.error(f"No camera {args.view or ''} found in {args.input}")
+        return JOB_ERROR_EXIT_CODE
+
+    logger.info(f"Rendering frames {args.first}-{args.last} of {args.input} with camera {camera_path}")
+    with span("houdini chunk render", "houdini", first=args.first, last=args.last, threads=args.threads):
+        try:
+            RopRenderStrategy(scene).render(
+                camera_path=camera_path,
+                rop_type=args.rop_type,
+                start_frame=args.first,
+                end_frame=args.last,
+                output_path=args.output,
+                res_x=args.res_x,
+                res_y=args.res_y,
+                threads=args.threads,
+            )
+        except Exception as e:
+            logger.error(f"Render of frames {args.first}-{args.last} failed: {e}")
+            return RENDER_ERROR_EXIT_CODE
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.metadata and (args.output is None or args.first is None or args.last is None):
+        parser.error("rendering a chunk requires --output, --first and --last")
+    init_trace("hython")
+    sys.exit(cache_scene_metadata(args) if args.metadata else render_chunk(args))
+
+if __name__ == "__main__":
+    main()
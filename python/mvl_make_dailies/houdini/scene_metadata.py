@@ -0,0 +1,122 @@
+import os
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, read_json, atomic_write_json, touch, evict_lru
+from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.template_cache import hash_file
+
+# Bump when the metadata read from a scene changes, so entries written by older versions are not used.
+METADATA_VERSION = 1
+MAX_ENTRIES = 4096
+# Keys of get_scene_metadata stored as lists in JSON and returned as tuples.
+TUPLE_KEYS = ("frame_range", "resolution")
+
+
+class SceneMetadataCache:
+    """
+    Persistent cache of the metadata of Houdini scenes (fps, frame range, cameras, resolution),
+    so that planning and validation can read them without loading the scene. Importing this
+    module does not need Houdini.
+
+    Each scene gets one JSON entry under <cache dir>/houdini_metadata, keyed by its path and
+    holding the file mtime, size and content hash at the time the metadata was read:
+    - unchanged mtime and size: the entry is returned without reading the file.
+    - changed mtime, same size: the file is hashed and the entry is still used when the content
+      is the same (a copied or touched scene), with its mtime updated.
+    Entries are written by HoudiniSceneHandler.get_scene_metadata.
+
+    Args:
+        cache_dir (str, optional): Cache root (see cache_utils.get_cache_root).
+    """
+
+    def __init__(self, cache_dir=None):
+        self.directory = get_cache_dir("houdini_metadata", cache_dir)
+
+    def _entry_path(self, hip_path):
+        return os.path.join(self.directory, hash_key(os.path.normcase(hip_path)) + ".json")
+
+    def get(self, hip_path):
+        """
+        Return the cached metadata of a scene, or None if the scene changed since it was read.
+
+        Args:
+            hip_path (str): Houdini scene file.
+
+        Returns:
+            dict: Metadata as returned by HoudiniSceneHandler.get_scene_metadata, or None.
+        """
+        hip_path = os.path.abspath(hip_path)
+        try:
+            stat = os.stat(hip_path)
+        except OSError:
+            return None
+
+        entry_path = self._entry_path(hip_path)
+        entry = read_json(entry_path)
+        if not entry or entry.get("version") != METADATA_VERSION or entry.get("path") != hip_path:
+            return None
+        if entry["size"] != stat.st_size:
+            return None
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            if hash_file(hip_path) != entry["hash"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._write(entry_path, entry)
+        else:
+            touch(entry_path)
+
+        metadata = dict(entry["metadata"])
+        for key in TUPLE_KEYS:
+            if isinstance(metadata.get(key), list):
+                metadata[key] = tuple(metadata[key])
+        return metadata
+
+    def store(self, hip_path, metadata, mtime_ns=None):
+        """
+        Store the metadata of a scene.
+
+        Args:
+            hip_path (str): Houdini scene file.
+            metadata (dict): Metadata read from the scene.
+            mtime_ns (int, optional): File mtime when the scene was loaded. Nothing is stored if
+                the file changed since, the metadata may not match its content anymore.
+        """
+        hip_path = os.path.abspath(hip_path)
+        try:
+            stat = os.stat(hip_path)
+            if mtime_ns is not None and stat.st_mtime_ns != mtime_ns:
+                logger.info(f"{hip_path} changed since it was loaded, its metadata is not cached")
+                return
+            file_hash = hash_file(hip_path)
+        except OSError as e:
+            logger.warning(f"Could not cache the metadata of {hip_path}: {e}")
+            return
+        self._write(self._entry_path(hip_path), {
+            "version": METADATA_VERSION,
+            "path": hip_path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": file_hash,
+            "metadata": metadata,
+        })
+
+    def _write(self, entry_path, entry):
+        try:
+            atomic_write_json(entry_path, entry)
+            evict_lru(self.directory, max_entries=MAX_ENTRIES, suffix=".json")
+        except OSError as e:
+            logger.warning(f"Could not update Houdini metadata cache {entry_path}: {e}")
+
+
+def get_cached_scene_metadata(hip_path, cache_dir=None):
+    """
+    Return the metadata of a Houdini scene from the metadata cache, without loading Houdini.
+
+    Args:
+        hip_path (str): Houdini scene file.
+        cache_dir (str, optional): Cache root.
+
+    Returns:
+        dict: Metadata (fps, frame_range, cameras, resolution), or None when the scene was not
+            read since it last changed.
+    """
+    return SceneMetadataCache(cache_dir).get(hip_path)
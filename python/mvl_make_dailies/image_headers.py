@@ -0,0 +1,299 @@
+import os
+import mmap
+import struct
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, read_json, atomic_write_json
+from mvl_make_dailies.sequence_utils import Sequence, FrameSet, parse_sequence_path
+
+HEADER_CACHE_VERSION = 1
+# Header reads are bound by filesystem latency (NFS round trips), not CPU.
+DEFAULT_HEADER_WORKERS = 32
+
+# Windows are inclusive (xmin, ymin, xmax, ymax) boxes, as in OpenEXR.
+ImageHeader = namedtuple("ImageHeader", "file_format width height data_window display_window channels compression pixel_aspect timecode")
+
+EXR_COMPRESSIONS = ("none", "rle", "zips", "zip", "piz", "pxr24", "b44", "b44a", "dwaa", "dwab")
+DPX_CHANNELS = {1: "R", 2: "G", 3: "B", 4: "A", 6: "Y", 50: "RGB", 51: "RGBA", 52: "ABGR"}
+PNG_CHANNELS = {0: "Y", 2: "RGB", 3: "RGB", 4: "YA", 6: "RGBA"}
+JPEG_CHANNELS = {1: "Y", 3: "RGB", 4: "CMYK"}
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Formats Nuke ships with, by width, height and pixel aspect.
+NUKE_FORMATS = {
+    (1920, 1080, 1.0): "HD_1080",
+    (1280, 720, 1.0): "HD_720",
+    (3840, 2160, 1.0): "UHD_4K",
+    (2048, 1080, 1.0): "2K_DCP",
+    (4096, 2160, 1.0): "4K_DCP",
+    (1024, 778, 1.0): "1K_Super_35(full-ap)",
+    (2048, 1556, 1.0): "2K_Super_35(full-ap)",
+    (4096, 3112, 1.0): "4K_Super_35(full-ap)",
+    (1024, 1024, 1.0): "square_1K",
+    (2048, 2048, 1.0): "square_2K",
+    (720, 576, 1.09): "PAL",
+    (720, 486, 0.91): "NTSC",
+}
+
+
+def _box(width, height):
+    return (0, 0, width - 1, height - 1)
+
+
+def _exr_timecode(value) -> str:
+    """Decode an SMPTE timecode packed as in the OpenEXR timeCode attribute."""
+    frames = (value & 0x0F) + ((value >> 4) & 0x03) * 10
+    seconds = ((value >> 8) & 0x0F) + ((value >> 12) & 0x07) * 10
+    minutes = ((value >> 16) & 0x0F) + ((value >> 20) & 0x07) * 10
+    hours = ((value >> 24) & 0x0F) + ((value >> 28) & 0x03) * 10
+    separator = ";" if value & 0x40 else ":"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{frames:02d}"
+
+
+def _bcd_timecode(value) -> str:
+    """Decode an SMPTE timecode packed as 0xHHMMSSFF binary coded decimals, as in DPX."""
+    digits = [(value >> shift) & 0xFF for shift in (24, 16, 8, 0)]
+    return ":".join(f"{(byte >> 4) * 10 + (byte & 0x0F):02d}" for byte in digits)
+
+
+def _read_exr(data):
+    attributes = {}
+    offset = 8
+    while True:
+        name_end = data.find(b"\0", offset)
+        if name_end < 0:
+            raise ValueError("unterminated EXR header")
+        if name_end == offset:
+            break
+        type_end = data.find(b"\0", name_end + 1)
+        size = struct.unpack_from("<i", data, type_end + 1)[0]
+        value_offset = type_end + 5
+        attributes[bytes(data[offset:name_end])] = (bytes(data[name_end + 1:type_end]), value_offset, size)
+        offset = value_offset + size
+
+    def value(name):
+        return attributes.get(name, (None, None, None))[1]
+
+    data_window = struct.unpack_from("<iiii", data, value(b"dataWindow"))
+    display_window = struct.unpack_from("<iiii", data, value(b"displayWindow"))
+    channels = []
+    if b"channels" in attributes:
+        _, channel_offset, size = attributes[b"channels"]
+        end = channel_offset + size - 1
+        while channel_offset < end:
+            name_end = data.find(b"\0", channel_offset)
+            channels.append(bytes(data[channel_offset:name_end]).decode("utf-8", "replace"))
+            channel_offset = name_end + 1 + 16
+    compression = data[value(b"compression")] if b"compression" in attributes else 0
+    pixel_aspect = struct.unpack_from("<f", data, value(b"pixelAspectRatio"))[0] if b"pixelAspectRatio" in attributes else 1.0
+    timecode = _exr_timecode(struct.unpack_from("<I", data, value(b"timeCode"))[0]) if b"timeCode" in attributes else None
+    return ImageHeader(
+        file_format="exr",
+        width=display_window[2] - display_window[0] + 1,
+        height=display_window[3] - display_window[1] + 1,
+        data_window=data_window,
+        display_window=display_window,
+        channels=",".join(channels),
+        compression=EXR_COMPRESSIONS[compression] if compression < len(EXR_COMPRESSIONS) else str(compression),
+        pixel_aspect=round(pixel_aspect, 4),
+        timecode=timecode,
+    )
+
+
+def _read_dpx(data):
+    order = ">" if data[:4] == b"SDPX" else "<"
+    width, height = struct.unpack_from(f"{order}II", data, 772)
+    descriptor = data[800]
+    encoding = struct.unpack_from(f"{order}H", data, 806)[0]
+    aspect_x, aspect_y = struct.unpack_from(f"{order}II", data, 1628) if len(data) >= 1636 else (0, 0)
+    pixel_aspect = aspect_x / aspect_y if aspect_x and aspect_y and 0xFFFFFFFF not in (aspect_x, aspect_y) else 1.0
+    timecode = struct.unpack_from(f"{order}I", data, 1920)[0] if len(data) >= 1924 else 0xFFFFFFFF
+    return ImageHeader(
+        file_format="dpx",
+        width=width,
+        height=height,
+        data_window=_box(width, height),
+        display_window=_box(width, height),
+        channels=DPX_CHANNELS.get(descriptor, str(descriptor)),
+        compression="rle" if encoding == 1 else "none",
+        pixel_aspect=round(pixel_aspect, 4),
+        timecode=None if timecode == 0xFFFFFFFF else _bcd_timecode(timecode),
+    )
+
+
+def _read_png(data):
+    width, height, _depth, color_type = struct.unpack_from(">IIBB", data, 16)
+    pixel_aspect = 1.0
+    offset = 8
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack_from(">I4s", data, offset)
+        if chunk_type == b"IDAT":
+            break
+        if chunk_type == b"pHYs":
+            per_unit_x, per_unit_y = struct.unpack_from(">II", data, offset + 8)
+            if per_unit_x and per_unit_y:
+                pixel_aspect = per_unit_y / per_unit_x
+        offset += 12 + length
+    return ImageHeader("png", width, height, _box(width, height), _box(width, height),
+                       PNG_CHANNELS.get(color_type, str(color_type)), "deflate", round(pixel_aspect, 4), None)
+
+
+def _read_jpeg(data):
+    pixel_aspect = 1.0
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            raise ValueError("invalid JPEG marker")
+        marker = data[offset + 1]
+        length = struct.unpack_from(">H", data, offset + 2)[0]
+        if marker == 0xE0 and bytes(data[offset + 4:offset + 9]) == b"JFIF\0":
+            units, density_x, density_y = struct.unpack_from(">BHH", data, offset + 11)
+            if units == 0 and density_x and density_y:
+                pixel_aspect = density_y / density_x
+        elif marker in JPEG_SOF_MARKERS:
+            height, width, components = struct.unpack_from(">HHB", data, offset + 5)
+            return ImageHeader("jpeg", width, height, _box(width, height), _box(width, height),
+                               JPEG_CHANNELS.get(components, str(components)),
+                               "progressive" if marker == 0xC2 else "baseline", round(pixel_aspect, 4), None)
+        offset += 2 + length
+    raise ValueError("no JPEG frame header")
+
+
+def read_header(path):
+    """
+    Read the header of an EXR, DPX, PNG or JPEG image. The file is memory mapped and only the
+    pages holding the header are read, never the pixels.
+
+    Args:
+        path (str): Image path.
+
+    Returns:
+        ImageHeader: The header, or None if the file is missing, unsupported or unreadable.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic = data[:4]
+            if magic == b"\x76\x2f\x31\x01":
+                return _read_exr(data)
+            if magic in (b"SDPX", b"XPDS"):
+                return _read_dpx(data)
+            if magic == b"\x89PNG":
+                return _read_png(data)
+            if magic[:3] == b"\xff\xd8\xff":
+                return _read_jpeg(data)
+    except (OSError, ValueError, TypeError, IndexError, struct.error):
+        return None
+    return None
+
+
+def read_sequence_headers(sequence_path, frames, cache_dir=None, workers=DEFAULT_HEADER_WORKERS) -> dict:
+    """
+    Read the headers of the frames of a sequence in parallel.
+    Headers are cached under <cache dir>/image_headers per sequence, keyed by frame size and
+    mtime, so later runs only read the frames that changed.
+
+    Args:
+        sequence_path (str): Sequence pattern or frame path, see sequence_utils.parse_sequence_path.
+        frames (iterable): Frame numbers.
+        cache_dir (str, optional): Cache root.
+        workers (int): Number of reading threads.
+
+    Returns:
+        dict: Frame number to ImageHeader, or None for a missing or unreadable frame.
+
+    Raises:
+        ValueError: If the path has no frame number or padding.
+    """
+    parsed = parse_sequence_path(sequence_path)
+    if parsed is None:
+        raise ValueError(f"No frame number or padding found in sequence path: {sequence_path}")
+    sequence = Sequence(*parsed, FrameSet())
+    cache_path = os.path.join(get_cache_dir("image_headers", cache_dir),
+                              f"{hash_key(HEADER_CACHE_VERSION, os.path.abspath(sequence.pattern))}.json")
+    cached = read_json(cache_path) or {}
+    cached_frames = cached.get("frames", {}) if cached.get("version") == HEADER_CACHE_VERSION else {}
+
+    def read(frame):
+        path = sequence.frame_path(frame)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return frame, None, None
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        entry = cached_frames.get(str(frame))
+        if entry and entry[0] == fingerprint:
+            header = ImageHeader(**{k: tuple(v) if isinstance(v, list) else v for k, v in entry[1].items()}) if entry[1] else None
+        else:
+            header = read_header(path)
+        return frame, fingerprint, header
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(read, frames))
+
+    headers = {frame: header for frame, _, header in results}
+    entries = {str(frame): [fingerprint, header._asdict() if header else None]
+               for frame, fingerprint, header in results if fingerprint}
+    if entries != cached_frames:
+        try:
+            atomic_write_json(cache_path, {"version": HEADER_CACHE_VERSION, "sequence": sequence.pattern, "frames": entries})
+        except OSError:
+            pass
+    return headers
+
+
+def summarize_headers(headers) -> tuple:
+    """
+    Find the resolution shared by most frames and the frames that differ from it.
+
+    Args:
+        headers (dict): Frame number to ImageHeader, see read_sequence_headers.
+
+    Returns:
+        tuple: (ImageHeader of the first frame with the common resolution or None,
+        FrameSet of the frames with another resolution or pixel aspect)
+    """
+    def resolution(header):
+        return header.display_window, header.pixel_aspect
+
+    readable = {frame: header for frame, header in headers.items() if header is not None}
+    if not readable:
+        return None, FrameSet()
+    common = Counter(resolution(header) for header in readable.values()).most_common(1)[0][0]
+    reference = next(readable[frame] for frame in sorted(readable) if resolution(readable[frame]) == common)
+    mismatched = FrameSet.from_frames(frame for frame, header in readable.items() if resolution(header) != common)
+    return reference, mismatched
+
+
+def nuke_format_for(header) -> str:
+    """
+    Name of the Nuke format matching an image header, e.g. "HD_1080". Formats Nuke does not
+    ship with are described as "<width> <height> <pixel aspect> <name>", for nuke.addFormat.
+    """
+    name = NUKE_FORMATS.get((header.width, header.height, header.pixel_aspect))
+    if name:
+        return name
+    name = f"MVL_{header.width}x{header.height}"
+    if header.pixel_aspect != 1.0:
+        name += f"_{header.pixel_aspect:g}".replace(".", "p")
+    return f"{header.width} {header.height} {header.pixel_aspect:g} {name}"
+
+
+def format_size(format_value):
+    """
+    Size of a format given by name (Nuke built-in formats only) or as "<width> <height>
+    <pixel aspect> <name>", see nuke_format_for.
+
+    Returns:
+        tuple: (width, height, pixel aspect), or None for an unknown format.
+    """
+    parts = str(format_value or "").split()
+    if len(parts) >= 3:
+        try:
+            return int(parts[0]), int(parts[1]), float(parts[2])
+        except ValueError:
+            return None
+    for size, name in NUKE_FORMATS.items():
+        if name == format_value:
+            return size
+    return None
@@ -0,0 +1,157 @@
+import os
+import json
+
+from mvl_make_dailies.cache_utils import hash_key, read_json, atomic_write_json
+from mvl_make_dailies.chunked_render import split_frame_range
+from mvl_make_dailies.sequence_utils import Sequence, FrameSet, parse_sequence_path
+
+INCREMENTAL_MANIFEST_VERSION = 2
+
+# Frames per persistent segment, rounded up to the codec GOP size.
+DEFAULT_SEGMENT_SIZE = 48
+
+SLATE_SEGMENT = "slate"
+
+# Job keys that change every frame of the movie when they change. The previews are keyed per
+# segment instead (see get_previews_key): their poster frame and range move with the frame range.
+MOVIE_PAYLOAD_KEYS = ("src", "read", "burnin", "reformat", "colorspace", "write", "template", "proxy")
+
+
+def get_manifest_path(output_path) -> str:
+    """Path of the sidecar manifest of an output movie, e.g. "shot.mov" -> "shot.daily.json"."""
+    return os.path.splitext(output_path)[0] + ".daily.json"
+
+
+def get_segment_store_dir(output_path) -> str:
+    """Hidden directory next to an output movie keeping its segments between runs."""
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    base_name = os.path.splitext(os.path.basename(output_path))[0]
+    return os.path.join(output_dir, f".{base_name}_segments")
+
+
+def frame_fingerprints(sequence_path, frames) -> dict:
+    """
+    Fingerprint the source frames of a movie.
+
+    Args:
+        sequence_path (str): Sequence pattern or frame path, see sequence_utils.parse_sequence_path.
+        frames (iterable): Frame numbers.
+
+    Returns:
+        dict: Frame number to [size, mtime] (None for a missing frame).
+
+    Raises:
+        ValueError: If the path has no frame number or padding.
+    """
+    parsed = parse_sequence_path(sequence_path)
+    if parsed is None:
+        raise ValueError(f"No frame number or padding found in sequence path: {sequence_path}")
+    sequence = Sequence(*parsed, FrameSet())
+
+    fingerprints = {}
+    for frame in frames:
+        try:
+            stat = os.stat(sequence.frame_path(frame))
+            fingerprints[frame] = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            fingerprints[frame] = None
+    return fingerprints
+
+
+def get_previews_key(previews, frames):
+    """
+    Preview values a source segment renders with: the sprite tile grid, and the poster frame when
+    the segment holds it. A moved poster frame or a longer range leaves the other segments clean.
+    """
+    if not previews:
+        return None
+    poster_frame = previews["poster_frame"] if previews["poster_frame"] in frames else None
+    return [previews["first"], previews["interval"], previews["tile_width"], poster_frame]
+
+
+def plan_segments(job, segment_size, gop_size) -> list:
+    """
+    Split a movie into the persistent segments of incremental mode.
+    The slate frame is a segment of its own, so a metadata change only re-renders it.
+    Source frames are split on a fixed grid starting at the first source frame, so segments
+    keep their boundaries from one run to the next.
+
+    Args:
+        job (dict): Job payload from build_nuke_job.
+        segment_size (int): Frames per source segment, rounded up to the GOP size.
+        gop_size (int): Keyframe interval of the codec.
+
+    Returns:
+        list: Segment dicts with name, first, last and fingerprint.
+    """
+    has_slate = bool(job["slate"].get("slate"))
+    source_range = range(job["first"] + 1 if has_slate else job["first"], job["last"] + 1)
+    fingerprints = frame_fingerprints(job["src"], source_range)
+
+    segments = []
+    if has_slate:
+        segments.append({
+            "name": SLATE_SEGMENT,
+            "first": job["first"],
+            "last": job["first"],
+            # Source frames are included so the thumbnail shown on the slate stays current.
+            "fingerprint": hash_key(json.dumps(job["slate"], sort_keys=True), job["first"], job["last"],
+                                    json.dumps(fingerprints, sort_keys=True)),
+        })
+    for index, frames in enumerate(split_frame_range(source_range, chunk_size=segment_size, gop_size=gop_size)):
+        segments.append({
+            "name": f"{index:04d}",
+            "first": frames.start,
+            "last": frames.stop - 1,
+            "fingerprint": hash_key(json.dumps([fingerprints[frame] for frame in frames]),
+                                    json.dumps(get_previews_key(job.get("previews"), frames))),
+        })
+    return segments
+
+
+def get_movie_payload_hash(job) -> str:
+    """Hash of the job values affecting every frame of the movie."""
+    return hash_key(INCREMENTAL_MANIFEST_VERSION, json.dumps({k: job.get(k) for k in MOVIE_PAYLOAD_KEYS}, sort_keys=True))
+
+
+def find_dirty_segments(job, segments, segment_dir) -> list:
+    """
+    Compare planned segments with the sidecar manifest of the previous run.
+
+    Args:
+        job (dict): Job payload from build_nuke_job.
+        segments (list): Planned segments, see plan_segments.
+        segment_dir (str): Directory holding the segments of the previous run.
+
+    Returns:
+        list: The segments that have to be rendered again.
+    """
+    manifest = read_json(get_manifest_path(job["dst"]))
+    if (not manifest or manifest.get("version") != INCREMENTAL_MANIFEST_VERSION
+            or manifest.get("payload_hash") != get_movie_payload_hash(job)
+            or not os.path.isfile(job["dst"])):
+        return list(segments)
+
+    previous = {(segment["name"], segment["first"], segment["last"]): segment["fingerprint"]
+                for segment in manifest.get("segments", [])}
+    dirty = []
+    for segment in segments:
+        key = (segment["name"], segment["first"], segment["last"])
+        if previous.get(key) != segment["fingerprint"] or not os.path.isfile(get_segment_file(segment_dir, segment)):
+            dirty.append(segment)
+    return dirty
+
+
+def get_segment_file(segment_dir, segment) -> str:
+    return os.path.join(segment_dir, f"segment.{segment['name']}.mov")
+
+
+def write_manifest(job, segments):
+    """Record the rendered segments in the sidecar manifest of the output movie."""
+    atomic_write_json(get_manifest_path(job["dst"]), {
+        "version": INCREMENTAL_MANIFEST_VERSION,
+        "output": job["dst"],
+        "payload_hash": get_movie_payload_hash(job),
+        "payloads": {k: job.get(k) for k in MOVIE_PAYLOAD_KEYS + ("slate", "previews")},
+        "segments": segments,
+    })
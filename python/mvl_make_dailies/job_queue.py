@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from mvl_make_dailies.cache_utils import get_cache_dir
+from mvl_make_dailies.common_utils import logger, LaunchError
+
+QUEUE_DB_ENV = "MVL_MAKE_DAILIES_QUEUE_DB"
+DEFAULT_MAX_ATTEMPTS = 3
+# Seconds before the first retry of a failed launch, doubled on every further attempt.
+RETRY_DELAY = 30.0
+# Window of the throughput figures of the status view.
+THROUGHPUT_WINDOW = 3600
+DEFAULT_QUEUE_WORKERS = 2
+# Seconds an idle queue worker waits before claiming again.
+QUEUE_POLL_INTERVAL = 2.0
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT NOT NULL,
+    args TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    not_before REAL NOT NULL DEFAULT 0,
+    worker TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, id);
+"""
+
+
+def get_queue_path(queue_db=None, cache_dir=None) -> str:
+    """
+    Get the path of the job queue database: queue_db, $MVL_MAKE_DAILIES_QUEUE_DB or
+    <cache root>/queue/jobs.sqlite. The database is local to a host, keep it off network shares.
+    """
+    return queue_db or os.environ.get(QUEUE_DB_ENV) or os.path.join(get_cache_dir("queue", cache_dir), "jobs.sqlite")
+
+
+def get_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _is_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class JobQueue:
+    """
+    SQLite backed queue of dailies jobs shared by every make_movie process of a host.
+    Jobs are claimed highest priority first, then in submission order. Claims run in an
+    immediate transaction, so concurrent workers never take the same job.
+
+    Args:
+        path (str): Database path, see get_queue_path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call, so the queue can be used from worker threads.
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, mode, args, priority=0, max_attempts=DEFAULT_MAX_ATTEMPTS) -> int:
+        """
+        Add a job to the queue.
+
+        Args:
+            mode (str): Job mode, e.g. "daily".
+            args (dict): Command arguments of the job.
+            priority (int): Higher priorities run first.
+            max_attempts (int): Attempts before a job failing to launch is given up.
+
+        Returns:
+            int: The job id.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (mode, args, priority, status, max_attempts, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (mode, json.dumps(args), priority, QUEUED, max_attempts, time.time()))
+            return cursor.lastrowid
+
+    def claim(self, worker=None):
+        """
+        Take the next runnable job and mark it running.
+
+        Returns:
+            dict: The job (id, mode, args, attempts, max_attempts), or None if no job is runnable.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT id, mode, args, attempts, max_attempts FROM jobs WHERE status = ? AND not_before <= ? "
+                "ORDER BY priority DESC, id LIMIT 1", (QUEUED, now)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, started_at = ? WHERE id = ?",
+                       (RUNNING, worker or get_worker_name(), now, row["id"]))
+        return {"id": row["id"], "mode": row["mode"], "args": json.loads(row["args"]),
+                "attempts": row["attempts"] + 1, "max_attempts": row["max_attempts"]}
+
+    def complete(self, job_id):
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET status = ?, error = NULL, finished_at = ? WHERE id = ?",
+                       (SUCCEEDED, time.time(), job_id))
+
+    def fail(self, job_id, error, retry=False) -> bool:
+        """
+        Record a failed attempt. A retryable failure puts the job back in the queue with an
+        exponential delay until it ran out of attempts.
+
+        Returns:
+            bool: Whether the job will be retried.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if retry and row is not None and row["attempts"] < row["max_attempts"]:
+                delay = RETRY_DELAY * 2 ** (row["attempts"] - 1)
+                db.execute("UPDATE jobs SET status = ?, error = ?, not_before = ?, worker = NULL WHERE id = ?",
+                           (QUEUED, error, now + delay, job_id))
+                return True
+            db.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                       (FAILED, error, now, job_id))
+            return False
+
+    def requeue_orphans(self) -> int:
+        """
+        Put back the running jobs of workers of this host that died without finishing them.
+
+        Returns:
+            int: Number of jobs put back in the queue.
+        """
+        host = socket.gethostname()
+        requeued = 0
+        with self._transaction() as db:
+            for row in db.execute("SELECT id, worker FROM jobs WHERE status = ?", (RUNNING,)).fetchall():
+                worker_host, _, pid = (row["worker"] or "").rpartition(":")
+                if worker_host == host and pid.isdigit() and not _is_alive(int(pid)):
+                    db.execute("UPDATE jobs SET status = ?, worker = NULL WHERE id = ?", (QUEUED, row["id"]))
+                    requeued += 1
+        return requeued
+
+    def has_pending(self) -> bool:
+        """Whether jobs are still queued, including ones waiting for a retry."""
+        with self._connect() as db:
+            return db.execute("SELECT 1 FROM jobs WHERE status = ? LIMIT 1", (QUEUED,)).fetchone() is not None
+
+    def status(self, window=THROUGHPUT_WINDOW) -> dict:
+        """
+        Summarize the queue.
+
+        Returns:
+            dict: Job counts per status and mode, the oldest queued job wait, and the jobs finished,
+            throughput (jobs per hour) and mean run time over the last window seconds.
+        """
+        now = time.time()
+        with self._connect() as db:
+            counts = {}
+            for row in db.execute("SELECT status, mode, COUNT(*) AS count FROM jobs GROUP BY status, mode"):
+                counts.setdefault(row["status"], {})[row["mode"]] = row["count"]
+            oldest = db.execute("SELECT MIN(enqueued_at) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+            recent = db.execute(
+                "SELECT status, COUNT(*) AS count, AVG(finished_at - started_at) AS seconds FROM jobs "
+                "WHERE finished_at >= ? GROUP BY status", (now - window,)).fetchall()
+            running = [dict(row) for row in db.execute(
+                "SELECT id, mode, worker, started_at, attempts FROM jobs WHERE status = ? ORDER BY started_at", (RUNNING,))]
+
+        finished = {row["status"]: row for row in recent}
+        succeeded = finished[SUCCEEDED]["count"] if SUCCEEDED in finished else 0
+        return {
+            "counts": counts,
+            "queued": sum(counts.get(QUEUED, {}).values()),
+            "running": running,
+            "oldest_wait": round(now - oldest, 1) if oldest else 0.0,
+            "window": window,
+            "succeeded": succeeded,
+            "failed": finished[FAILED]["count"] if FAILED in finished else 0,
+            "throughput": round(succeeded * 3600.0 / window, 1),
+            "mean_seconds": round(finished[SUCCEEDED]["seconds"] or 0.0, 1) if SUCCEEDED in finished else 0.0,
+        }
+
+
+def run_queued_job(queue, job, commands):
+    """
+    Run a claimed job and record its outcome. Transient launch failures (rez resolve, DCC start
+    or crash, missing licence) are retried; invalid jobs and jobs failed by the DCC itself fail
+    right away.
+
+    Args:
+        queue (JobQueue): Queue the job was claimed from.
+        job (dict): Claimed job, see JobQueue.claim.
+        commands (dict): Job mode to the function rendering its args, raising on failure.
+    """
+    logger.info(f"Job {job['id']} ({job['mode']}) attempt {job['attempts']}/{job['max_attempts']}: "
+                f"{job['args'].get('input')} -> {job['args'].get('output')}")
+    started = time.time()
+    try:
+        commands[job["mode"]](job["args"])
+    except LaunchError as e:
+        if queue.fail(job["id"], str(e), retry=e.transient):
+            logger.warning(f"Job {job['id']} failed to launch, retrying later: {e}")
+        elif not e.transient:
+            logger.error(f"Job {job['id']} failed: {e}")
+        else:
+            logger.error(f"Job {job['id']} failed after {job['attempts']} attempts: {e}")
+    except Exception as e:
+        queue.fail(job["id"], str(e))
+        logger.error(f"Job {job['id']} failed: {e}")
+    else:
+        queue.complete(job["id"])
+        logger.info(f"Job {job['id']} done in {time.time() - started:.1f}s")
+
+
+def work_queue(queue, commands, workers=DEFAULT_QUEUE_WORKERS, drain=False):
+    """
+    Run queued jobs on worker threads until interrupted, or until the queue is empty when
+    draining. DCC processes are throttled host-wide by their launches (see host_slots),
+    whatever the number of workers and worker processes.
+
+    Args:
+        queue (JobQueue): Queue to run the jobs of.
+        commands (dict): Job mode to the function rendering its args, see run_queued_job.
+        workers (int): Jobs running at once.
+        drain (bool): Return once the queue is empty instead of waiting for new jobs.
+    """
+    requeued = queue.requeue_orphans()
+    if requeued:
+        logger.info(f"Put back {requeued} jobs of workers that died")
+
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                job = queue.claim()
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue busy: {e}")
+                job = None
+            if job is not None:
+                run_queued_job(queue, job, commands)
+            elif drain and not queue.has_pending():
+                return
+            else:
+                stop.wait(QUEUE_POLL_INTERVAL)
+
+    logger.info(f"Queue worker started with {workers} workers on {queue.path}")
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        logger.info("Stopping the queue worker after the running jobs")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def log_queue_status(queue):
+    """Log the queue depth, the running jobs and the throughput, see JobQueue.status."""
+    status = queue.status()
+    logger.info(f"Queue {queue.path}")
+    logger.info(f"  queued: {status['queued']} (oldest waiting {status['oldest_wait']}s)")
+    for state, modes in sorted(status["counts"].items()):
+        logger.info(f"  {state}: " + ", ".join(f"{mode}={count}" for mode, count in sorted(modes.items())))
+    for job in status["running"]:
+        logger.info(f"  running job {job['id']} ({job['mode']}) on {job['worker']} for "
+                    f"{time.time() - job['started_at']:.0f}s, attempt {job['attempts']}")
+    logger.info(f"  last {status['window'] // 60} min: {status['succeeded']} succeeded, {status['failed']} failed, "
+                f"{status['throughput']} jobs/hour, {status['mean_seconds']}s per job")
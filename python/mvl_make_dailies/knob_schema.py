@@ -0,0 +1,137 @@
+import os
+import hashlib
+from collections import namedtuple
+from types import MappingProxyType
+
+SCHEMA_CACHE_VERSION = 1
+# Set to "0" to always load the schema through the config system instead of the on-disk cache.
+SCHEMA_CACHE_ENV = "MVL_MAKE_DAILIES_SCHEMA_CACHE"
+
+# Template nodes in the order their arguments are added to the command line parser.
+NODE_NAMES = ("slate", "burnin", "reformat", "colorspace", "write")
+
+TYPE_CONVERTERS = MappingProxyType({
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+})
+
+# Keys of a knobs_template.yaml entry that are passed on to argparse.add_argument.
+ARGPARSE_KEYS = frozenset(("type", "default", "help", "choices", "action", "dest", "nargs", "required", "metavar", "const"))
+
+# Scope of the knobs that are the same for every shot of a show and baked into template variants.
+SHOW_SCOPE = "show"
+
+NodeSchema = namedtuple("NodeSchema", "name keys args converters defaults show_keys")
+NodeSchema.__doc__ = """
+Compiled knobs of one template node.
+    name (str): Node name in knobs_template.yaml (e.g. "slate").
+    keys (tuple): Knob keys, as returned by common_utils.getNodeAtrribs.
+    args (tuple): Read-only knobs_template.yaml entries.
+    converters (Mapping): Knob key to type converter.
+    defaults (Mapping): Knob key to default value.
+    show_keys (frozenset): Keys of the knobs marked "scope: show".
+"""
+
+KnobSchema = namedtuple("KnobSchema", "nodes argparse_spec errors source_hash")
+KnobSchema.__doc__ = """
+Compiled knobs_template.yaml schema.
+    nodes (Mapping): Node name to NodeSchema.
+    argparse_spec (tuple): (flag, add_argument keyword arguments) for every knob, in NODE_NAMES order.
+    errors (tuple): Messages for entries that could not be compiled.
+    source_hash (str): Hash of the knobs_template.yaml the schema was compiled from, if known.
+"""
+
+
+def knob_key(entry) -> str:
+    return entry["name"].replace("--", "").replace('no-', "")
+
+
+def compile_schema(node_config, source_hash=None) -> KnobSchema:
+    """
+    Compile the template nodes of knobs_template.yaml into an immutable schema.
+
+    Args:
+        node_config (dict): The template -> Nodes mapping of the config.
+        source_hash (str, optional): Hash of the config file, kept for reference.
+
+    Returns:
+        KnobSchema: The compiled schema.
+    """
+    nodes = {}
+    argparse_spec = []
+    errors = []
+    for node_name in NODE_NAMES:
+        entries = tuple(MappingProxyType(dict(entry)) for entry in node_config.get(node_name) or () if "name" in entry)
+        converters = {}
+        defaults = {}
+        for entry in entries:
+            key = knob_key(entry)
+            kwargs = {k: v for k, v in entry.items() if k in ARGPARSE_KEYS}
+            if isinstance(kwargs.get("type"), str):
+                converter = TYPE_CONVERTERS.get(kwargs["type"].strip().lower())
+                if converter is None:
+                    errors.append(f"Invalid type in argument '{entry['name']}': {kwargs['type']}")
+                    continue
+                kwargs["type"] = converter
+                converters[key] = converter
+            if "default" in kwargs:
+                defaults[key] = kwargs["default"]
+            argparse_spec.append((entry["name"], MappingProxyType(kwargs)))
+
+        nodes[node_name] = NodeSchema(
+            name=node_name,
+            keys=tuple(knob_key(entry) for entry in entries),
+            args=entries,
+            converters=MappingProxyType(converters),
+            defaults=MappingProxyType(defaults),
+            show_keys=frozenset(knob_key(entry) for entry in entries if entry.get("scope") == SHOW_SCOPE),
+        )
+
+    return KnobSchema(MappingProxyType(nodes), tuple(argparse_spec), tuple(errors), source_hash)
+
+
+def load_knob_schema(config_path, load_config, cache_dir=None) -> KnobSchema:
+    """
+    Load the compiled knob schema, avoiding the config system when possible.
+
+    The template nodes are cached on disk keyed by a hash of the knobs_template.yaml content,
+    so later runs only hash the file instead of parsing and walking the config.
+
+    Args:
+        config_path (str): Path of knobs_template.yaml, used for the cache key.
+        load_config (callable): Returns the parsed config, called on a cache miss.
+        cache_dir (str, optional): Cache root (see cache_utils.get_cache_root).
+
+    Returns:
+        KnobSchema: The compiled schema.
+    """
+    # Imported here, common_utils imports this module on every make_movie call.
+    from mvl_make_dailies.cache_utils import get_cache_dir, read_json, atomic_write_json
+
+    use_cache = os.environ.get(SCHEMA_CACHE_ENV, "1") != "0"
+    try:
+        with open(config_path, "rb") as f:
+            source_hash = hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        source_hash = None
+        use_cache = False
+
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(get_cache_dir("knob_schema", cache_dir), f"{source_hash}.json")
+        cached = read_json(cache_path)
+        if cached and cached.get("version") == SCHEMA_CACHE_VERSION:
+            return compile_schema(cached["nodes"], source_hash)
+
+    from mvl_make_dailies.tracing import span
+    with span("load knobs config", "config"):
+        node_config = load_config()['template']['Nodes']
+    if cache_path:
+        try:
+            atomic_write_json(cache_path, {"version": SCHEMA_CACHE_VERSION,
+                                           "nodes": {name: node_config.get(name) or [] for name in NODE_NAMES}})
+        except (OSError, TypeError):
+            pass
+    return compile_schema(node_config, source_hash)
@@ -0,0 +1,66 @@
+import os
+import json
+
+
+def load_manifest(manifest_path) -> list:
+    """
+    Load a batch manifest describing the shots to render.
+
+    The manifest is a YAML (.yaml/.yml) or JSON (.json) file holding either a list of shots,
+    or a mapping with optional "defaults" applied to every shot and a "shots" list.
+    Shot keys are the make_movie argument names without the leading dashes, e.g.:
+
+        defaults:
+          f_show: GEN63
+          colorspace_in: linear
+        shots:
+          - input: /project/renders/sh010/sh010.####.exr
+            output: /project/dailies/sh010.mov
+            f_shot_name: sh010
+
+    Args:
+        manifest_path (str): Path to the manifest file.
+
+    Returns:
+        list: One dictionary of arguments per shot, defaults applied.
+
+    Raises:
+        ValueError: If the manifest cannot be read or is malformed.
+    """
+    if not os.path.isfile(manifest_path):
+        raise ValueError(f"Manifest file not found: {manifest_path}")
+
+    extension = os.path.splitext(manifest_path)[1].lower()
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if extension in (".yaml", ".yml"):
+                import yaml
+                try:
+                    data = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Could not parse manifest {manifest_path}: {e}")
+            elif extension == ".json":
+                data = json.load(f)
+            else:
+                raise ValueError(f"Unsupported manifest format '{extension}', expected .yaml, .yml or .json.")
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read manifest {manifest_path}: {e}")
+
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        shots = data.get("shots")
+    else:
+        defaults = {}
+        shots = data
+
+    if not isinstance(defaults, dict):
+        raise ValueError(f"Manifest 'defaults' must be a mapping: {manifest_path}")
+    if not isinstance(shots, list) or not shots:
+        raise ValueError(f"Manifest has no shots: {manifest_path}")
+
+    resolved = []
+    for index, shot in enumerate(shots):
+        if not isinstance(shot, dict):
+            raise ValueError(f"Manifest shot #{index} must be a mapping, got {type(shot).__name__}.")
+        resolved.append({**defaults, **shot})
+    return resolved
@@ -1,9 +1,44 @@
 # python/movie_generator/maya_movie_utils.py
 
 import maya.cmds as cmds
+import argparse
 import os
+import sys
 import datetime
-from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.common_utils import logger, JOB_ERROR_EXIT_CODE
+from mvl_make_dailies.tracing import init_trace, span, begin_frame
+from mvl_make_dailies import tracing
+
+def resolve_camera(camera=None):
+    """
+    Return the camera to playblast through: the given one, else the camera of the focused
+    model panel, else 'persp'. Batch sessions have no panel, so every chunk of a scene resolves
+    the same camera.
+    """
+    if not camera:
+        current_panel = cmds.getPanel(withFocus=True)
+        if current_panel and cmds.getPanel(typeOf=current_panel) == "modelPanel":
+            camera = cmds.modelPanel(current_panel, query=True, camera=True)
+            logger.info(f"Using active camera: {camera}")
+        else:
+            # Fallback to default persp if no model panel is active
+            if cmds.objExists("persp"):
+                camera = "persp"
+                logger.info(f"No active model panel, defaulting to 'persp' camera.")
+            else:
+                logger.error("No active camera found and 'persp' does not exist. Cannot playblast.")
+                raise RuntimeError("No suitable camera for playblast.")
+
+    if not cmds.objExists(camera):
+        logger.error(f"Specified camera '{camera}' does not exist.")
+        raise ValueError(f"Camera '{camera}' not found in scene.")
+    return camera
+
+def resolve_resolution(width=None, height=None):
+    """Return the playblast size: the given width and height, else the scene render resolution."""
+    width = int(width or cmds.getAttr("defaultResolution.width"))
+    height = int(height or cmds.getAttr("defaultResolution.height"))
+    return width, height
 
 def playblast_scene(
     output_path,
@@ -21,6 +56,7 @@ def playblast_scene(
     """
     Performs a Maya playblast with specified settings.
     """
+    width, height = resolve_resolution(width, height)
     logger.info("Starting Maya Playblast...")
     logger.info(f"Output: {output_path}")
     logger.info(f"Frames: {start_frame}-{end_frame}")
@@ -43,23 +79,7 @@ def playblast_scene(
     # cmds.setAttr("defaultResolution.lockDeviceAspectRatio", 0)
 
     # Get the current active camera if none is specified
-    if not camera:
-        current_panel = cmds.getPanel(withFocus=True)
-        if cmds.getPanel(typeOf=current_panel) == "modelPanel":
-            camera = cmds.modelPanel(current_panel, query=True, camera=True)
-            logger.info(f"Using active camera: {camera}")
-        else:
-            # Fallback to default persp if no model panel is active
-            if cmds.objExists("persp"):
-                camera = "persp"
-                logger.info(f"No active model panel, defaulting to 'persp' camera.")
-            else:
-                logger.error("No active camera found and 'persp' does not exist. Cannot playblast.")
-                raise RuntimeError("No suitable camera for playblast.")
-
-    if not cmds.objExists(camera):
-        logger.error(f"Specified camera '{camera}' does not exist.")
-        raise ValueError(f"Camera '{camera}' not found in scene.")
+    camera = resolve_camera(camera)
 
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(output_path)
@@ -72,25 +92,34 @@ def playblast_scene(
     base_name = os.path.splitext(os.path.basename(output_path))[0]
     output_full_path_no_ext = os.path.join(output_dir, base_name)
 
+    # Time every frame in the trace: the time changes once per playblasted frame.
+    frame_job = None
+    if init_trace("maya") is not None:
+        frame_job = cmds.scriptJob(event=["timeChanged", lambda: begin_frame(int(cmds.currentTime(query=True)), key="playblast")])
+
     # Perform the playblast
     try:
-        cmds.playblast(
-            filename=output_full_path_no_ext,
-            startTime=start_frame,
-            endTime=end_frame,
-            width=width,
-            height=height,
-            format=format,
-            quality=quality,
-            compression=codec,
-            showOrnaments=True, # Show camera gate, resolution gate etc.
-            viewer=False, # Don't open playblast viewer
-            offScreen=off_screen, # Render without showing the viewport
-            percent=100, # Use 100% of the viewport resolution
-            displayResolution=display_resolution # Show resolution gate (if True)
-            # You might want to toggle specific HUD elements (e.g., cmds.displayRGBColor('hud', 0.5, 0.5, 0.5))
-            # or turn off specific display layers before playblasting.
-        )
+        with span("playblast", "maya", camera=camera, frames=f"{start_frame}-{end_frame}"):
+            cmds.playblast(
+                filename=output_full_path_no_ext,
+                startTime=start_frame,
+                endTime=end_frame,
+                width=width,
+                height=height,
+                framePadding=4,
+                format=format,
+                quality=quality,
+                compression=codec,
+                showOrnaments=True, # Show camera gate, resolution gate etc.
+                viewer=False, # Don't open playblast viewer
+                offScreen=off_screen, # Render without showing the viewport
+                percent=100, # Use 100% of the viewport resolution
+                displayResolution=display_resolution # Show resolution gate (if True)
+                # You might want to toggle specific HUD elements (e.g., cmds.displayRGBColor('hud', 0.5, 0.5, 0.5))
+                # or turn off specific display layers before playblasting.
+            )
+            # end_frame is the frame range argument here, not tracing.end_frame.
+            tracing.end_frame("playblast")
         logger.info(f"Playblast complete: {output_path}")
 
         # The actual file created by playblast will have the format:
@@ -106,7 +135,7 @@ def playblast_scene(
         if format == 'qt': # For movie output, it should just be filename.ext
             expected_output_file = output_path
         else: # For image sequence output
-            expected_output_file = f"{output_full_path_no_ext}.{str(start_frame).zfill(4)}.{format}" # Assuming 4-digit padding
+            expected_output_file = f"{output_full_path_no_ext}.{str(start_frame).zfill(4)}.{codec if format == 'image' else format}" # Assuming 4-digit padding
 
         if os.path.exists(expected_output_file):
             logger.info(f"Verified output file exists: {expected_output_file}")
@@ -116,4 +145,58 @@ def playblast_scene(
 
     except Exception as e:
         logger.error(f"Playblast failed: {e}")
-        raise # Re-raise to indicate failure
\ No newline at end of file
+        raise # Re-raise to indicate failure
+    finally:
+        if frame_job is not None:
+            cmds.scriptJob(kill=frame_job, force=True)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Playblast a frame chunk of a Maya scene to JPEG images in mayapy.")
+    parser.add_argument("--input", required=True, help="Maya scene file (.ma or .mb).")
+    parser.add_argument("--output", required=True, help="Image path without frame number and extension, images are written to <output>.####.jpg.")
+    parser.add_argument("--first", type=int, required=True, help="First frame of the chunk.")
+    parser.add_argument("--last", type=int, required=True, help="Last frame of the chunk.")
+    parser.add_argument("--camera", default=None, help="Camera to playblast through (default: see resolve_camera).")
+    parser.add_argument("--width", type=int, default=None, help="Playblast width (default: the scene render resolution).")
+    parser.add_argument("--height", type=int, default=None, help="Playblast height (default: the scene render resolution).")
+    parser.add_argument("--threads", type=int, default=None, help="Threads of the Maya session (default: every core).")
+    return parser
+
+def playblast_chunk(args):
+    """
+    Open the scene in a standalone Maya session and playblast the frames of one chunk.
+
+    :param args: Parsed arguments, see build_parser.
+    :return: Exit code: JOB_ERROR_EXIT_CODE when the scene cannot be played back.
+    """
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    if args.threads:
+        # Chunks running side by side split the cores instead of each using all of them.
+        cmds.threadCount(numberOfThreads=args.threads)
+    try:
+        with span("open maya scene", "maya", scene=args.input):
+            cmds.file(args.input, open=True, force=True)
+        playblast_scene(
+            output_path=f"{args.output}.jpg",
+            start_frame=args.first,
+            end_frame=args.last,
+            camera=args.camera,
+            width=args.width,
+            height=args.height,
+            format="image",
+            codec="jpg",
+        )
+        return 0
+    except Exception as e:
+        logger.error(f"Playblast of frames {args.first}-{args.last} of {args.input} failed: {e}")
+        return JOB_ERROR_EXIT_CODE
+    finally:
+        maya.standalone.uninitialize()
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(playblast_chunk(args))
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,41 @@
 
 import os
 import sys  
-import subprocess
 import tempfile
-import argparse
 import json
-import shlex
-from mvl_make_dailies.common_utils import (get_python_package_path, get_nuke_executable_path, 
-                                           gather_frame_range, logger, 
-                                           is_valid_frame_range, slate_keys, burn_in_keys, reformat_keys, colorspace_keys, writer_keys, read_keys)
-
-from mvl_rezboot import resolver
-from rez.exceptions import PackageCommandError
+import time
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from mvl_make_dailies.common_utils import (get_python_package_path, logger, get_knob_schema, get_nuke_template_path,
+                                           is_valid_frame_range, slate_keys, burn_in_keys, reformat_keys, colorspace_keys, writer_keys,
+                                           JOB_ERROR_EXIT_CODE, RENDER_ERROR_EXIT_CODE, LaunchError)
+from mvl_make_dailies.sequence_cache import SequenceIndexCache
+from mvl_make_dailies.manifest import load_manifest
+from mvl_make_dailies.rez_context_cache import RezContextCache
+from mvl_make_dailies.template_cache import TemplateCache, get_show_payload, hash_file
+from mvl_make_dailies.slate_cache import get_slate_cache_dir
+from mvl_make_dailies.follow import FrameFollower, DEFAULT_FOLLOW_TIMEOUT
+from mvl_make_dailies.image_headers import read_header, read_sequence_headers, summarize_headers, nuke_format_for, format_size
+from mvl_make_dailies.proxy import AUTO_PROXY, SCALING_RESIZE_TYPES, parse_proxy, get_downrez_scale, find_proxy
+from mvl_make_dailies.sequence_utils import Sequence, FrameSet, parse_sequence_path
+from mvl_make_dailies.preflight import (BadFramesError, preflight_sequence, bad_frame_read_data, write_report,
+                                        DEFAULT_BAD_FRAME_POLICY, DEFAULT_MIN_FRAME_SIZE, MISSING, TOO_SMALL, CORRUPT)
+from mvl_make_dailies.host_slots import dcc_slot, get_dcc_limits
+from mvl_make_dailies.job_queue import (JobQueue, get_queue_path, work_queue, log_queue_status, DEFAULT_MAX_ATTEMPTS,
+                                       DEFAULT_QUEUE_WORKERS)
+from mvl_make_dailies.watcher import watch_roots
+from mvl_make_dailies.incremental import (DEFAULT_SEGMENT_SIZE, plan_segments, find_dirty_segments, get_segment_store_dir,
+                                          get_segment_file, write_manifest)
+from mvl_make_dailies.deliverables import build_deliverable_payloads
+from mvl_make_dailies.worker_pool import (WorkerPool, PoolError, get_pool_address, report_pool, submit_job,
+                                          DEFAULT_WORKERS, DEFAULT_MAX_WORKER_JOBS, DEFAULT_JOB_WAIT)
+from mvl_make_dailies.tracing import span, traced
+from mvl_make_dailies.houdini.scene_metadata import get_cached_scene_metadata
+from mvl_make_dailies.previews import build_previews_payload, assemble_sprite_sheet, write_previews_index, remove_tiles
+from mvl_make_dailies.chunked_render import (find_ffmpeg, get_gop_size, get_common_gop_size, align_chunk_size, split_frame_range,
+                                             create_segment_dir, get_segment_path, concat_segments)
 
 def escape_json_arg(data):
     return '"' + json.dumps(data).replace('"', '\\"') + '"'
@@ -21,9 +45,18 @@ def create_houdini_playblast(args_dict):
     """
     Create a playblast from a Houdini scene.
     This function render a playblast from a Houdini scene, adhering to dailies best practices.
+    ROP renders split into --chunks or --chunk-size frames render in parallel hython processes,
+    see render_houdini_chunks; otherwise the scene renders in the current Houdini session.
     Args:
         args_dict (dict): Parsed command line arguments.
     """
+    if args_dict.get('strategy') == "rop" and (args_dict.get("chunks") or args_dict.get("chunk_size")):
+        try:
+            render_houdini_chunks(args_dict)
+        except (ValueError, FileNotFoundError, LaunchError) as e:
+            logger.error(str(e))
+            sys.exit(1)
+        return
 
     from mvl_make_dailies.houdini.HoudiniSceneHandler import HoudiniSceneHandler
     from mvl_make_dailies.houdini.HoudiniRenderManager import HoudiniRenderManager
@@ -32,7 +65,8 @@ def create_houdini_playblast(args_dict):
     resolved_strategy = args_dict.get('strategy')
 
     scene = HoudiniSceneHandler(args_dict.get("input"))
-    is_file_loaded  = scene.load_scene() 
+    with span("load houdini scene", "houdini", scene=args_dict.get("input")):
+        is_file_loaded  = scene.load_scene() 
     if not is_file_loaded:
         logger.error(f"Failed to load Houdini scene file: {scene.file_path}")
         sys.exit(1) 
@@ -57,18 +91,1171 @@ def create_houdini_playblast(args_dict):
     logger.info(f"Frame range: {args_dict.get('start')} - {args_dict.get('end')}")
     logger.info(f"Resolution: {args_dict.get('resX')} x {args_dict.get('resY')}")
 
-    manager.render(
-        camera_path = resolved_camera_path,
-        output_path = args_dict.get("output"),
-        start_frame = args_dict.get('start'),
-        end_frame = args_dict.get('end'),
-        res_x = args_dict.get("resX"),
-        res_y = args_dict.get("resY"),
-        rop_type ="ifd" # or 'ifd' for Mantra
-    )
+    with span("houdini render", "houdini", strategy=resolved_strategy):
+        manager.render(
+            camera_path = resolved_camera_path,
+            output_path = args_dict.get("output"),
+            start_frame = args_dict.get('start'),
+            end_frame = args_dict.get('end'),
+            res_x = args_dict.get("resX"),
+            res_y = args_dict.get("resY"),
+            rop_type = args_dict.get("rop_type") or "ifd" # 'ifd' for Mantra or 'karma'
+        )
 
     #hou.hipFile.save(file_name, save_to_recent_files=True)
-    scene.save()
+    with span("save houdini scene", "houdini"):
+        scene.save()
+
+def get_nuke_launcher_path() -> str:
+    """
+    Get the path of the script run inside Nuke to build and render the dailies graph.
+
+    Raises:
+        FileNotFoundError: If the launcher script is missing from the package.
+    """
+    launcher_path = os.path.join(get_python_package_path(), "mvl_make_dailies", "nuke", "main.py")
+    if not os.path.exists(launcher_path):
+        raise FileNotFoundError(f"Nuke launcher script not found: {launcher_path}")
+    return launcher_path
+
+
+def get_houdini_launcher_path() -> str:
+    """
+    Get the path of the script run by hython to render a frame chunk of a Houdini scene.
+
+    Raises:
+        FileNotFoundError: If the launcher script is missing from the package.
+    """
+    launcher_path = os.path.join(get_python_package_path(), "mvl_make_dailies", "houdini", "main.py")
+    if not os.path.exists(launcher_path):
+        raise FileNotFoundError(f"Houdini launcher script not found: {launcher_path}")
+    return launcher_path
+
+
+def get_maya_launcher_path() -> str:
+    """
+    Get the path of the script run by mayapy to playblast a frame chunk of a Maya scene.
+
+    Raises:
+        FileNotFoundError: If the launcher script is missing from the package.
+    """
+    launcher_path = os.path.join(get_python_package_path(), "mvl_make_dailies", "maya", "main.py")
+    if not os.path.exists(launcher_path):
+        raise FileNotFoundError(f"Maya launcher script not found: {launcher_path}")
+    return launcher_path
+
+
+@traced("resolve frame range", "prepare")
+def resolve_frame_range(args_dict) -> range:
+    """
+    Resolve the frames to render for a daily, slate frame included.
+    Uses --first/--last when given, otherwise the frames of the sequence matching --input.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+
+    Returns:
+        range: Frames to render, last frame included.
+    """
+    file_sequence_path = args_dict.get("input")
+    first_frame = args_dict.get("first")
+    last_frame = args_dict.get("last")
+
+    if is_valid_frame_range(first_frame, last_frame):
+        frame_range = range(first_frame, last_frame + 1)
+    else:
+        index_cache = SequenceIndexCache(args_dict.get("cache_dir"))
+        sequence = index_cache.find_sequence(file_sequence_path)
+        index_cache.log_stats()
+        if sequence.frames.has_gaps():
+            logger.warning(f"Sequence {sequence.pattern} is missing frames: {sequence.frames.missing()}")
+        logger.info(f"Found sequence {sequence.pattern}: frames {sequence.frames}")
+        frame_range = sequence.frame_range
+
+    slate_start_frame = frame_range.start - 1 if args_dict.get("slate") else frame_range.start
+    return range(slate_start_frame, frame_range.stop)
+
+
+AUTO_FORMAT = "auto"
+
+
+@traced("read frame headers", "prepare")
+def apply_image_headers(args_dict, frames) -> dict:
+    """
+    Read the headers of the source frames and fill in what they tell: the reformat format with
+    --format auto, and the resolution and timecode slate fields when they are not given.
+    Frames whose resolution or pixel aspect differ from the rest of the sequence are logged.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+        frames (range): Source frames, slate frame excluded.
+
+    Returns:
+        dict: The arguments with the values read from the headers.
+
+    Raises:
+        ValueError: If --format auto is used and no frame header could be read.
+    """
+    headers = read_sequence_headers(args_dict.get("input"), frames, args_dict.get("cache_dir"))
+    reference, mismatched = summarize_headers(headers)
+    if reference is None:
+        if args_dict.get("format") == AUTO_FORMAT:
+            raise ValueError(f"--format auto: no readable frame header in {args_dict.get('input')}")
+        return args_dict
+
+    logger.info(f"Source frames: {reference.width}x{reference.height} ({reference.pixel_aspect:g}), "
+                f"{reference.file_format} {reference.compression}, channels {reference.channels}")
+    if mismatched:
+        logger.warning(f"Frames {mismatched} do not have the {reference.width}x{reference.height} "
+                       f"({reference.pixel_aspect:g}) resolution of the rest of the sequence")
+
+    args_dict = dict(args_dict)
+    if args_dict.get("format") == AUTO_FORMAT:
+        args_dict["format"] = nuke_format_for(reference)
+        logger.info(f"Format from the source frames: {args_dict['format']}")
+    if args_dict.get("f_resolution") is None:
+        args_dict["f_resolution"] = f"{reference.width}x{reference.height}"
+    if args_dict.get("f_timecode") is None and headers.get(frames.start) and headers[frames.start].timecode:
+        args_dict["f_timecode"] = headers[frames.start].timecode
+    return args_dict
+
+
+@traced("proxy lookup", "prepare")
+def apply_proxy(args_dict, frames, find_proxies=True) -> dict:
+    """
+    With --proxy, make the graph run at the output resolution from the Read on.
+    A proxy sequence of the source (see proxy.find_proxy) is read instead of the source when
+    one is large enough, cutting the I/O; otherwise, or if the proxy is still too large, the
+    Read is followed by a downrez. With --proxy auto the scale is the one MVL_FORMAT applies
+    to the source, so slate and burn-in layouts are unchanged.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+        frames (range): Source frames, slate frame excluded.
+        find_proxies (bool): Look for proxy sequences, only a downrez is used otherwise.
+
+    Returns:
+        dict: The arguments, with the proxy sequence as input and the downrez scale as proxy_scale.
+
+    Raises:
+        ValueError: If --proxy is invalid.
+    """
+    if not args_dict.get("proxy"):
+        return args_dict
+    proxy = parse_proxy(args_dict["proxy"])
+    parsed = parse_sequence_path(args_dict.get("input"))
+    source = read_header(Sequence(*parsed, FrameSet()).frame_path(frames.start)) if parsed else None
+    if source is None:
+        logger.warning(f"--proxy: cannot read the header of {args_dict.get('input')}, reading the source as is")
+        return args_dict
+
+    resize = args_dict.get("resize")
+    output_size = format_size(args_dict.get("format"))
+    scale = get_downrez_scale(resize, (source.width, source.height), output_size[:2]) if output_size else None
+    if proxy == AUTO_PROXY:
+        if output_size is None:
+            logger.info(f"--proxy auto: size of format {args_dict.get('format')} unknown, reading the source as is")
+            return args_dict
+        if scale is None:
+            logger.info(f"--proxy auto: --resize {resize} crops the source at full resolution, reading the source as is")
+            return args_dict
+        if scale >= 1:
+            logger.info("--proxy auto: the source is not larger than the output, reading it as is")
+            return args_dict
+    else:
+        if resize not in SCALING_RESIZE_TYPES:
+            logger.warning(f"--proxy {proxy}: --resize {resize} crops the source, the framing will differ from a full resolution read")
+        scale = proxy
+
+    args_dict = dict(args_dict)
+    found = find_proxy(args_dict["input"], frames, source, source.width * scale - 1) if find_proxies else None
+    if found:
+        sequence, header = found
+        logger.info(f"Reading proxy {sequence.pattern} ({header.width}x{header.height}) instead of the "
+                    f"{source.width}x{source.height} source")
+        args_dict["input"] = sequence.pattern
+        scale = source.width * scale / header.width
+    if scale < 0.999:
+        args_dict["proxy_scale"] = round(scale, 4)
+        logger.info(f"Downscaling the read frames by {scale:.3g}")
+    return args_dict
+
+
+def get_source_frames(frame_range, args_dict) -> range:
+    """Source frames of a movie frame range, without the slate frame."""
+    return range(frame_range.start + 1, frame_range.stop) if args_dict.get("slate") else frame_range
+
+
+def build_node_payloads(args_dict) -> dict:
+    """
+    Collect the knob values of each template node from the command arguments.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+
+    Returns:
+        dict: Knob values for the slate, burnin, reformat, colorspace and write nodes.
+    """
+    slate_data = {k: args_dict[k] for k in slate_keys() if k in args_dict and args_dict[k] is not None}
+    slate_data["slate"] = bool(args_dict.get("slate"))
+
+    return {
+        "slate": slate_data,
+        "burnin": {k: args_dict.get(k) for k in burn_in_keys() if k in args_dict},
+        "reformat": {k: args_dict[k] for k in reformat_keys() if k in args_dict and args_dict[k] is not None},
+        "colorspace": {k: args_dict[k] for k in colorspace_keys() if k in args_dict and args_dict[k] is not None},
+        "write": {k: args_dict[k] for k in writer_keys() if k in args_dict and args_dict[k] is not None},
+    }
+
+
+def build_template_payload(node_payloads, args_dict) -> dict:
+    """
+    Describe the template the Nuke launcher builds the graph from.
+    Unless --no-template-cache is set, this names the baked variant of the template for the
+    show-level knob values. Nuke opens it directly when it exists, and bakes it otherwise.
+
+    Args:
+        node_payloads (dict): Knob values per template node, see build_node_payloads.
+        args_dict (dict): Dictionary of arguments, cache_dir and no_template_cache are used.
+
+    Returns:
+        dict: Template path, baked variant path (or None) and show-level knob values.
+    """
+    template_path = get_nuke_template_path()
+    schema = get_knob_schema()
+    show_payload = get_show_payload(node_payloads, schema)
+    if args_dict.get("no_template_cache"):
+        return {"path": template_path, "baked": None, "show": show_payload}
+
+    baked_path, is_baked = TemplateCache(args_dict.get("cache_dir")).lookup(template_path, schema, show_payload)
+    if is_baked:
+        logger.info(f"Using baked template {baked_path}")
+    else:
+        logger.info(f"No baked template for these show settings yet, Nuke will bake {baked_path}")
+    return {"path": template_path, "baked": baked_path, "show": show_payload}
+
+
+def build_slate_cache_payload(args_dict):
+    """
+    Describe where Nuke caches and looks up rendered slate frames.
+
+    Args:
+        args_dict (dict): Dictionary of arguments; slate, no_slate_cache, slate_cache_dir and cache_dir are used.
+
+    Returns:
+        dict: Slate cache directory and template hash, or None when the slate cache is not used.
+    """
+    if not args_dict.get("slate") or args_dict.get("no_slate_cache"):
+        return None
+    return {
+        "dir": get_slate_cache_dir(args_dict.get("slate_cache_dir"), args_dict.get("cache_dir")),
+        "template_hash": hash_file(get_nuke_template_path()),
+    }
+
+
+@traced("build nuke job", "prepare")
+def build_nuke_job(args_dict, frame_range=None) -> dict:
+    """
+    Build the job payload rendered by the Nuke launcher script for one movie.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+        frame_range (range, optional): Frames to render, slate frame included.
+            Resolved from the arguments when omitted, see resolve_frame_range.
+
+    Returns:
+        dict: Source and destination paths, frame range, template, proxy downrez, extra deliverables,
+        previews and knob values per template node.
+
+    Raises:
+        ValueError: If an output is not a .mov file or the frame range cannot be resolved.
+    """
+    mov_file_path = args_dict.get("output")
+    if not mov_file_path or not mov_file_path.lower().endswith('.mov'):
+        raise ValueError(f"Output file must be a .mov file: {mov_file_path}")
+
+    if frame_range is None:
+        frame_range = resolve_frame_range(args_dict)
+    node_payloads = build_node_payloads(args_dict)
+
+    return {
+        "src": args_dict.get("input"),
+        "dst": mov_file_path,
+        "first": frame_range.start,
+        "last": frame_range.stop - 1,
+        "template": build_template_payload(node_payloads, args_dict),
+        "slate_cache": build_slate_cache_payload(args_dict),
+        "proxy": {"scale": args_dict["proxy_scale"]} if args_dict.get("proxy_scale") else None,
+        "deliverables": build_deliverable_payloads(args_dict.get("deliverables"), node_payloads, mov_file_path),
+        "previews": build_previews_payload(args_dict, get_source_frames(frame_range, args_dict), mov_file_path),
+        **node_payloads,
+    }
+
+
+@traced("preflight", "prepare")
+def run_preflight(job, args_dict):
+    """
+    Check every source frame of a job before Nuke is launched, see preflight.check_frame.
+    With the hold or checkerboard --bad-frames policy, the Read knobs handling the bad frames
+    are added to the job; with the fail policy (default) the job is stopped.
+
+    Args:
+        job (dict): Job payload from build_nuke_job, updated in place.
+        args_dict (dict): Command arguments; no_preflight, bad_frames, min_frame_size and preflight_report are used.
+
+    Raises:
+        BadFramesError: If frames are bad and the policy is to fail.
+    """
+    if args_dict.get("no_preflight"):
+        return
+    has_slate = bool(job["slate"].get("slate"))
+    frames = range(job["first"] + 1 if has_slate else job["first"], job["last"] + 1)
+    report = preflight_sequence(job["src"], frames, min_size=args_dict.get("min_frame_size") or DEFAULT_MIN_FRAME_SIZE)
+    policy = args_dict.get("bad_frames") or DEFAULT_BAD_FRAME_POLICY
+    report["policy"] = policy
+    if args_dict.get("preflight_report"):
+        write_report(report, args_dict["preflight_report"])
+
+    if not report["bad"]:
+        logger.info(f"Pre-flight: {report['checked']} frames of {report['sequence']} checked in {report['seconds']}s")
+        return
+
+    for status in (MISSING, TOO_SMALL, CORRUPT):
+        if report[status]:
+            logger.warning(f"Pre-flight: {status.replace('_', ' ')} frames {report[status]}")
+    for item in report["bad"][:10]:
+        logger.warning(f"Pre-flight: frame {item['frame']} {item['status'].replace('_', ' ')}: {item['reason']}")
+
+    if policy == "fail":
+        raise BadFramesError(f"{len(report['bad'])} bad frames in {report['sequence']}, Nuke not launched "
+                             f"(use --bad-frames hold or checkerboard to render anyway)", report)
+    job["read"] = {**(job.get("read") or {}), **bad_frame_read_data(report, policy)}
+    logger.warning(f"Pre-flight: rendering {len(report['bad'])} bad frames as {policy}")
+
+
+def nuke_job_args(job) -> list:
+    """Convert a job payload from build_nuke_job into Nuke launcher script arguments."""
+    args = [
+        "--src", f"{job['src']}",
+        "--dst", f"{job['dst']}",
+        "--first", str(job["first"]),
+        "--last", str(job["last"]),
+        "--slate", json.dumps(job["slate"]),
+        "--burnin", json.dumps(job["burnin"]),
+        "--reformat", json.dumps(job["reformat"]),
+        "--colorspace", json.dumps(job["colorspace"]),
+        "--write", json.dumps(job["write"]),
+    ]
+    if job.get("read"):
+        args += ["--read", json.dumps(job["read"])]
+    if job.get("proxy"):
+        args += ["--proxy", json.dumps(job["proxy"])]
+    if job.get("deliverables"):
+        args += ["--deliverables", json.dumps(job["deliverables"])]
+    if job.get("previews"):
+        args += ["--previews", json.dumps(job["previews"])]
+    if job.get("template"):
+        args += ["--template", json.dumps(job["template"])]
+    if job.get("slate_cache"):
+        args += ["--slate-cache", json.dumps(job["slate_cache"])]
+    if job.get("render_first") is not None:
+        args += ["--render-first", str(job["render_first"]), "--render-last", str(job["render_last"])]
+    return args
+
+
+_rez_context_caches = {}
+_rez_context_caches_lock = threading.Lock()
+
+def get_rez_context_cache(cache_dir=None, ttl=None) -> RezContextCache:
+    """Return the rez context cache shared by every launch of this process."""
+    key = (cache_dir, ttl)
+    with _rez_context_caches_lock:
+        if key not in _rez_context_caches:
+            _rez_context_caches[key] = RezContextCache(cache_dir, ttl)
+        return _rez_context_caches[key]
+
+
+def launch_tool(tool, tool_args, args_dict=None):
+    """
+    Run a DCC tool in a resolved rez environment.
+    The package graph is resolved through mvl_rezboot, unless --rez-cache is set, in which case
+    the context comes from the rez context cache. The cached context resolves the request of
+    rez_context_cache.get_tool_request, which may pick other package versions than mvl_rezboot.
+    The process runs in one of the host-wide slots of its DCC, see host_slots.dcc_slot.
+
+    Args:
+        tool (str): Tool and package name, e.g. "nuke".
+        tool_args (list): Tool arguments.
+        args_dict (dict, optional): Command arguments; cache_dir, rez_cache, rez_cache_ttl and dcc_limit are used.
+
+    Raises:
+        LaunchError: If the tool could not be launched or exited with an error. Only an exit
+            with JOB_ERROR_EXIT_CODE is not transient, other exits (licence checkout, crash,
+            signal) may succeed when launched again.
+    """
+    from rez.exceptions import PackageCommandError
+
+    args_dict = args_dict or {}
+    limits = get_dcc_limits(args_dict.get("dcc_limit"))
+
+    if not args_dict.get("rez_cache"):
+        try:
+            from mvl_rezboot.resolver import Resolver
+            tool_resolver = Resolver(f"{tool} {' '.join(tool_args)}")
+            with dcc_slot(tool, limits, args_dict.get("cache_dir")):
+                tool_resolver.run()
+        except PackageCommandError as e:
+            raise LaunchError(f"{tool} launch failed: {e}")
+        return
+
+    cache = get_rez_context_cache(args_dict.get("cache_dir"), args_dict.get("rez_cache_ttl"))
+    try:
+        with dcc_slot(tool, limits, args_dict.get("cache_dir")):
+            exit_code = cache.run_tool(tool, tool_args)
+    except (RuntimeError, PackageCommandError) as e:
+        raise LaunchError(f"{tool} launch failed: {e}")
+    finally:
+        cache.log_stats()
+
+    if exit_code == JOB_ERROR_EXIT_CODE:
+        raise LaunchError(f"{tool} failed the job (exit code {exit_code})", transient=False)
+    if exit_code == RENDER_ERROR_EXIT_CODE:
+        raise LaunchError(f"{tool} failed to render the frames (exit code {exit_code})")
+    if exit_code != 0:
+        raise LaunchError(f"{tool} exited with code {exit_code}")
+
+
+@traced("nuke launch", "launch")
+def launch_nuke(launcher_args, args_dict=None, threads=None):
+    """
+    Run the Nuke launcher script in a resolved Nuke environment.
+    Nuke runs in terminal mode (-t); the launcher builds the graph and renders explicitly.
+    Arguments go through an @args file so JSON payloads survive the command line.
+
+    Args:
+        launcher_args (list): Arguments of the launcher script.
+        args_dict (dict, optional): Command arguments, see launch_tool.
+        threads (int, optional): Number of render threads of the Nuke process.
+
+    Raises:
+        LaunchError: If Nuke could not be launched.
+    """
+    launcher_path = get_nuke_launcher_path()
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+        for arg in launcher_args:
+            f.write(arg + "\n")
+
+        args_file = f.name
+
+    cmd = [
+        "-t", f"{launcher_path}",
+        f'@{args_file}',
+    ]
+    if threads:
+        cmd = ["-m", str(threads)] + cmd
+
+    try:
+        launch_tool("nuke", cmd, args_dict)
+    finally:
+        os.remove(args_file)
+
+
+def run_nuke_job(job, args_dict=None, threads=None):
+    """
+    Render a job payload from build_nuke_job in a warm worker of the `make_movie serve` pool
+    when one is running on this host, otherwise in a new Nuke process (see launch_nuke).
+
+    Args:
+        job (dict): Job payload.
+        args_dict (dict, optional): Command arguments; no_pool, pool_socket, pool_wait and
+            cache_dir are used, and those of launch_tool.
+        threads (int, optional): Render threads of a new Nuke process; pool workers keep their own.
+
+    Raises:
+        LaunchError: If the job failed to render.
+    """
+    args_dict = args_dict or {}
+    if not args_dict.get("no_pool"):
+        address = get_pool_address(args_dict.get("pool_socket"), args_dict.get("cache_dir"))
+        try:
+            wait = args_dict.get("pool_wait")
+            result = submit_job(address, job, DEFAULT_JOB_WAIT if wait is None else wait)
+        except PoolError as e:
+            raise LaunchError(str(e))
+        if result is not None:
+            if result.get("status") != "succeeded":
+                raise LaunchError(f"Nuke worker {result.get('pid')} failed to render {job['dst']}: {result.get('error')}",
+                                  transient=bool(result.get("transient")))
+            logger.info(f"Rendered {job['dst']} in Nuke worker {result.get('pid')} in {result.get('seconds')}s")
+            return
+    launch_nuke(nuke_job_args(job), args_dict, threads)
+
+
+# Times a failed chunk of a Houdini render or Maya playblast is rendered again on its own.
+DEFAULT_CHUNK_RETRIES = 2
+
+
+@traced("houdini chunk", "launch")
+def launch_houdini_chunk(chunk, args_dict, threads=None):
+    """
+    Render the frames of a chunk of a Houdini scene in a new hython process, see houdini/main.py.
+
+    Args:
+        chunk (range): Frames of the chunk.
+        args_dict (dict): Command arguments; input, output, rop_type, view, resX and resY are
+            used, and those of launch_tool.
+        threads (int, optional): Render threads of the chunk.
+
+    Raises:
+        LaunchError: If the chunk failed to render.
+    """
+    chunk_args = [
+        get_houdini_launcher_path(),
+        "--input", args_dict["input"],
+        "--output", args_dict["output"],
+        "--first", str(chunk.start),
+        "--last", str(chunk.stop - 1),
+        "--rop-type", args_dict.get("rop_type") or "ifd",
+    ]
+    for flag, key in (("--view", "view"), ("--res-x", "resX"), ("--res-y", "resY"), ("--cache-dir", "cache_dir"),
+                      ("--threads", None)):
+        value = threads if key is None else args_dict.get(key)
+        if value:
+            chunk_args += [flag, str(value)]
+    launch_tool("hython", chunk_args, args_dict)
+
+
+def get_houdini_scene_metadata(args_dict) -> dict:
+    """
+    Get the fps, frame range, cameras and resolution of the --input Houdini scene from the
+    metadata cache, loading the scene in hython only when it changed since it was last read.
+
+    Args:
+        args_dict (dict): Command arguments; input and cache_dir are used, and those of launch_tool.
+
+    Returns:
+        dict: Scene metadata, see HoudiniSceneHandler.get_scene_metadata.
+
+    Raises:
+        LaunchError: If the scene could not be read.
+    """
+    metadata = get_cached_scene_metadata(args_dict["input"], args_dict.get("cache_dir"))
+    if metadata is not None:
+        return metadata
+    logger.info(f"Reading the metadata of {args_dict['input']} in hython")
+    metadata_args = [get_houdini_launcher_path(), "--input", args_dict["input"], "--metadata"]
+    if args_dict.get("cache_dir"):
+        metadata_args += ["--cache-dir", args_dict["cache_dir"]]
+    with span("houdini scene metadata", "prepare", scene=args_dict["input"]):
+        launch_tool("hython", metadata_args, args_dict)
+    metadata = get_cached_scene_metadata(args_dict["input"], args_dict.get("cache_dir"))
+    if metadata is None:
+        raise LaunchError(f"hython did not cache the metadata of {args_dict['input']}")
+    return metadata
+
+
+def get_parallel_budget(args_dict, dcc, count=None, default=None) -> tuple:
+    """
+    Number of DCC processes to run at once and the threads of each.
+    Processes are capped by --max-parallel and by the host's slots of the DCC (see
+    host_slots.dcc_slot), as more would only wait for a slot, and the cores are split evenly
+    between them.
+
+    Args:
+        args_dict (dict): Command arguments; max_parallel and dcc_limit are used.
+        dcc (str): DCC of the processes, e.g. "nuke".
+        count (int, optional): Number of processes to run in total.
+        default (int, optional): Processes at once without --max-parallel (default: one per 8 cores).
+
+    Returns:
+        tuple: (processes at once, threads per process)
+    """
+    cpu_count = os.cpu_count() or 1
+    max_parallel = args_dict.get("max_parallel") or default or max(1, cpu_count // 8)
+    if count is not None:
+        max_parallel = min(max_parallel, max(1, count))
+    dcc_limit = get_dcc_limits(args_dict.get("dcc_limit")).get(dcc)
+    if dcc_limit and dcc_limit < max_parallel:
+        logger.info(f"The host's {dcc} slots cap the processes running at once to {dcc_limit} "
+                    f"instead of {max_parallel} (raise with --dcc-limit {dcc}=<n>)")
+        max_parallel = dcc_limit
+    return max_parallel, max(1, cpu_count // max_parallel)
+
+
+def render_frame_chunks(chunks, launch_chunk, args_dict, dcc):
+    """
+    Render frame chunks in parallel DCC processes, rendering chunks that failed transiently
+    (see LaunchError.transient) again on their own. A chunk failed by the DCC itself is not
+    retried: the render fails once the running chunks are done.
+    The chunks running at once are capped by --max-parallel and the host's slots of the DCC,
+    see get_parallel_budget.
+
+    Args:
+        chunks (list): Frame ranges, see chunked_render.split_frame_range.
+        launch_chunk (callable): Called with a chunk and its thread count, raises LaunchError on failure.
+        args_dict (dict): Command arguments; max_parallel, chunk_retries and dcc_limit are used.
+        dcc (str): DCC of the processes, e.g. "houdini".
+
+    Raises:
+        LaunchError: If a chunk failed by the DCC itself, or chunks still fail after their retries.
+    """
+    retries = args_dict.get("chunk_retries")
+    retries = DEFAULT_CHUNK_RETRIES if retries is None else max(0, retries)
+
+    pending = chunks
+    for attempt in range(retries + 1):
+        max_parallel, threads = get_parallel_budget(args_dict, dcc, len(pending), default=os.cpu_count() or 1)
+        if attempt:
+            logger.warning(f"Retrying {len(pending)} failed chunks (retry {attempt} of {retries})")
+        logger.info(f"Rendering {len(pending)} {dcc} chunks, {max_parallel} at a time with {threads} threads each")
+
+        failed = []
+        permanent = []
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            futures = {pool.submit(launch_chunk, chunk, threads): chunk for chunk in pending}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    future.result()
+                    logger.info(f"Chunk {chunk.start}-{chunk.stop - 1} rendered")
+                except LaunchError as e:
+                    logger.error(f"Chunk {chunk.start}-{chunk.stop - 1} failed: {e}")
+                    if not e.transient:
+                        permanent.append(chunk)
+                        break
+                    failed.append(chunk)
+            if permanent:
+                # Rendering it again fails the same way: the chunks not started yet are dropped.
+                pool.shutdown(cancel_futures=True)
+        if permanent:
+            raise LaunchError(f"{dcc} failed chunks " + ", ".join(f"{chunk.start}-{chunk.stop - 1}" for chunk in permanent),
+                              transient=False)
+        pending = sorted(failed, key=lambda chunk: chunk.start)
+        if not pending:
+            return
+    raise LaunchError(f"{len(pending)} of {len(chunks)} chunks failed to render after {retries} retries: "
+                      + ", ".join(f"{chunk.start}-{chunk.stop - 1}" for chunk in pending))
+
+
+def render_houdini_chunks(args_dict):
+    """
+    Render the frame range of a Houdini scene as chunks in parallel hython processes.
+    Every process loads the scene, sets up its own Mantra or Karma ROP and renders its chunk
+    into the shared output directory, see render_frame_chunks for the parallelism and retries.
+    Without --start and --end, the frame range of the scene is used (see get_houdini_scene_metadata).
+
+    Args:
+        args_dict (dict): Command arguments; input, output, start, end, chunks and chunk_size are
+            used, and those of render_frame_chunks and launch_houdini_chunk.
+
+    Raises:
+        FileNotFoundError: If the scene file does not exist.
+        LaunchError: If the scene could not be read or chunks still fail after their retries.
+    """
+    if not os.path.isfile(args_dict.get("input") or ""):
+        raise FileNotFoundError(f"Houdini scene file not found: {args_dict.get('input')}")
+    if args_dict.get("start") is None or args_dict.get("end") is None:
+        scene_first, scene_last = get_houdini_scene_metadata(args_dict)["frame_range"]
+        args_dict = dict(args_dict, start=scene_first if args_dict.get("start") is None else args_dict["start"],
+                         end=scene_last if args_dict.get("end") is None else args_dict["end"])
+
+    chunks = split_frame_range(range(int(args_dict["start"]), int(args_dict["end"]) + 1),
+                               chunks=args_dict.get("chunks"),
+                               chunk_size=args_dict.get("chunk_size"))
+    logger.info(f"Split frames {args_dict['start']}-{args_dict['end']} of {args_dict['input']} into {len(chunks)} chunks")
+    render_frame_chunks(chunks, lambda chunk, threads: launch_houdini_chunk(chunk, args_dict, threads),
+                        args_dict, "houdini")
+
+
+@traced("maya chunk", "launch")
+def launch_maya_chunk(chunk, args_dict, output_path, threads=None):
+    """
+    Playblast the frames of a chunk of a Maya scene to images in a new mayapy process, see maya/main.py.
+
+    Args:
+        chunk (range): Frames of the chunk.
+        args_dict (dict): Command arguments; input, view, resX and resY are used, and those of launch_tool.
+        output_path (str): Image path without frame number and extension, e.g. <dir>/playblast.
+        threads (int, optional): Threads of the mayapy process.
+
+    Raises:
+        LaunchError: If the chunk failed to playblast.
+    """
+    chunk_args = [
+        get_maya_launcher_path(),
+        "--input", args_dict["input"],
+        "--output", output_path,
+        "--first", str(chunk.start),
+        "--last", str(chunk.stop - 1),
+    ]
+    for flag, key in (("--camera", "view"), ("--width", "resX"), ("--height", "resY"), ("--threads", None)):
+        value = threads if key is None else args_dict.get(key)
+        if value:
+            chunk_args += [flag, str(value)]
+    launch_tool("mayapy", chunk_args, args_dict)
+
+
+def get_segment_write_data(write_data, gop_size) -> dict:
+    """Writer knob values for a segment: fixed GOP and no B-frames, so segments join with a stream copy."""
+    write_data = dict(write_data)
+    if gop_size > 1:
+        write_data.update(mov64_gop_size=gop_size, mov64_b_frames=0)
+    return write_data
+
+
+def get_job_gop_size(job) -> int:
+    """GOP the segments of a job are aligned on, common to the main movie and every deliverable."""
+    return get_common_gop_size([job["write"]] + [deliverable["write"] for deliverable in job.get("deliverables") or ()])
+
+
+def get_segment_job(job, gop_size, segment_dir, index, render_first, render_last, **overrides) -> dict:
+    """
+    Job payload rendering frames render_first-render_last of the main movie and of every
+    deliverable into segments of segment_dir.
+    """
+    deliverables = [dict(deliverable, write=get_segment_write_data(deliverable["write"], gop_size),
+                         dst=get_segment_path(segment_dir, index, output=position + 1))
+                    for position, deliverable in enumerate(job.get("deliverables") or ())]
+    return dict(job, write=get_segment_write_data(job["write"], gop_size), dst=get_segment_path(segment_dir, index),
+                deliverables=deliverables, render_first=render_first, render_last=render_last, **overrides)
+
+
+def concat_job_segments(job, segment_jobs, ffmpeg):
+    """Join the segments of the main movie and of every deliverable of a job, in segment_jobs order."""
+    concat_segments([segment_job["dst"] for segment_job in segment_jobs], job["dst"], ffmpeg)
+    for position, deliverable in enumerate(job.get("deliverables") or ()):
+        os.makedirs(os.path.dirname(os.path.abspath(deliverable["dst"])), exist_ok=True)
+        concat_segments([segment_job["deliverables"][position]["dst"] for segment_job in segment_jobs],
+                        deliverable["dst"], ffmpeg)
+
+
+@traced("previews", "encode")
+def finish_previews(job, ffmpeg=None, keep_tiles=False):
+    """
+    Write the sprite sheet index of a rendered job. With ffmpeg, the sprite sheet is first tiled
+    from the tiles the segments wrote; a Nuke process rendering the whole movie tiles it itself.
+
+    Args:
+        job (dict): Job payload from build_nuke_job.
+        ffmpeg (str, optional): ffmpeg executable, to tile the sheet of a segmented render.
+        keep_tiles (bool): Keep the tiles for the next incremental render.
+
+    Raises:
+        RuntimeError: If the sprite sheet could not be tiled or read.
+    """
+    previews = job.get("previews")
+    if not previews:
+        return
+    if ffmpeg:
+        assemble_sprite_sheet(previews, ffmpeg)
+    write_previews_index(previews, job["dst"], job["first"], job["write"].get("mov64_fps") or 24)
+    if not keep_tiles:
+        remove_tiles(previews)
+    logger.info(f"Poster frame and sprite sheet written next to {job['dst']}")
+
+
+def render_segments(segment_jobs, args_dict):
+    """
+    Render segment jobs in parallel Nuke processes, at most as many as the host's Nuke slots.
+
+    Args:
+        segment_jobs (list): Job payloads with dst, render_first and render_last set per segment.
+        args_dict (dict): Command arguments; max_parallel and dcc_limit are used.
+
+    Raises:
+        LaunchError: If a segment fails to render.
+    """
+    max_parallel, threads = get_parallel_budget(args_dict, "nuke", len(segment_jobs))
+    logger.info(f"Rendering {len(segment_jobs)} segments, {max_parallel} at a time with {threads} threads each")
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = {pool.submit(run_nuke_job, segment_job, args_dict, threads): segment_job
+                   for segment_job in segment_jobs}
+        failed = []
+        for future in as_completed(futures):
+            segment_job = futures[future]
+            try:
+                future.result()
+                logger.info(f"Segment {segment_job['render_first']}-{segment_job['render_last']} rendered")
+            except LaunchError as e:
+                logger.error(f"Segment {segment_job['render_first']}-{segment_job['render_last']} failed: {e}")
+                failed.append(e)
+    if failed:
+        raise LaunchError(f"{len(failed)} of {len(segment_jobs)} segments failed to render",
+                          transient=all(e.transient for e in failed))
+
+
+def render_chunked(job, args_dict):
+    """
+    Render a job as frame range segments in parallel Nuke processes and join them.
+    Segments are aligned on the codec GOP and encoded without B-frames, then concatenated
+    into the final movie with a stream copy, so nothing is re-encoded.
+
+    Args:
+        job (dict): Job payload from build_nuke_job.
+        args_dict (dict): Command arguments; chunks, chunk_size and max_parallel are used.
+
+    Raises:
+        LaunchError: If a segment fails to render.
+    """
+    ffmpeg = find_ffmpeg()
+    gop_size = get_job_gop_size(job)
+    segments = split_frame_range(range(job["first"], job["last"] + 1),
+                                 chunks=args_dict.get("chunks"),
+                                 chunk_size=args_dict.get("chunk_size"),
+                                 gop_size=gop_size)
+    logger.info(f"Split frames {job['first']}-{job['last']} into {len(segments)} segments (GOP {gop_size})")
+
+    segment_dir = create_segment_dir(job["dst"])
+    segment_jobs = [get_segment_job(job, gop_size, segment_dir, index, segment.start, segment.stop - 1)
+                    for index, segment in enumerate(segments)]
+
+    try:
+        render_segments(segment_jobs, args_dict)
+        concat_job_segments(job, segment_jobs, ffmpeg)
+        logger.info(f"Joined {len(segment_jobs)} segments into {job['dst']}")
+        finish_previews(job, ffmpeg)
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+
+
+def render_incremental(job, args_dict):
+    """
+    Render only what changed since the previous render of the same movie.
+    The movie is kept as persistent segments next to the output: the slate frame on its own,
+    then GOP-aligned blocks of source frames. A sidecar manifest records the knob payloads and
+    the source frame fingerprints (size, mtime) of every segment. A metadata change re-renders
+    the slate segment only, re-rendered frames only re-render the segments holding them, and
+    any other payload change re-renders everything. Segments are joined with a stream copy.
+
+    Args:
+        job (dict): Job payload from build_nuke_job.
+        args_dict (dict): Command arguments; chunk_size and max_parallel are used.
+
+    Raises:
+        LaunchError: If a segment fails to render.
+        ValueError: If the job has extra deliverables, whose segments are not kept.
+    """
+    if job.get("deliverables"):
+        raise ValueError("--deliverable is not supported with --incremental")
+    ffmpeg = find_ffmpeg()
+    gop_size = get_gop_size(job["write"])
+    segments = plan_segments(job, args_dict.get("chunk_size") or DEFAULT_SEGMENT_SIZE, gop_size)
+    segment_dir = get_segment_store_dir(job["dst"])
+    dirty = find_dirty_segments(job, segments, segment_dir)
+    if not dirty:
+        logger.info(f"{job['dst']} is up to date, nothing to render")
+        return
+
+    logger.info(f"Re-rendering {len(dirty)} of {len(segments)} segments of {job['dst']}")
+    os.makedirs(segment_dir, exist_ok=True)
+    write_data = get_segment_write_data(job["write"], gop_size)
+    render_segments([dict(job, write=write_data, dst=get_segment_file(segment_dir, segment),
+                          render_first=segment["first"], render_last=segment["last"])
+                     for segment in dirty], args_dict)
+
+    # Join next to the output and swap it in, the previous movie stays valid until then.
+    temp_output = os.path.join(segment_dir, "joined.mov")
+    concat_segments([get_segment_file(segment_dir, segment) for segment in segments], temp_output, ffmpeg)
+    os.replace(temp_output, job["dst"])
+    write_manifest(job, segments)
+    finish_previews(job, ffmpeg, keep_tiles=True)
+
+    # Segments of a longer previous version of the movie.
+    current = {os.path.basename(get_segment_file(segment_dir, segment)) for segment in segments}
+    for name in os.listdir(segment_dir):
+        if name not in current:
+            os.remove(os.path.join(segment_dir, name))
+    logger.info(f"Joined {len(segments)} segments into {job['dst']}")
+
+
+# Last frame the sprite tiles of a followed render are sampled up to when --last is not given.
+FOLLOW_PREVIEWS_LAST = 10 ** 8
+
+
+def render_following(args_dict, finished=None):
+    """
+    Render a daily while the source sequence is still being rendered.
+    Frames are picked up in order as soon as they are complete, and every GOP-aligned block of
+    frames is rendered into a segment in the background while the next frames land. The slate,
+    which shows the final frame range, is rendered last, then all segments are joined with a
+    stream copy. Following ends when --last is complete, or when no new frame completed within
+    --follow-timeout seconds.
+
+    Args:
+        args_dict (dict): Dictionary of arguments; input, output, first, last, follow_timeout,
+            chunk_size, max_parallel and dcc_limit are used.
+        finished (threading.Event, optional): Set by the renderer of the sequence once it is done,
+            see FrameFollower. Frames up to --last that are missing then fail the daily.
+
+    Raises:
+        LaunchError: If a segment fails to render, or frames are missing once the sequence is finished.
+        TimeoutError: If the first frame did not complete before the timeout.
+    """
+    ffmpeg = find_ffmpeg()
+    follower = FrameFollower(args_dict.get("input"), first=args_dict.get("first"), last=args_dict.get("last"),
+                             timeout=args_dict.get("follow_timeout") or DEFAULT_FOLLOW_TIMEOUT, finished=finished)
+    first = follower.wait_for_first()
+    if first is None:
+        if follower.stopped:
+            raise LaunchError(f"The first frame of {args_dict.get('input')} was not rendered")
+        raise TimeoutError(f"The first frame of {args_dict.get('input')} did not complete within {follower.timeout}s")
+
+    has_slate = bool(args_dict.get("slate"))
+    job_first = first - 1 if has_slate else first
+    # Frames are still landing, only the first one, complete by now, describes the sequence.
+    args_dict = apply_image_headers(args_dict, range(first, first + 1))
+    args_dict = apply_proxy(args_dict, range(first, first + 1), find_proxies=False)
+    # The tiles are sampled up to --last, or until following ends; without --last the poster
+    # frame defaults to the first frame.
+    previews_last = args_dict.get("last") or FOLLOW_PREVIEWS_LAST
+    previews_args = dict(args_dict, poster_frame=args_dict.get("poster_frame") or (None if args_dict.get("last") else first))
+    job = dict(build_nuke_job(dict(args_dict, previews=False), range(job_first, first + 1)),
+               previews=build_previews_payload(previews_args, range(first, previews_last + 1), args_dict.get("output")))
+    gop_size = get_job_gop_size(job)
+    chunk_size = align_chunk_size(args_dict.get("chunk_size") or DEFAULT_SEGMENT_SIZE, gop_size)
+
+    max_parallel, threads = get_parallel_budget(args_dict, "nuke")
+
+    segment_dir = create_segment_dir(job["dst"])
+    segment_jobs = []
+    futures = {}
+
+    def submit(block_first, block_last):
+        segment_job = get_segment_job(job, gop_size, segment_dir, len(segment_jobs) + 1,
+                                      block_first, block_last, last=block_last)
+        segment_jobs.append(segment_job)
+        futures[pool.submit(run_nuke_job, segment_job, args_dict, threads)] = segment_job
+        logger.info(f"Frames {block_first}-{block_last} complete, rendering segment {len(segment_jobs)}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            block_first = first
+            for frame in follower.iter_frames():
+                if frame - block_first + 1 == chunk_size:
+                    submit(block_first, frame)
+                    block_first = frame + 1
+            last = follower.last_frame
+            if last is None:
+                raise TimeoutError(f"Frame {first} of {args_dict.get('input')} never completed")
+            if follower.stopped and args_dict.get("last") is not None and last < args_dict["last"]:
+                raise LaunchError(f"Frames {last + 1}-{args_dict['last']} of {args_dict.get('input')} were not rendered")
+            if block_first <= last:
+                submit(block_first, last)
+            if follower.timed_out:
+                logger.warning(f"No new frame within {follower.timeout}s, ending the daily at frame {last}")
+
+            if has_slate:
+                # Rendered last, the slate shows the final frame range.
+                slate_job = get_segment_job(job, gop_size, segment_dir, 0, job_first, job_first, last=last)
+                futures[pool.submit(run_nuke_job, slate_job, args_dict, threads)] = slate_job
+                segment_jobs.insert(0, slate_job)
+
+            failed = []
+            for future in as_completed(futures):
+                segment_job = futures[future]
+                try:
+                    future.result()
+                except LaunchError as e:
+                    logger.error(f"Segment {segment_job['render_first']}-{segment_job['render_last']} failed: {e}")
+                    failed.append(e)
+        if failed:
+            raise LaunchError(f"{len(failed)} of {len(futures)} segments failed to render",
+                              transient=all(e.transient for e in failed))
+
+        concat_job_segments(job, segment_jobs, ffmpeg)
+        logger.info(f"Joined frames {first}-{last} into {job['dst']}")
+        if job["previews"]:
+            finish_previews(dict(job, previews=dict(job["previews"], last=last)), ffmpeg)
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+
+
+@traced("daily", "dailies")
+def render_movie(args_dict):
+    """
+    Render a movie from an image sequence using Nuke, in follow, incremental, chunked or
+    single process mode.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+
+    Raises:
+        LaunchError: If Nuke could not be launched or failed.
+        ValueError, FileNotFoundError, TimeoutError: If the job is invalid or its frames did not land.
+        RuntimeError: If the sprite sheet could not be written.
+    """
+    if args_dict.get("follow"):
+        render_following(args_dict)
+        return
+
+    frame_range = resolve_frame_range(args_dict)
+    args_dict = apply_image_headers(args_dict, get_source_frames(frame_range, args_dict))
+    args_dict = apply_proxy(args_dict, get_source_frames(frame_range, args_dict))
+    job = build_nuke_job(args_dict, frame_range)
+    run_preflight(job, args_dict)
+    if args_dict.get("incremental"):
+        render_incremental(job, args_dict)
+    elif args_dict.get("chunks") or args_dict.get("chunk_size"):
+        render_chunked(job, args_dict)
+    else:
+        run_nuke_job(job, args_dict)
+        finish_previews(job)
+
+
+# Image formats of the flipbook frames a Houdini daily is encoded from: 8-bit JPEG or half-float EXR.
+FLIPBOOK_FORMATS = ("jpg", "exr")
+
+
+def get_houdini_frames_path(frames_dir, strategy, flipbook_format=FLIPBOOK_FORMATS[0]) -> str:
+    """Sequence path of the frames a Houdini render strategy writes into frames_dir, see RenderStrategy."""
+    if strategy == "flipbook":
+        return os.path.join(frames_dir, "flipbook_temp", f"frame.####.{flipbook_format}")
+    return os.path.join(frames_dir, "render", "image.####.exr")
+
+
+@traced("houdini daily", "dailies")
+def render_houdini_daily(args_dict):
+    """
+    Render a Houdini scene and encode it into a slated daily while it renders.
+    Frames are rendered into a hidden directory next to the movie, by ROP chunks in parallel
+    hython processes (see render_houdini_chunks) or by a flipbook of the current Houdini session,
+    and every finished frame is picked up by the Nuke follow mode encode (see render_following).
+    The frames are removed once the movie is done.
+
+    Args:
+        args_dict (dict): Dictionary of arguments; input is the .hip scene, output the movie,
+            first and last the frame range (default: the scene range). strategy, rop_type, view,
+            resX, resY and flipbook_format set up the render, the other arguments the daily.
+
+    Raises:
+        FileNotFoundError: If the scene file does not exist.
+        ValueError: If a flipbook is asked for outside a graphical Houdini session.
+        LaunchError: If the scene could not be loaded or rendered, or a segment failed to render.
+    """
+    strategy = args_dict.get("strategy") or "rop"
+    hip_path = args_dict.get("input")
+    if not os.path.isfile(hip_path or ""):
+        raise FileNotFoundError(f"Houdini scene file not found: {hip_path}")
+
+    metadata = None
+    if strategy == "flipbook":
+        # Flipbooks capture the Scene Viewer, so they render in this Houdini session.
+        try:
+            from mvl_make_dailies.houdini.HoudiniSceneHandler import HoudiniSceneHandler
+            from mvl_make_dailies.houdini.RenderStrategy import FlipbookRenderStrategy
+        except ImportError:
+            raise ValueError("Flipbook dailies run in a graphical Houdini session, use --strategy rop from the command line")
+        scene = HoudiniSceneHandler(hip_path, cache_dir=args_dict.get("cache_dir"))
+        with span("load houdini scene", "houdini", scene=hip_path):
+            if not scene.load_scene():
+                raise LaunchError(f"Failed to load Houdini scene file: {hip_path}")
+        metadata = scene.get_scene_metadata()
+    elif args_dict.get("first") is None or args_dict.get("last") is None:
+        metadata = get_houdini_scene_metadata(args_dict)
+    first = args_dict["first"] if args_dict.get("first") is not None else metadata["frame_range"][0]
+    last = args_dict["last"] if args_dict.get("last") is not None else metadata["frame_range"][1]
+
+    frames_dir = create_segment_dir(args_dict["output"], "frames")
+    flipbook_format = args_dict.get("flipbook_format") or FLIPBOOK_FORMATS[0]
+    frames_path = get_houdini_frames_path(frames_dir, strategy, flipbook_format)
+    logger.info(f"Rendering frames {first}-{last} of {hip_path} ({strategy}) into {frames_path}")
+
+    def render_frames():
+        if strategy != "flipbook":
+            render_houdini_chunks(dict(args_dict, output=frames_dir, start=first, end=last))
+            return
+        res_x, res_y = args_dict.get("resX"), args_dict.get("resY")
+        if not (res_x and res_y):
+            res_x, res_y = metadata["resolution"] if all(metadata["resolution"]) else (1920, 1080)
+        with span("houdini flipbook", "houdini", first=first, last=last):
+            FlipbookRenderStrategy(scene).render(
+                camera_path=scene.getCameraPath(args_dict.get("view")),
+                output_path=os.path.join(frames_dir, "flipbook"),
+                start_frame=first,
+                end_frame=last,
+                res_x=res_x,
+                res_y=res_y,
+                image_format=flipbook_format,
+            )
+
+    try:
+        encode_while_rendering(args_dict, frames_path, first, last, render_frames)
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+
+
+@traced("maya daily", "dailies")
+def render_maya_daily(args_dict):
+    """
+    Playblast a Maya scene in parallel mayapy processes and encode it into a slated daily.
+    The frame range is split into chunks playblasted to JPEG images in a hidden directory next
+    to the movie, every process opening the scene and framing it through the same camera and
+    resolution (see maya/main.py). Frames are encoded by the Nuke follow mode as they land,
+    and removed once the movie is done.
+
+    Args:
+        args_dict (dict): Dictionary of arguments; input is the Maya scene, output the movie,
+            first and last the frame range. chunks, chunk_size, view, resX and resY
+            set up the playblasts (see render_frame_chunks), the other arguments the daily.
+
+    Raises:
+        FileNotFoundError: If the scene file does not exist.
+        ValueError: If the frame range is not given.
+        LaunchError: If chunks still fail after their retries, or a segment failed to render.
+    """
+    scene_path = args_dict.get("input")
+    if not os.path.isfile(scene_path or ""):
+        raise FileNotFoundError(f"Maya scene file not found: {scene_path}")
+    if args_dict.get("first") is None or args_dict.get("last") is None:
+        raise ValueError("Maya dailies need the --first and --last frames")
+    first, last = int(args_dict["first"]), int(args_dict["last"])
+
+    chunks = split_frame_range(range(first, last + 1), chunks=args_dict.get("chunks"),
+                               chunk_size=args_dict.get("chunk_size"))
+    frames_dir = create_segment_dir(args_dict["output"], "frames")
+    output_path = os.path.join(frames_dir, "playblast")
+    logger.info(f"Playblasting frames {first}-{last} of {scene_path} in {len(chunks)} chunks into {frames_dir}")
+
+    def render_frames():
+        render_frame_chunks(chunks, lambda chunk, threads: launch_maya_chunk(chunk, args_dict, output_path, threads),
+                            args_dict, "maya")
+
+    try:
+        encode_while_rendering(args_dict, f"{output_path}.####.jpg", first, last, render_frames)
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+
+
+def encode_while_rendering(args_dict, frames_path, first, last, render_frames):
+    """
+    Render a sequence on the calling thread while the follow mode encode (see render_following)
+    turns its finished frames into the daily in the background.
+
+    Args:
+        args_dict (dict): Dictionary of arguments of the daily.
+        frames_path (str): Sequence path the render writes, e.g. /tmp/frames/image.####.exr.
+        first (int): First frame.
+        last (int): Last frame.
+        render_frames (callable): Renders the sequence, raises on failure.
+
+    Raises:
+        LaunchError: If a segment failed to render or frames are missing once the render is done.
+        Exception: Whatever render_frames raised.
+    """
+    # The render signals the end of the sequence, so the encode does not time out on slow frames.
+    daily_args = dict(args_dict, input=frames_path, first=first, last=last,
+                      follow_timeout=args_dict.get("follow_timeout") or float("inf"))
+    finished = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as encoder:
+        encoding = encoder.submit(render_following, daily_args, finished)
+        try:
+            render_frames()
+        finally:
+            finished.set()
+        encoding.result()
+
 
 def create_movie_from_sequence(args_dict):
     """
@@ -78,75 +1265,317 @@ def create_movie_from_sequence(args_dict):
     Args:
         args_dict (dict): Dictionary of arguments.
     """
-    dcc_name = "nuke"
     try:
-        launcher_path = os.path.join(get_python_package_path(), "mvl_make_dailies", "nuke", "main.py")
-        if not os.path.exists(launcher_path):
-            logger.error(f"Nuke launcher script not found: {launcher_path}")
-            sys.exit(1)
+        render_movie(args_dict)
+
+    except LaunchError as e:
+        logger.error("Unable to creae mov file, %s", str(e))
+        sys.exit(1)
 
-        file_sequence_path = args_dict.get("input")
-        first_frame = args_dict.get("first")
-        last_frame = args_dict.get("last")
+    except (ValueError, FileNotFoundError, TimeoutError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    except Exception as e:
+        logger.error(f"Nuke movie render script failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+def create_houdini_daily(args_dict):
+    """
+    Render a Houdini scene into a slated daily, encoding frames as they are rendered.
+    See render_houdini_daily.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+    """
+    try:
+        render_houdini_daily(args_dict)
+
+    except LaunchError as e:
+        logger.error(f"Unable to create the Houdini daily: {e}")
+        sys.exit(1)
+
+    except (ValueError, FileNotFoundError, TimeoutError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+def create_maya_daily(args_dict):
+    """
+    Playblast a Maya scene in parallel mayapy processes into a slated daily.
+    See render_maya_daily.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+    """
+    try:
+        render_maya_daily(args_dict)
 
-        if is_valid_frame_range(first_frame, last_frame):
-            frame_range = range(first_frame, last_frame + 1)
-        else:
-            frame_range = gather_frame_range(os.path.dirname(file_sequence_path))
+    except LaunchError as e:
+        logger.error(f"Unable to create the Maya daily: {e}")
+        sys.exit(1)
+
+    except (ValueError, FileNotFoundError, TimeoutError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+def create_movies_from_manifest(args_dict):
+    """
+    Render every shot of a batch manifest in a single Nuke session.
+    The rez resolve, Nuke startup and licence checkout are paid once for the whole batch.
+    Shot arguments override the manifest defaults, which override the command line arguments.
+    A failing shot does not stop the batch; a summary report is logged at the end and
+    written to --report when given.
+
+    Args:
+        args_dict (dict): Dictionary of arguments, with "manifest" set to the manifest path.
+    """
+    started = time.time()
+    try:
+        shots = load_manifest(args_dict.get("manifest"))
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    base_args = {k: v for k, v in args_dict.items() if k not in ("manifest", "report", "input", "output")}
+    jobs = []
+    results = []
+    for index, shot in enumerate(shots):
+        shot_args = {**base_args, **shot}
+        try:
+            frame_range = resolve_frame_range(shot_args)
+            shot_args = apply_image_headers(shot_args, get_source_frames(frame_range, shot_args))
+            shot_args = apply_proxy(shot_args, get_source_frames(frame_range, shot_args))
+            job = build_nuke_job(shot_args, frame_range)
+            run_preflight(job, shot_args)
+            job["index"] = index
+            jobs.append(job)
+        except Exception as e:
+            logger.error(f"Shot #{index} ({shot.get('input')}) skipped: {e}")
+            results.append({"index": index, "input": shot.get("input"), "output": shot.get("output"),
+                            "status": "failed", "error": str(e), "seconds": 0.0})
 
-        slate_start_frame = frame_range.start - 1 if args_dict.get("slate") else frame_range.start
-        frame_range = range(slate_start_frame, frame_range.stop)
+    if jobs:
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            json.dump(jobs, f)
+            jobs_file = f.name
+        report_file = jobs_file.replace(".json", "_report.json")
 
-        mov_file_path = args_dict.get("output")
-        if not mov_file_path or not mov_file_path.lower().endswith('.mov'):
-            logger.error("Output file must be a .mov file.")
+        logger.info(f"Rendering {len(jobs)} shots in one Nuke session")
+        try:
+            launch_nuke(["--batch", jobs_file, "--report", report_file], args_dict)
+        except LaunchError as e:
+            logger.error("Unable to render batch, %s", str(e))
+        finally:
+            os.remove(jobs_file)
+
+        rendered = {}
+        if os.path.exists(report_file):
+            with open(report_file, "r") as f:
+                rendered = {result["index"]: result for result in json.load(f)}
+            os.remove(report_file)
+
+        for job in jobs:
+            result = rendered.get(job["index"], {
+                "index": job["index"], "input": job["src"], "output": job["dst"],
+                "status": "failed", "error": "Not rendered, the Nuke session ended early.", "seconds": 0.0,
+            })
+            if result["status"] == "succeeded":
+                try:
+                    finish_previews(job)
+                except RuntimeError as e:
+                    result = dict(result, status="failed", error=str(e))
+            results.append(result)
+
+    results.sort(key=lambda result: result["index"])
+    failed = [result for result in results if result["status"] != "succeeded"]
+    report = {
+        "manifest": args_dict.get("manifest"),
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "seconds": round(time.time() - started, 2),
+        "shots": results,
+    }
+
+    for result in failed:
+        logger.error(f"Shot #{result['index']} failed ({result['input']}): {result['error']}")
+    logger.info(f"Batch complete: {report['succeeded']}/{report['total']} shots rendered in {report['seconds']}s")
+
+    if args_dict.get("report"):
+        with open(args_dict["report"], "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Batch report written to {args_dict['report']}")
+
+    if failed:
+        sys.exit(1)
+
+def bake_template(args_dict):
+    """
+    Bake the template variant for the show-level knob values of the command line, ahead of
+    rendering dailies with them. Nothing is launched when the variant is already baked.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+    """
+    if args_dict.get("format") == AUTO_FORMAT:
+        logger.error("--format auto needs source frames, bake with an explicit --format")
+        sys.exit(1)
+    node_payloads = build_node_payloads(args_dict)
+    template = build_template_payload(node_payloads, dict(args_dict, no_template_cache=False))
+    if os.path.isfile(template["baked"]):
+        logger.info(f"Template variant is up to date: {template['baked']}")
+        return
+
+    try:
+        launch_nuke(["--bake-only", "--template", json.dumps(template),
+                     "--reformat", json.dumps(node_payloads["reformat"])], args_dict)
+    except LaunchError as e:
+        logger.error("Unable to bake template, %s", str(e))
+        sys.exit(1)
+
+    if not os.path.isfile(template["baked"]):
+        logger.error(f"Nuke did not write the baked template {template['baked']}")
+        sys.exit(1)
+    logger.info(f"Baked template variant {template['baked']}")
+
+def clear_rez_context_cache(args_dict):
+    """
+    Remove every cached rez context, forcing the next launch to resolve again.
+
+    Args:
+        args_dict (dict): Dictionary of arguments, cache_dir is used.
+    """
+    removed = RezContextCache(args_dict.get("cache_dir")).clear()
+    logger.info(f"Removed {removed} cached rez contexts")
+
+def watch_render_roots(args_dict):
+    """
+    Watch render roots and render a daily of every sequence once its frames stopped landing,
+    see watcher.watch_roots. Runs until interrupted.
+
+    Args:
+        args_dict (dict): Dictionary of arguments, with "watch_root" listing the render roots.
+            The other render arguments apply to every daily.
+    """
+    base_args = {k: v for k, v in args_dict.items() if k not in ("input", "output", "first", "last", "follow")}
+
+    def dispatch(input_path, output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        create_movie_from_sequence(dict(base_args, input=input_path, output=output_path))
+
+    try:
+        watch_roots(args_dict.get("watch_root") or [], dispatch,
+                    output_template=args_dict.get("output_template"),
+                    settle=args_dict.get("settle"),
+                    max_jobs=args_dict.get("max_jobs"),
+                    poll_interval=args_dict.get("poll_interval"),
+                    force_polling=args_dict.get("force_polling"))
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+# Raising job functions run by queue workers, per job mode.
+QUEUE_COMMANDS = {
+    "daily": render_movie,
+}
+
+# Arguments of the queue command itself, not stored with the jobs.
+QUEUE_ARG_KEYS = ("app_mode", "action", "priority", "max_attempts", "max_jobs", "drain", "queue_db")
+
+
+def manage_queue(args_dict):
+    """
+    Queue dailies and run them with a host-wide limit on concurrent DCC processes.
+
+    Actions:
+        add: Queue a daily with the --input, --output and render arguments, at --priority.
+        work: Run queued jobs, see job_queue.work_queue.
+        status: Show the queue depth and throughput.
+
+    Args:
+        args_dict (dict): Dictionary of arguments.
+    """
+    try:
+        get_dcc_limits(args_dict.get("dcc_limit"))
+        queue = JobQueue(get_queue_path(args_dict.get("queue_db"), args_dict.get("cache_dir")))
+    except (ValueError, sqlite3.Error) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    action = args_dict.get("action") or "status"
+    if action == "add":
+        if not args_dict.get("input") or not args_dict.get("output"):
+            logger.error("queue add requires --input and --output")
             sys.exit(1)
+        job_args = {k: v for k, v in args_dict.items() if k not in QUEUE_ARG_KEYS}
+        job_id = queue.enqueue("daily", job_args, priority=args_dict.get("priority") or 0,
+                               max_attempts=args_dict.get("max_attempts") or DEFAULT_MAX_ATTEMPTS)
+        logger.info(f"Queued job {job_id}: {args_dict['input']} -> {args_dict['output']}")
+    elif action == "work":
+        work_queue(queue, QUEUE_COMMANDS, workers=args_dict.get("max_jobs") or DEFAULT_QUEUE_WORKERS,
+                   drain=args_dict.get("drain"))
+    else:
+        log_queue_status(queue)
+
+def serve_worker_pool(args_dict):
+    """
+    Run a pool of warm Nuke workers rendering the dailies of this host, see worker_pool.WorkerPool.
+    While the pool runs, dailies started on the host (command line, Python API, queue and
+    watch mode) render in its workers instead of launching Nuke, see run_nuke_job.
+    Workers are not counted in the host's Nuke slots, so --workers Nuke processes run on top
+    of the --dcc-limit nuke launches.
 
-        # Collect metadata
-        slate_data = {k: args_dict[k] for k in slate_keys() if k in args_dict and args_dict[k] is not None}
-        burnin_data = {k: args_dict.get(k) for k in burn_in_keys() if k in args_dict}
-        colorspace_data = {k: args_dict[k] for k in colorspace_keys() if k in args_dict and args_dict[k] is not None}
-        write_data = {k: args_dict[k] for k in writer_keys() if k in args_dict and args_dict[k] is not None}
-        reformat_data = {k: args_dict[k] for k in reformat_keys() if k in args_dict and args_dict[k] is not None}
-
-        launcher_args = [
-            "--src", f"{file_sequence_path}",
-            "--dst", f"{mov_file_path}",
-            "--slate", json.dumps(slate_data),
-            "--burnin", json.dumps(burnin_data),
-            "--reformat", json.dumps(reformat_data),
-            "--colorspace",json.dumps(colorspace_data),
-            "--write", json.dumps(write_data),
-        ]
-
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
-            for arg in launcher_args:
-                f.write(arg + "\n")
-
-            args_file = f.name
-            
-        cmd = [
-            "-F", f"{frame_range.start}-{frame_range.stop}",
-            "-x", f"{launcher_path}",
-            f'@{args_file}',
-        ]
-
-        nuke_command_str = " ".join(cmd)
+    Actions:
+        start: Run the pool until interrupted or stopped (default).
+        status: Show the workers and job counts of the running pool.
+        stop: Stop the running pool once its running jobs are done.
 
+    Args:
+        args_dict (dict): Dictionary of arguments.
+    """
+    address = get_pool_address(args_dict.get("pool_socket"), args_dict.get("cache_dir"))
+    action = args_dict.get("action") or "start"
+    if action in ("status", "stop"):
         try:
-            from mvl_rezboot.resolver import Resolver
-            nuke_resolver = Resolver(f"nuke {nuke_command_str}")
-            nuke_resolver.run()       
-        
-        except PackageCommandError as e:
-             logger.error("Unable to creae mov file, Nuke launch failed: %s", str(e))
-             sys.exit(1)
+            report_pool(address, action)
+        except PoolError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        return
 
-    except Exception as e:
-        logger.error(f"Nuke movie render script failed: {e}", exc_info=True)
+    def launch_worker(worker_address):
+        # Workers take no Nuke slot: held for the lifetime of the pool, they would block every
+        # other Nuke launch of the host (bake, batch, --no-pool, jobs no worker was free for).
+        launch_tool("nuke", ["-t", launcher_path, "--worker", worker_address], worker_args)
+
+    workers = args_dict.get("workers") or DEFAULT_WORKERS
+    worker_args = dict(args_dict, dcc_limit=list(args_dict.get("dcc_limit") or []) + ["nuke=0"])
+    try:
+        launcher_path = get_nuke_launcher_path()
+        pool = WorkerPool(address, launch_worker, workers=workers,
+                          max_worker_jobs=args_dict.get("max_worker_jobs") or DEFAULT_MAX_WORKER_JOBS,
+                          max_worker_rss_mb=args_dict.get("max_worker_rss"))
+    except (ValueError, FileNotFoundError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+    try:
+        pool.serve()
+    except (OSError, RuntimeError) as e:
+        logger.error(str(e))
         sys.exit(1)
 
 # Command/Strategy mapping
 APP_MODE_COMMANDS = {
     "daily": create_movie_from_sequence,
-}
\ No newline at end of file
+    "batch": create_movies_from_manifest,
+    "clear-rez-cache": clear_rez_context_cache,
+    "bake": bake_template,
+    "watch": watch_render_roots,
+    "queue": manage_queue,
+    "serve": serve_worker_pool,
+    "houdini": create_houdini_daily,
+    "maya": create_maya_daily,
+}
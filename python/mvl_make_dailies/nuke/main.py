@@ -7,10 +7,13 @@ import sys
 import tempfile
 import uuid
 import json
+import time
 import logging
 from enum import Enum
 from mvl_core_pipeline.logger import Logger
 from mvl_core_pipeline import rez_utils
+from mvl_make_dailies.tracing import init_trace, span, traced, begin_frame, end_frame, read_rss
+from mvl_make_dailies.common_utils import JOB_ERROR_EXIT_CODE
 
 logger = Logger(name='movie_generator', repo_name='rez-make-dailies').get_logger()
 logger.setLevel(logging.DEBUG)
@@ -18,6 +21,27 @@ logger.setLevel(logging.DEBUG)
 class NukeTemplate(Enum):
     MVL_VFX_TEMPLATE_SLATE_AND_BURNIN = "MVL_VFX_Template_Slate_Overlay_v0.0.1.nk"
 
+# Template node receiving the knob values of each job payload.
+TEMPLATE_NODES = {
+    'slate': 'NETFLIX_TEMPLATE_SLATE',
+    'burnin': 'Netflix_MEI_Overlay',
+    'reformat': 'MVL_FORMAT',
+    'colorspace': 'MVL_COLORSPACE',
+    'write': 'MVL_MOV_WRITER',
+}
+
+SLATE_CACHE_WRITER = 'MVL_SLATE_CACHE_WRITE'
+SLATE_CACHE_READ = 'MVL_SLATE_CACHE_READ'
+SLATE_CACHE_SWITCH = 'MVL_SLATE_CACHE_SWITCH'
+PROXY_DOWNREZ = 'MVL_PROXY_DOWNREZ'
+DELIVERABLE_WRITER = 'MVL_DELIVERABLE_WRITE'
+DELIVERABLE_FORMAT = 'MVL_DELIVERABLE_FORMAT'
+POSTER_WRITER = 'MVL_POSTER_WRITE'
+SPRITE_FORMAT = 'MVL_SPRITE_FORMAT'
+SPRITE_WRITER = 'MVL_SPRITE_WRITE'
+# Knobs of MVL_MOV_WRITER not copied to the deliverable writers.
+WRITER_OWN_KNOBS = ('name', 'file', 'file_type', 'xpos', 'ypos', 'selected', 'label')
+
 def get_package_path()->str:
     """
     Get the package path for the mvl_make_dailies package.
@@ -62,7 +86,7 @@ def apply_knob_values(node_name, knob_data, logger=None):
                 logger.error(msg)
             else:
                 print(f"ERROR: {msg}", file=sys.stderr)
-            sys.exit(1)
+            sys.exit(JOB_ERROR_EXIT_CODE)
 
         for k, v in knob_data.items():
             if k in node.knobs() and v is not None:
@@ -73,6 +97,357 @@ def apply_knob_values(node_name, knob_data, logger=None):
         logger.error(f"Failed to set knob '{k}' to value '{v}': {e}")
         logger.debug(traceback.format_exc())
    
+def register_format(format_spec):
+    """
+    Register a format described as "<width> <height> <pixel aspect> <name>" (see
+    image_headers.nuke_format_for) and return its name. Format names are returned unchanged.
+    :param format_spec: Format name or description.
+    :return: The format name.
+    """
+    if format_spec and ' ' in str(format_spec).strip():
+        nuke.addFormat(format_spec)
+        return format_spec.split()[-1]
+    return format_spec
+
+def register_reformat_data(reformat_data):
+    """Return the reformat knob values with a described format registered and replaced by its name."""
+    reformat_data = dict(reformat_data or {})
+    if 'format' in reformat_data:
+        reformat_data['format'] = register_format(reformat_data['format'])
+    return reformat_data
+
+def save_baked_template(baked_path):
+    """
+    Save the nodes of the current script as a baked template variant.
+    The variant is written next to its final path and renamed over it, so concurrent Nuke
+    processes baking the same variant never read a partial file. Failing to bake is not fatal.
+    :param baked_path: Path of the baked variant in the template cache.
+    """
+    os.makedirs(os.path.dirname(baked_path), exist_ok=True)
+    temp_path = f"{baked_path}.{uuid.uuid4().hex}.tmp"
+    nodes = nuke.allNodes()
+    try:
+        for node in nodes:
+            node.setSelected(True)
+        nuke.nodeCopy(temp_path)
+        os.replace(temp_path, baked_path)
+        logger.info(f"Baked template variant saved to {baked_path}")
+    except Exception as e:
+        logger.warning(f"Could not save baked template {baked_path}: {e}")
+    finally:
+        for node in nodes:
+            node.setSelected(False)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def build_template(template_data=None):
+    """
+    Paste the dailies template into the current script with the show-level knob values applied.
+    The baked variant is pasted as-is when it exists. Otherwise the source template is pasted,
+    the show-level values are applied and the result is baked for the next runs.
+    :param template_data: Template payload (see movie_commands.build_template_payload) with the
+        source template path, the baked variant path and the show-level values per node.
+    :return: The show-level knob values per node now set in the graph.
+    """
+    template_data = dict(template_data or {})
+    show_data = dict(template_data.get('show') or {})
+    if 'reformat' in show_data:
+        show_data['reformat'] = register_reformat_data(show_data['reformat'])
+    baked_path = template_data.get('baked')
+
+    if baked_path and os.path.isfile(baked_path):
+        with span("nodePaste", "nuke", template=baked_path):
+            nuke.nodePaste(baked_path)
+        logger.info(f"Using baked template {baked_path}")
+        return show_data
+
+    template_path = template_data.get('path') or get_nuke_template_path(NukeTemplate.MVL_VFX_TEMPLATE_SLATE_AND_BURNIN)
+    with span("nodePaste", "nuke", template=template_path):
+        nuke.nodePaste(template_path)
+    for payload_name, knob_data in show_data.items():
+        apply_knob_values(TEMPLATE_NODES[payload_name], knob_data, logger)
+    if baked_path:
+        save_baked_template(baked_path)
+    return show_data
+
+def shot_knob_values(knob_data, applied_data):
+    """Return the knob values that differ from the ones already applied by the baked template."""
+    return {k: v for k, v in knob_data.items() if k not in applied_data or applied_data[k] != v}
+
+def bake_template(template_data, reformat_data=None):
+    """
+    Bake a template variant without rendering anything.
+    :param template_data: Template payload, see build_template.
+    :param reformat_data: Reformat knob values, for the root format.
+    """
+    nuke.scriptClear()
+    nuke.root()['format'].setValue(register_reformat_data(reformat_data).get('format', 'HD_1080'))
+    build_template(dict(template_data, baked=None))
+    save_baked_template(template_data['baked'])
+
+def setup_proxy_downrez(proxy_data):
+    """
+    Scale the plate down right after MVL_READ, so every node up to MVL_FORMAT processes
+    output sized images. MVL_FORMAT still sets the output format, slate and burn-in layouts
+    are unchanged.
+    :param proxy_data: Proxy payload with the downrez scale (see movie_commands.apply_proxy).
+    """
+    read_node = nuke.toNode('MVL_READ')
+    if not proxy_data or read_node is None:
+        return
+    dependents = read_node.dependent(nuke.INPUTS | nuke.HIDDEN_INPUTS, forceEvaluate=False)
+
+    downrez = nuke.nodes.Reformat(name=PROXY_DOWNREZ)
+    downrez['type'].setValue('scale')
+    downrez['scale'].setValue(float(proxy_data['scale']))
+    downrez['filter'].setValue('Cubic')
+    downrez.setInput(0, read_node)
+
+    for node in dependents:
+        for index in range(node.inputs()):
+            if node.input(index) is read_node:
+                node.setInput(index, downrez)
+    logger.info(f"Downscaling MVL_READ by {proxy_data['scale']}")
+
+def setup_deliverables(deliverables_data, main_burnin=True):
+    """
+    Branch the graph into one writer per extra deliverable, so every movie is rendered from a
+    single read and colorspace pass. A deliverable with the burn-in is fed from the node feeding
+    MVL_MOV_WRITER, one without it from the slate group, then through its own Reformat when its
+    format differs. Writers copy the MVL_MOV_WRITER knobs, then set their own write knob values.
+    :param deliverables_data: Deliverable payloads (see deliverables.build_deliverable_payloads).
+    :param main_burnin: Whether the main movie has the burn-in.
+    """
+    main_writer = nuke.toNode('MVL_MOV_WRITER')
+    slate_node = nuke.toNode('NETFLIX_TEMPLATE_SLATE')
+    if not deliverables_data or main_writer is None or slate_node is None:
+        return
+    burnin_source = main_writer.input(0)
+    if not main_burnin and any(deliverable['burnin'] for deliverable in deliverables_data):
+        # The burn-in is kept for the deliverables, only the main movie goes without it.
+        main_writer.setInput(0, slate_node)
+
+    for index, deliverable in enumerate(deliverables_data, 1):
+        source = burnin_source if deliverable['burnin'] else slate_node
+        if deliverable.get('format'):
+            reformat = nuke.nodes.Reformat(name=f"{DELIVERABLE_FORMAT}{index}")
+            reformat['format'].setValue(register_format(deliverable['format']))
+            reformat['resize'].setValue('fit')
+            reformat['black_outside'].setValue(True)
+            reformat.setInput(0, source)
+            source = reformat
+
+        writer_name = f"{DELIVERABLE_WRITER}{index}"
+        writer = nuke.nodes.Write(name=writer_name)
+        writer.setInput(0, source)
+        # The codec knobs only exist once the file type is set.
+        writer['file_type'].setValue(main_writer['file_type'].value())
+        for name, knob in main_writer.knobs().items():
+            if name not in WRITER_OWN_KNOBS and name in writer.knobs():
+                writer[name].fromScript(knob.toScript())
+        output_path = normalize_path(deliverable['dst'])
+        os.makedirs(os.path.dirname(os.path.abspath(deliverable['dst'])), exist_ok=True)
+        apply_knob_values(writer_name, dict(deliverable['write'], file=output_path), logger)
+        logger.info(f"Deliverable {index}: {deliverable['dst']} "
+                    f"({deliverable.get('format') or 'main format'}, burn-in {'on' if deliverable['burnin'] else 'off'})")
+
+def add_jpeg_writer(name, source, file_path, disable_expression):
+    """Add a JPEG Write node rendering only on the frames where disable_expression is false."""
+    writer = nuke.nodes.Write(name=name)
+    writer.setInput(0, source)
+    writer['file'].setValue(file_path.replace('\\', '/'))
+    writer['file_type'].setValue('jpeg')
+    writer['_jpeg_quality'].setValue(0.85)
+    writer['disable'].setExpression(disable_expression)
+    return writer
+
+def setup_previews(previews_data):
+    """
+    Add the poster frame and sprite tile writers, fed from MVL_COLORSPACE so they see the
+    images already decoded, reformatted and colour converted for the movie, without slate or
+    burn-in. Both only write on their frames during the movie pass: the poster at the output
+    format, the tiles scaled down to the tile width.
+    :param previews_data: Previews payload (see previews.build_previews_payload).
+    """
+    source = nuke.toNode('MVL_COLORSPACE')
+    if not previews_data or source is None:
+        return
+    os.makedirs(previews_data['tiles_dir'], exist_ok=True)
+    add_jpeg_writer(POSTER_WRITER, source, previews_data['poster'], f"frame != {previews_data['poster_frame']}")
+
+    root_format = nuke.root().format()
+    tile_width = previews_data['tile_width']
+    tile_height = max(1, int(round(tile_width * root_format.height() / (root_format.width() * root_format.pixelAspect()))))
+    reformat = nuke.nodes.Reformat(name=SPRITE_FORMAT)
+    reformat['type'].setValue('to box')
+    reformat['box_width'].setValue(tile_width)
+    reformat['box_height'].setValue(tile_height)
+    reformat['box_fixed'].setValue(True)
+    reformat['resize'].setValue('fit')
+    reformat['black_outside'].setValue(True)
+    reformat.setInput(0, source)
+
+    first, last, interval = previews_data['first'], previews_data['last'], previews_data['interval']
+    disable = f"frame < {first} || frame > {last} || fmod(frame - {first}, {interval}) != 0"
+    add_jpeg_writer(SPRITE_WRITER, reformat, os.path.join(previews_data['tiles_dir'], 'tile.####.jpg'), disable)
+    logger.info(f"Writing the poster frame {previews_data['poster_frame']} and a sprite tile every {interval} frames")
+
+def render_sprite_sheet(previews_data):
+    """
+    Tile the sprite tiles written during the movie pass into the sprite sheet. Only the tile
+    JPEGs are read, the source sequence is not touched again.
+    :param previews_data: Previews payload (see previews.build_previews_payload).
+    """
+    from mvl_make_dailies.previews import get_tile_frames, get_sheet_layout
+
+    frames = get_tile_frames(previews_data)
+    columns, rows = get_sheet_layout(previews_data)
+    tiles = nuke.nodes.Read(name='MVL_SPRITE_TILES')
+    tiles['file'].setValue(os.path.join(previews_data['tiles_dir'], 'tile.####.jpg').replace('\\', '/'))
+    tiles['first'].setValue(frames[0])
+    tiles['last'].setValue(frames[-1])
+    tiles['raw'].setValue(True)
+
+    tile_format = nuke.toNode(SPRITE_FORMAT)
+    tile_width, tile_height = int(tile_format['box_width'].value()), int(tile_format['box_height'].value())
+    sheet = nuke.nodes.ContactSheet(name='MVL_SPRITE_SHEET')
+    sheet['width'].setValue(tile_width * columns)
+    sheet['height'].setValue(tile_height * rows)
+    sheet['rows'].setValue(rows)
+    sheet['columns'].setValue(columns)
+    sheet['roworder'].setValue('TopBottom')
+    sheet['gap'].setValue(0)
+    for index, frame in enumerate(frames):
+        hold = nuke.nodes.FrameHold()
+        hold['first_frame'].setValue(frame)
+        hold.setInput(0, tiles)
+        sheet.setInput(index, hold)
+
+    writer = nuke.nodes.Write(name='MVL_SPRITE_SHEET_WRITE')
+    writer.setInput(0, sheet)
+    writer['file'].setValue(previews_data['sheet'].replace('\\', '/'))
+    writer['file_type'].setValue('jpeg')
+    writer['raw'].setValue(True)
+    writer['_jpeg_quality'].setValue(0.85)
+    nuke.execute(writer, frames[0], frames[0])
+    logger.info(f"Sprite sheet of {len(frames)} tiles written to {previews_data['sheet']}")
+
+def get_writers():
+    """Return MVL_MOV_WRITER followed by the deliverable and preview writers of the current script."""
+    writer = nuke.toNode('MVL_MOV_WRITER')
+    if writer is None:
+        raise RuntimeError("MVL_MOV_WRITER node not found. Please check the Nuke script template.")
+    deliverable_writers = sorted((node for node in nuke.allNodes('Write') if node.name().startswith(DELIVERABLE_WRITER)),
+                                 key=lambda node: int(node.name()[len(DELIVERABLE_WRITER):]))
+    preview_writers = [node for node in (nuke.toNode(POSTER_WRITER), nuke.toNode(SPRITE_WRITER)) if node is not None]
+    return [writer] + deliverable_writers + preview_writers
+
+def use_cached_slate(slate_node, still_path, slate_frame):
+    """
+    Feed a cached slate still to the nodes downstream of the slate group on the slate frame.
+    The slate group still passes the plate through on every other frame.
+    :param slate_node: The NETFLIX_TEMPLATE_SLATE group.
+    :param still_path: Cached slate frame.
+    :param slate_frame: Frame the slate is rendered on.
+    """
+    dependents = slate_node.dependent(nuke.INPUTS | nuke.HIDDEN_INPUTS, forceEvaluate=False)
+
+    read_node = nuke.nodes.Read(name=SLATE_CACHE_READ)
+    read_node['file'].setValue(still_path.replace('\\', '/'))
+    read_node['raw'].setValue(True)
+
+    switch = nuke.nodes.Switch(name=SLATE_CACHE_SWITCH)
+    switch.setInput(0, slate_node)
+    switch.setInput(1, read_node)
+    switch['which'].setExpression(f"frame == {slate_frame}")
+
+    for node in dependents:
+        for index in range(node.inputs()):
+            if node.input(index) is slate_node:
+                node.setInput(index, switch)
+
+def setup_slate_cache(slate_cache_data, slate_data, reformat_data, colorspace_data, root_format, slate_frame):
+    """
+    Reuse the cached slate frame for this slate, or add a writer caching the one about to be rendered.
+    The cache key covers the slate, format and colorspace knob values, the template and the
+    source frame shown as the slate thumbnail.
+    :param slate_cache_data: Slate cache payload (see movie_commands.build_slate_cache_payload).
+    :param slate_data: Slate knob values.
+    :param reformat_data: Reformat knob values.
+    :param colorspace_data: Colorspace knob values.
+    :param root_format: Format of the script.
+    :param slate_frame: Frame the slate is rendered on.
+    """
+    from mvl_make_dailies.slate_cache import SlateCache, file_fingerprint
+
+    slate_node = nuke.toNode('NETFLIX_TEMPLATE_SLATE')
+    read_node = nuke.toNode('MVL_READ')
+    if slate_node is None or read_node is None:
+        return
+
+    thumbnail_path = read_node['file'].evaluate(int(slate_node['thumbnail_frame'].value()))
+    cache = SlateCache(slate_cache_data['dir'])
+    key = cache.get_key(slate_data, reformat_data, colorspace_data, root_format,
+                        slate_cache_data.get('template_hash'), file_fingerprint(thumbnail_path))
+    cached_path = cache.lookup(key)
+    if cached_path:
+        logger.info(f"Slate cache hit, using {cached_path}")
+        use_cached_slate(slate_node, cached_path, slate_frame)
+        return
+
+    logger.info("Slate cache miss, the rendered slate frame will be cached")
+    writer = nuke.nodes.Write(name=SLATE_CACHE_WRITER)
+    writer.setInput(0, slate_node)
+    writer['file'].setValue(cache.get_temp_path(key).replace('\\', '/'))
+    writer['file_type'].setValue('exr')
+    writer['raw'].setValue(True)
+    writer['datatype'].setValue('16 bit half')
+    writer['channels'].setValue('rgba')
+    for name, value in (('cache_dir', slate_cache_data['dir']), ('cache_key', key)):
+        knob = nuke.String_Knob(name, name)
+        writer.addKnob(knob)
+        knob.setValue(value)
+
+def cache_slate_frame(render_first, render_last):
+    """
+    Render the slate frame into the slate cache when it is part of the frames about to be
+    rendered, then use the cached still for the movie itself.
+    Failing to cache the slate is not fatal, the slate group renders it as usual.
+    :param render_first: First frame about to be rendered.
+    :param render_last: Last frame about to be rendered.
+    """
+    from mvl_make_dailies.slate_cache import SlateCache
+
+    writer = nuke.toNode(SLATE_CACHE_WRITER)
+    if writer is None:
+        return
+
+    slate_frame = int(nuke.root()['first_frame'].value())
+    temp_path = writer['file'].value()
+    cache_dir, key = writer['cache_dir'].value(), writer['cache_key'].value()
+    rendered = False
+    if render_first <= slate_frame <= render_last:
+        try:
+            with span("slate cache render", "nuke"):
+                nuke.execute(writer, slate_frame, slate_frame)
+            rendered = True
+        except Exception as e:
+            logger.warning(f"Could not render the slate frame into the slate cache: {e}")
+    nuke.delete(writer)
+
+    if not rendered:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+    try:
+        cached_path = SlateCache(cache_dir).store(temp_path, key)
+    except OSError as e:
+        logger.warning(f"Could not store the slate frame in the slate cache: {e}")
+        return
+    logger.info(f"Slate frame cached to {cached_path}")
+    use_cached_slate(nuke.toNode('NETFLIX_TEMPLATE_SLATE'), cached_path, slate_frame)
+
+@traced("build graph", "nuke")
 def generate_movie(
     file_in_path,
     file_out_path,  
@@ -81,6 +456,15 @@ def generate_movie(
     reformat_data=None,
     colorspace_data=None, 
     write_data=None,  
+    read_data=None,
+    first_frame=None,
+    last_frame=None,
+    save_script=True,
+    template_data=None,
+    slate_cache_data=None,
+    proxy_data=None,
+    deliverables_data=None,
+    previews_data=None,
 ):
     """
     Read the nuke script, update paths, and render the movie with best practices.
@@ -94,15 +478,37 @@ def generate_movie(
     :param mov_codec: Codec for .mov files (default: "H.264")
     :param frame_rate: Frame rate for the output (default: 24)
     :param metadata_to_preserve: List of Nuke knobs/metadata to preserve (default: None)
+    :param read_data: Extra knob values for the MVL_READ node (default: None)
+    :param first_frame: First frame to render, slate frame included (default: the -F frame range)
+    :param last_frame: Last frame to render (default: the -F frame range)
+    :param save_script: Save the resulting Nuke script to a temp file for debugging (default: True)
+    :param template_data: Template and baked variant to build the graph from, see build_template (default: None)
+    :param slate_cache_data: Slate cache to reuse the slate frame from, see setup_slate_cache (default: None)
+    :param proxy_data: Downrez applied after the Read, see setup_proxy_downrez (default: None)
+    :param deliverables_data: Extra movies rendered from the same pass, see setup_deliverables (default: None)
+    :param previews_data: Poster frame and sprite tiles written from the same pass, see setup_previews (default: None)
+    :return: The (first, last) frames to render.
     
     """
-    mvl_format = reformat_data['format'] if reformat_data and 'format' in reformat_data else 'HD_1080'  # Default to HD_1080
+    reformat_data = register_reformat_data(reformat_data)
+    mvl_format = reformat_data['format'] if 'format' in reformat_data else 'HD_1080'  # Default to HD_1080
 
     sequence_path_nomalized = normalize_path(file_in_path)
     output_mov_path_nomalized = normalize_path(file_out_path)
 
-    ranges = nuke.tcl('frames ranges')
-    first, last = [int(x) for x in ranges.split('-')]
+    if first_frame is None or last_frame is None:
+        ranges = nuke.tcl('frames ranges')
+        first, last = [int(x) for x in ranges.split('-')]
+    else:
+        first, last = int(first_frame), int(last_frame)
+
+    slate_data = dict(slate_data or {})
+    overlay_data = dict(overlay_data or {})
+    reformat_data = dict(reformat_data or {})
+    colorspace_data = dict(colorspace_data or {})
+    write_data = dict(write_data or {})
+    # The slate is rendered on the frame before the first source frame.
+    read_first = first + 1 if slate_data.get('slate', True) else first
 
     nuke.scriptClear()
     nuke.root()['first_frame'].setValue(first)
@@ -115,26 +521,30 @@ def generate_movie(
         "f_frames_duration": (last - first)
     }) 
     
-    # Import the Nuke script template
-    nuke.nodePaste(get_nuke_template_path(NukeTemplate.MVL_VFX_TEMPLATE_SLATE_AND_BURNIN))
+    # Import the Nuke script template, show-level knobs already set
+    show_data = build_template(template_data)
 
     # Mvl Read Node
     read_node = nuke.toNode('MVL_READ')
     if read_node:
         read_node['file'].setValue(sequence_path_nomalized)
         read_node['frame_mode'].setValue('sequence')
-        read_node['first'].setValue(first + 1)
+        read_node['first'].setValue(read_first)
         read_node['last'].setValue(last) 
 
-    apply_knob_values('MVL_FORMAT', reformat_data, logger)
-    apply_knob_values('MVL_COLORSPACE', colorspace_data, logger)
+    apply_knob_values('MVL_FORMAT', shot_knob_values(reformat_data, show_data.get('reformat', {})), logger)
+    apply_knob_values('MVL_COLORSPACE', shot_knob_values(colorspace_data, show_data.get('colorspace', {})), logger)
     apply_knob_values('MVL_READ', {'file': sequence_path_nomalized}, logger)
+    if read_data:
+        apply_knob_values('MVL_READ', read_data, logger)
+    setup_proxy_downrez(proxy_data)
 
    
-    apply_knob_values('NETFLIX_TEMPLATE_SLATE', slate_data, logger)
-    apply_knob_values('Netflix_MEI_Overlay', overlay_data, logger)
+    apply_knob_values('NETFLIX_TEMPLATE_SLATE', shot_knob_values(slate_data, show_data.get('slate', {})), logger)
+    apply_knob_values('Netflix_MEI_Overlay', shot_knob_values(overlay_data, show_data.get('burnin', {})), logger)
 
-    if overlay_data.get('burnin') is False:
+    deliverable_burnin = any(deliverable['burnin'] for deliverable in deliverables_data or ())
+    if overlay_data.get('burnin') is False and not deliverable_burnin:
         # Optionally disable the node
         node = nuke.toNode("Netflix_MEI_Overlay")
         if node:
@@ -148,11 +558,147 @@ def generate_movie(
     if not os.path.exists(output_dir): 
         os.makedirs(output_dir)
     write_data["file"] = output_mov_path_nomalized
-    apply_knob_values('MVL_MOV_WRITER', write_data, logger)
+    apply_knob_values('MVL_MOV_WRITER', shot_knob_values(write_data, show_data.get('write', {})), logger)
+    setup_deliverables(deliverables_data, overlay_data.get('burnin') is not False)
+    setup_previews(previews_data)
+
+    if slate_cache_data and slate_data.get('slate', True):
+        # The downrez changes the slate thumbnail, it is part of the cache key.
+        slate_reformat_data = dict(reformat_data, proxy=proxy_data) if proxy_data else reformat_data
+        setup_slate_cache(slate_cache_data, slate_data, slate_reformat_data, colorspace_data, mvl_format, first)
 
-    temp_nk_path = os.path.join(tempfile.gettempdir(), f"mvl_temp_script_{uuid.uuid4().hex}.nk")
-    nuke.scriptSaveAs(temp_nk_path)
-    logger.info(f"Nuke script saved to {temp_nk_path}")
+    if save_script:
+        temp_nk_path = os.path.join(tempfile.gettempdir(), f"mvl_temp_script_{uuid.uuid4().hex}.nk")
+        nuke.scriptSaveAs(temp_nk_path)
+        logger.info(f"Nuke script saved to {temp_nk_path}")
+
+    return first, last
+
+def trace_frame_before():
+    node = nuke.thisNode()
+    begin_frame(int(nuke.frame()), key=node.name(), writer=node.name())
+
+def trace_frame_after():
+    end_frame(key=nuke.thisNode().name())
+
+def add_frame_tracing():
+    """Time the render of every frame of every Write node when the run is traced."""
+    if init_trace('nuke') is None:
+        return
+    nuke.addBeforeFrameRender(trace_frame_before, nodeClass='Write')
+    nuke.addAfterFrameRender(trace_frame_after, nodeClass='Write')
+
+def render_movie(first, last, previews_data=None):
+    """
+    Render the movie writer and the deliverable and preview writers of the current script over
+    the given frame range, in a single pass over the shared upstream nodes.
+    :param first: First frame, slate frame included.
+    :param last: Last frame.
+    :param previews_data: Previews payload, the sprite sheet is tiled once the movie is rendered.
+        Only given when the whole movie is rendered, segments leave the tiling to the caller.
+    """
+    writers = get_writers()
+    cache_slate_frame(first, last)
+    for writer in writers:
+        logger.info(f"Rendering {writer['file'].value()} frames {first}-{last}")
+    with span("render", "nuke", first=first, last=last, writers=len(writers)):
+        if len(writers) == 1:
+            nuke.execute(writers[0], first, last)
+        else:
+            nuke.executeMultiple(writers, ((first, last, 1),))
+    if previews_data:
+        with span("sprite sheet", "nuke"):
+            render_sprite_sheet(previews_data)
+
+def render_job(job, save_script=True):
+    """
+    Build the dailies graph for a job payload (see movie_commands.build_nuke_job) and render it.
+    :param job: Job payload with src, dst, first, last and per-node knob values.
+    :param save_script: Save the resulting Nuke script to a temp file for debugging.
+    """
+    first, last = generate_movie(
+        file_in_path=job['src'],
+        file_out_path=job['dst'],
+        slate_data=job.get('slate'),
+        overlay_data=job.get('burnin'),
+        reformat_data=job.get('reformat'),
+        colorspace_data=job.get('colorspace'),
+        write_data=job.get('write'),
+        read_data=job.get('read'),
+        first_frame=job.get('first'),
+        last_frame=job.get('last'),
+        save_script=save_script,
+        template_data=job.get('template'),
+        slate_cache_data=job.get('slate_cache'),
+        proxy_data=job.get('proxy'),
+        deliverables_data=job.get('deliverables'),
+        previews_data=job.get('previews'),
+    )
+    render_first, render_last = job.get('render_first'), job.get('render_last')
+    if render_first is None:
+        render_movie(first, last, job.get('previews'))
+    else:
+        render_movie(render_first, render_last)
+
+def run_batch(jobs_path, report_path):
+    """
+    Render a list of job payloads one after the other in this Nuke session.
+    The graph is cleared and rebuilt for every shot. A failing shot is recorded in the
+    report and the batch moves on to the next one.
+    :param jobs_path: JSON file holding the list of job payloads.
+    :param report_path: JSON file receiving one result per job.
+    """
+    with open(jobs_path, 'r') as f:
+        jobs = json.load(f)
+
+    results = []
+    for position, job in enumerate(jobs):
+        index = job.get('index', position)
+        logger.info(f"Batch shot {position + 1}/{len(jobs)}: {job['src']} -> {job['dst']}")
+        started = time.time()
+        result = {'index': index, 'input': job['src'], 'output': job['dst'], 'status': 'succeeded', 'error': None}
+        try:
+            with span("batch shot", "nuke", index=index, output=job['dst']):
+                render_job(job, save_script=False)
+        # apply_knob_values exits on template errors; keep going with the next shot.
+        except (Exception, SystemExit) as e:
+            logger.error(f"Batch shot {index} failed: {e}")
+            result.update(status='failed', error=str(e) or type(e).__name__)
+        result['seconds'] = round(time.time() - started, 2)
+        results.append(result)
+
+        # Written after every shot so the report survives a crash of the session.
+        with open(report_path, 'w') as f:
+            json.dump(results, f)
+
+def serve_worker(address):
+    """
+    Render the jobs sent by a worker pool (see worker_pool.WorkerPool) in this Nuke session
+    until the pool tells this worker to stop. The script is cleared after every job and no
+    temp script is saved.
+    :param address: Address of the worker pool.
+    """
+    from mvl_make_dailies.worker_pool import connect, send_message, read_message
+
+    with connect(address) as conn, conn.makefile('rwb') as stream:
+        send_message(stream, {'type': 'worker', 'pid': os.getpid()})
+        while True:
+            message = read_message(stream)
+            if message is None or message.get('type') != 'job':
+                break
+            job = message['job']
+            started = time.time()
+            result = {'type': 'result', 'status': 'succeeded', 'error': None}
+            try:
+                with span("pool job", "nuke", output=job['dst']):
+                    render_job(job, save_script=False)
+            # apply_knob_values exits on template errors; keep the worker for the next job.
+            except (Exception, SystemExit) as e:
+                logger.error(f"Job {job['src']} -> {job['dst']} failed: {e}")
+                result.update(status='failed', error=str(e) or type(e).__name__)
+            nuke.scriptClear()
+            result.update(seconds=round(time.time() - started, 2), rss_mb=round(read_rss() / 1048576.0, 1))
+            send_message(stream, result)
 
 def main():
     """
@@ -173,8 +719,35 @@ def main():
     parser.add_argument("--colorspace", type=str, default=None, help="Colorspace data as JSON string")
     parser.add_argument("--write", type=str, default=None, help="Write data as JSON string")
     parser.add_argument("--read", type=str, default=None, help="Read data as JSON string") 
+    parser.add_argument("--first", type=int, default=None, help="First frame to render, slate frame included")
+    parser.add_argument("--last", type=int, default=None, help="Last frame to render")
+    parser.add_argument("--render-first", type=int, default=None, help="First frame of the segment to render (default: --first)")
+    parser.add_argument("--render-last", type=int, default=None, help="Last frame of the segment to render (default: --last)")
+    parser.add_argument("--batch", type=str, default=None, help="JSON file with a list of jobs to render in this session")
+    parser.add_argument("--report", type=str, default=None, help="JSON file receiving the batch results")
+    parser.add_argument("--template", type=str, default=None, help="Template and baked variant as JSON string")
+    parser.add_argument("--bake-only", action="store_true", help="Only bake the --template variant, render nothing")
+    parser.add_argument("--slate-cache", type=str, default=None, help="Slate frame cache as JSON string")
+    parser.add_argument("--proxy", type=str, default=None, help="Downrez after the Read as JSON string")
+    parser.add_argument("--deliverables", type=str, default=None, help="Extra movies rendered from the same pass as JSON string")
+    parser.add_argument("--previews", type=str, default=None, help="Poster frame and sprite sheet as JSON string")
+    parser.add_argument("--worker", type=str, default=None, help="Worker pool address to render jobs from until told to stop")
     
     args = parser.parse_args()
+    add_frame_tracing()
+
+    if args.worker:
+        serve_worker(args.worker)
+        return
+
+    if args.batch:
+        run_batch(args.batch, args.report)
+        return
+
+    template_data = json.loads(args.template) if args.template else None
+    if args.bake_only:
+        bake_template(template_data, json.loads(args.reformat) if args.reformat else None)
+        return
 
     file_in = args.src
     file_out = args.dst
@@ -184,20 +757,34 @@ def main():
     reformat_data = json.loads(args.reformat) if args.reformat else None
     colorspace_data = json.loads(args.colorspace) if args.colorspace else None
     write_data = json.loads(args.write) if args.write else None
+    read_data = json.loads(args.read) if args.read else None
+    previews_data = json.loads(args.previews) if args.previews else None
 
     try:
-        generate_movie(
+        first, last = generate_movie(
             file_in_path= file_in,
             file_out_path= file_out,
             slate_data=slate_data,
             overlay_data=burnin_data,
             reformat_data=reformat_data,
             colorspace_data=colorspace_data,
-            write_data=write_data
+            write_data=write_data,
+            read_data=read_data,
+            first_frame=args.first,
+            last_frame=args.last,
+            template_data=template_data,
+            slate_cache_data=json.loads(args.slate_cache) if args.slate_cache else None,
+            proxy_data=json.loads(args.proxy) if args.proxy else None,
+            deliverables_data=json.loads(args.deliverables) if args.deliverables else None,
+            previews_data=previews_data,
         )
+        if args.render_first is None:
+            render_movie(first, last, previews_data)
+        else:
+            render_movie(args.render_first, args.render_last)
     except Exception as e:
         print(f"An error occurred during dailies rendering: {e}", file=sys.stderr)
-        sys.exit(1) # Exit with an error code
+        sys.exit(JOB_ERROR_EXIT_CODE) # Exit with an error code, the job is not launched again
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from mvl_make_dailies.sequence_utils import Sequence, FrameSet, parse_sequence_path
+
+BAD_FRAME_POLICIES = ("fail", "hold", "checkerboard")
+DEFAULT_BAD_FRAME_POLICY = "fail"
+DEFAULT_MIN_FRAME_SIZE = 1
+# Checks are bound by filesystem latency (NFS round trips), not CPU.
+DEFAULT_PREFLIGHT_WORKERS = 32
+# Bytes read from the start of a frame, enough for the header of every supported format.
+HEADER_BYTES = 64 * 1024
+
+MISSING = "missing"
+TOO_SMALL = "too_small"
+CORRUPT = "corrupt"
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+PNG_END = b"IEND\xaeB`\x82"
+JPEG_MAGIC = b"\xff\xd8\xff"
+JPEG_END = b"\xff\xd9"
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+DPX_MAGICS = {b"SDPX": ">", b"XPDS": "<"}
+TIFF_MAGICS = (b"II*\x00", b"MM\x00*")
+
+# Scanlines per chunk of each EXR compression, see the OpenEXR file layout.
+EXR_LINES_PER_CHUNK = {0: 1, 1: 1, 2: 1, 3: 16, 4: 32, 5: 16, 6: 32, 7: 32, 8: 32, 9: 256}
+EXR_TILED_FLAG = 0x200
+EXR_MULTIPART_FLAGS = 0x1000 | 0x800
+
+
+class BadFramesError(ValueError):
+    """Raised when the pre-flight check finds bad frames and the policy is to fail."""
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+def _exr_scanline_chunks(header):
+    """
+    Parse the attributes of a single-part scanline EXR header.
+
+    Returns:
+        tuple: (number of chunks, offset of the chunk offset table), or None if the file is tiled,
+        multi-part or its header is incomplete.
+    """
+    version = struct.unpack_from("<I", header, 4)[0]
+    if version & (EXR_TILED_FLAG | EXR_MULTIPART_FLAGS):
+        return None
+    offset = 8
+    data_window = compression = None
+    while True:
+        name_end = header.find(b"\0", offset)
+        if name_end < 0:
+            return None
+        if name_end == offset:
+            offset += 1
+            break
+        type_end = header.find(b"\0", name_end + 1)
+        if type_end < 0 or type_end + 5 > len(header):
+            return None
+        name = header[offset:name_end]
+        size = struct.unpack_from("<i", header, type_end + 1)[0]
+        value_offset = type_end + 5
+        if size < 0 or value_offset + size > len(header):
+            return None
+        if name == b"dataWindow":
+            data_window = struct.unpack_from("<iiii", header, value_offset)
+        elif name == b"compression":
+            compression = header[value_offset]
+        offset = value_offset + size
+    if data_window is None or compression not in EXR_LINES_PER_CHUNK:
+        return None
+    height = data_window[3] - data_window[1] + 1
+    lines = EXR_LINES_PER_CHUNK[compression]
+    return (height + lines - 1) // lines, offset
+
+
+def _read_at(f, size, offset) -> bytes:
+    f.seek(offset)
+    return f.read(size)
+
+
+def _check_exr(f, header, size):
+    layout = _exr_scanline_chunks(header)
+    if layout is None:
+        return None
+    chunks, table_offset = layout
+    table = _read_at(f, chunks * 8, table_offset)
+    if len(table) < chunks * 8:
+        return "truncated in the chunk offset table"
+    last_chunk = max(struct.unpack(f"<{chunks}Q", table))
+    if last_chunk + 8 > size:
+        return "truncated, the last chunk starts past the end of the file"
+    _, chunk_size = struct.unpack("<ii", _read_at(f, 8, last_chunk))
+    if last_chunk + 8 + chunk_size > size:
+        return "truncated in the last chunk"
+    return None
+
+
+def _check_dpx(header, size):
+    byte_order = DPX_MAGICS[header[:4]]
+    if len(header) < 20:
+        return "truncated header"
+    declared = struct.unpack_from(f"{byte_order}I", header, 16)[0]
+    if declared > size:
+        return f"truncated, {size} of {declared} bytes"
+    return None
+
+
+def check_frame(path, min_size=DEFAULT_MIN_FRAME_SIZE):
+    """
+    Check that a frame exists, is large enough and is not truncated, reading only its header
+    and, depending on the format, its last bytes or EXR chunk offset table.
+
+    Args:
+        path (str): Frame path.
+        min_size (int): Minimum file size in bytes.
+
+    Returns:
+        tuple: (status, reason) with status None for a good frame, otherwise missing,
+        too_small or corrupt.
+    """
+    try:
+        f = open(path, "rb", buffering=0)
+    except FileNotFoundError:
+        return MISSING, "file not found"
+    except OSError as e:
+        return CORRUPT, f"cannot open: {e.strerror}"
+    with f:
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if size < max(min_size, 1):
+                return TOO_SMALL, f"{size} bytes"
+            header = f.read(min(size, HEADER_BYTES))
+            extension = os.path.splitext(path)[1].lower().lstrip(".")
+            if extension == "exr":
+                if not header.startswith(EXR_MAGIC):
+                    return CORRUPT, "not an OpenEXR file"
+                reason = _check_exr(f, header, size)
+            elif extension == "dpx":
+                if header[:4] not in DPX_MAGICS:
+                    return CORRUPT, "not a DPX file"
+                reason = _check_dpx(header, size)
+            elif extension == "png":
+                if not header.startswith(PNG_MAGIC):
+                    return CORRUPT, "not a PNG file"
+                reason = None if _read_at(f, 8, max(size - 8, 0)) == PNG_END else "truncated, no IEND chunk"
+            elif extension in ("jpg", "jpeg"):
+                if not header.startswith(JPEG_MAGIC):
+                    return CORRUPT, "not a JPEG file"
+                # Some writers pad the file after the end of image marker.
+                reason = None if JPEG_END in _read_at(f, 64, max(size - 64, 0)) else "truncated, no end of image marker"
+            elif extension in ("tif", "tiff"):
+                reason = None if header[:4] in TIFF_MAGICS else "not a TIFF file"
+            else:
+                reason = None
+        except (OSError, struct.error) as e:
+            return CORRUPT, f"unreadable header: {e}"
+    return (CORRUPT, reason) if reason else (None, None)
+
+
+def preflight_sequence(sequence_path, frames, min_size=DEFAULT_MIN_FRAME_SIZE, workers=DEFAULT_PREFLIGHT_WORKERS) -> dict:
+    """
+    Check every frame of a sequence in parallel, see check_frame.
+
+    Args:
+        sequence_path (str): Sequence pattern or frame path, see sequence_utils.parse_sequence_path.
+        frames (range): Frames to check.
+        min_size (int): Minimum frame size in bytes.
+        workers (int): Number of checking threads.
+
+    Returns:
+        dict: Report with the checked frame range, the bad frames (frame, status, reason) and
+        the missing, too small and corrupt frames as frame range strings.
+
+    Raises:
+        ValueError: If the path has no frame number or padding.
+    """
+    parsed = parse_sequence_path(sequence_path)
+    if parsed is None:
+        raise ValueError(f"No frame number or padding found in sequence path: {sequence_path}")
+    sequence = Sequence(*parsed, FrameSet())
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda frame: (frame, check_frame(sequence.frame_path(frame), min_size)), frames)
+        bad = [{"frame": frame, "status": status, "reason": reason} for frame, (status, reason) in results if status]
+
+    return {
+        "sequence": sequence.pattern,
+        "first": frames.start,
+        "last": frames.stop - 1,
+        "checked": len(frames),
+        "bad": bad,
+        **{status: str(FrameSet.from_frames(item["frame"] for item in bad if item["status"] == status))
+           for status in (MISSING, TOO_SMALL, CORRUPT)},
+        "seconds": round(time.time() - started, 2),
+    }
+
+
+def hold_frame_expression(bad_frames, frames) -> str:
+    """
+    Build a Read frame expression showing the previous good frame instead of each bad one,
+    or the next good frame for bad frames at the start of the range.
+
+    Args:
+        bad_frames (FrameSet): Bad frames.
+        frames (range): Source frame range.
+
+    Returns:
+        str: Nuke expression of the frame to read.
+
+    Raises:
+        ValueError: If no frame of the range is good.
+    """
+    terms = []
+    for start, end in bad_frames.ranges:
+        if start > frames.start:
+            held = start - 1
+        elif end + 1 < frames.stop:
+            held = end + 1
+        else:
+            raise ValueError("Every frame of the sequence is bad, there is no frame to hold.")
+        condition = f"frame=={start}" if start == end else f"(frame>={start}&&frame<={end})"
+        terms.append(f"{condition}?{held}:")
+    return "".join(terms) + "frame"
+
+
+def bad_frame_read_data(report, policy) -> dict:
+    """
+    Read node knob values handling the bad frames of a report according to the policy:
+    hold the previous good frame, or render Nuke's checkerboard in their place.
+    """
+    if not report["bad"] or policy == "fail":
+        return {}
+    if policy == "checkerboard":
+        return {"on_error": "checkerboard"}
+    frames = range(report["first"], report["last"] + 1)
+    bad_frames = FrameSet.from_frames(item["frame"] for item in report["bad"])
+    return {"on_error": "nearest frame", "frame_mode": "expression", "frame": hold_frame_expression(bad_frames, frames)}
+
+
+def write_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,173 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+from mvl_make_dailies.cache_utils import atomic_write_json
+from mvl_make_dailies.image_headers import read_header
+from mvl_make_dailies.tracing import span
+
+# Every Nth source frame becomes a tile of the scrub sprite sheet.
+DEFAULT_SPRITE_INTERVAL = 10
+DEFAULT_SPRITE_COLUMNS = 10
+DEFAULT_TILE_WIDTH = 160
+PREVIEWS_INDEX_VERSION = 1
+
+
+def get_preview_paths(output_path) -> dict:
+    """
+    Paths of the previews of an output movie, e.g. "shot.mov" -> "shot.poster.jpg",
+    "shot.sprites.jpg", "shot.sprites.json" and the hidden ".shot_tiles" directory.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    base_name = os.path.splitext(os.path.basename(output_path))[0]
+    return {
+        "poster": os.path.join(output_dir, f"{base_name}.poster.jpg"),
+        "sheet": os.path.join(output_dir, f"{base_name}.sprites.jpg"),
+        "index": os.path.join(output_dir, f"{base_name}.sprites.json"),
+        "tiles_dir": os.path.join(output_dir, f".{base_name}_tiles"),
+    }
+
+
+def get_tile_path(tiles_dir, frame) -> str:
+    return os.path.join(tiles_dir, f"tile.{frame:04d}.jpg")
+
+
+def get_tile_frames(previews) -> range:
+    """Source frames sampled as sprite tiles."""
+    return range(previews["first"], previews["last"] + 1, previews["interval"])
+
+
+def build_previews_payload(args_dict, source_frames, output_path):
+    """
+    Describe the poster frame and sprite sheet written alongside a movie.
+
+    Args:
+        args_dict (dict): Command arguments; previews, poster_frame, sprite_interval,
+            sprite_columns and sprite_width are used.
+        source_frames (range): Source frames of the movie, slate frame excluded.
+        output_path (str): Movie path.
+
+    Returns:
+        dict: Preview paths, poster frame, frames sampled every interval frames from first to
+        last, sheet columns and tile width, or None when previews are not requested.
+
+    Raises:
+        ValueError: If the poster frame is outside the source frames or a sprite setting is not positive.
+    """
+    if not args_dict.get("previews"):
+        return None
+    interval = args_dict.get("sprite_interval") or DEFAULT_SPRITE_INTERVAL
+    columns = args_dict.get("sprite_columns") or DEFAULT_SPRITE_COLUMNS
+    tile_width = args_dict.get("sprite_width") or DEFAULT_TILE_WIDTH
+    if min(interval, columns, tile_width) < 1:
+        raise ValueError("--sprite-interval, --sprite-columns and --sprite-width must be positive")
+
+    poster_frame = args_dict.get("poster_frame")
+    if poster_frame is None:
+        poster_frame = source_frames[len(source_frames) // 2]
+    elif poster_frame not in source_frames:
+        raise ValueError(f"--poster-frame {poster_frame} is outside the source frames "
+                         f"{source_frames.start}-{source_frames.stop - 1}")
+
+    return dict(
+        get_preview_paths(output_path),
+        poster_frame=poster_frame,
+        first=source_frames.start,
+        last=source_frames.stop - 1,
+        interval=interval,
+        columns=columns,
+        tile_width=tile_width,
+    )
+
+
+def get_sheet_layout(previews) -> tuple:
+    """(columns, rows) of the sprite sheet."""
+    count = len(get_tile_frames(previews))
+    columns = min(previews["columns"], count)
+    return columns, -(-count // columns)
+
+
+def assemble_sprite_sheet(previews, ffmpeg):
+    """
+    Tile the rendered tiles into the sprite sheet with ffmpeg, for renders split into segments
+    where no single Nuke process wrote every tile. Only the small tile JPEGs are read.
+
+    Args:
+        previews (dict): Previews payload, see build_previews_payload.
+        ffmpeg (str): ffmpeg executable, see chunked_render.find_ffmpeg.
+
+    Raises:
+        RuntimeError: If ffmpeg fails.
+    """
+    frames = get_tile_frames(previews)
+    columns, rows = get_sheet_layout(previews)
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+        for frame in frames:
+            escaped = get_tile_path(previews["tiles_dir"], frame).replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_file = f.name
+
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "concat", "-safe", "0", "-i", list_file,
+        "-vf", f"tile={columns}x{rows}",
+        "-frames:v", "1", "-q:v", "3",
+        previews["sheet"],
+    ]
+    try:
+        with span("ffmpeg sprite sheet", "encode", tiles=len(frames)):
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    finally:
+        os.remove(list_file)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to tile {len(frames)} tiles into {previews['sheet']}: {result.stderr.strip()}")
+
+
+def write_previews_index(previews, movie_path, movie_first, fps):
+    """
+    Write the JSON index of a sprite sheet, mapping each tile to its frame and movie time.
+    The tile size is read from the sheet header. A poster frame that was not rendered (a
+    followed render that ended before it) is left out.
+
+    Args:
+        previews (dict): Previews payload, see build_previews_payload.
+        movie_path (str): Movie the previews belong to.
+        movie_first (int): First frame of the movie, slate frame included.
+        fps (float): Movie frame rate.
+
+    Raises:
+        RuntimeError: If the sprite sheet is missing or unreadable.
+    """
+    header = read_header(previews["sheet"])
+    if header is None:
+        raise RuntimeError(f"Sprite sheet {previews['sheet']} is missing or unreadable")
+    columns, rows = get_sheet_layout(previews)
+    tile_width = header.width // columns
+    tile_height = header.height // rows
+    tiles = []
+    for index, frame in enumerate(get_tile_frames(previews)):
+        row, column = divmod(index, columns)
+        tiles.append({"frame": frame, "time": round((frame - movie_first) / float(fps), 3),
+                      "x": column * tile_width, "y": row * tile_height})
+
+    has_poster = os.path.isfile(previews["poster"])
+    base_dir = os.path.dirname(previews["index"])
+    atomic_write_json(previews["index"], {
+        "version": PREVIEWS_INDEX_VERSION,
+        "movie": os.path.relpath(movie_path, base_dir),
+        "poster": os.path.relpath(previews["poster"], base_dir) if has_poster else None,
+        "poster_frame": previews["poster_frame"] if has_poster else None,
+        "sheet": os.path.relpath(previews["sheet"], base_dir),
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "columns": columns,
+        "rows": rows,
+        "interval": previews["interval"],
+        "fps": fps,
+        "tiles": tiles,
+    })
+
+
+def remove_tiles(previews):
+    shutil.rmtree(previews["tiles_dir"], ignore_errors=True)
@@ -0,0 +1,114 @@
+import os
+
+from mvl_make_dailies.image_headers import read_header
+from mvl_make_dailies.sequence_utils import parse_sequence_path, iter_sequences
+
+AUTO_PROXY = "auto"
+# Where proxy sequences of "<dir>/<name>.####.exr" are looked for: "<dir>/proxy", "<dir>/proxies"
+# and "<dir>_proxy", each possibly split in per resolution subdirectories ("<dir>/proxy/1920x1080").
+PROXY_DIR_NAMES = ("proxy", "proxies")
+PROXY_DIR_SUFFIX = "_proxy"
+# Reformat resize types scaling the whole image. With the others (none, crop) the plate is
+# cropped at full resolution, which a smaller read would change.
+SCALING_RESIZE_TYPES = ("fit", "fill", "width", "height")
+# Aspect ratio difference under which a proxy is considered to show the same image.
+ASPECT_TOLERANCE = 0.01
+
+
+def parse_proxy(value):
+    """
+    Parse a --proxy value.
+
+    Returns:
+        float or str: "auto", or the proxy scale.
+
+    Raises:
+        ValueError: If the value is neither auto nor a scale between 0 and 1.
+    """
+    if value == AUTO_PROXY:
+        return value
+    try:
+        scale = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"--proxy must be auto or a scale between 0 and 1, not {value}")
+    if not 0 < scale <= 1:
+        raise ValueError(f"--proxy scale must be between 0 and 1, not {value}")
+    return scale
+
+
+def get_downrez_scale(resize, source_size, output_size):
+    """
+    Scale the reformat applies to the source, for the scaling resize types.
+
+    Args:
+        resize (str): Reformat resize type.
+        source_size (tuple): (width, height) of the source frames.
+        output_size (tuple): (width, height) of the output format.
+
+    Returns:
+        float: The scale, or None if the reformat does not scale the whole image.
+    """
+    if resize not in SCALING_RESIZE_TYPES:
+        return None
+    scale_x = output_size[0] / source_size[0]
+    scale_y = output_size[1] / source_size[1]
+    return {"fit": min(scale_x, scale_y), "fill": max(scale_x, scale_y), "width": scale_x, "height": scale_y}[resize]
+
+
+def iter_proxy_dirs(directory):
+    """Yield the directories that may hold proxies of the sequences of a directory."""
+    bases = [os.path.join(directory, name) for name in PROXY_DIR_NAMES]
+    bases.append(directory.rstrip(os.sep) + PROXY_DIR_SUFFIX)
+    for base in bases:
+        if not os.path.isdir(base):
+            continue
+        yield base
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def find_proxy(sequence_path, frames, source_header, min_width):
+    """
+    Find the smallest proxy of a sequence that is at least min_width wide, shows the same
+    image (aspect ratio), has every frame and the file format of the source, so the input
+    colorspace still applies.
+
+    Args:
+        sequence_path (str): Source sequence pattern.
+        frames (range): Source frames.
+        source_header (ImageHeader): Header of a source frame.
+        min_width (float): Width the proxy must have at least.
+
+    Returns:
+        tuple: (Sequence, ImageHeader) of the proxy, or None.
+    """
+    parsed = parse_sequence_path(sequence_path)
+    if parsed is None:
+        return None
+    directory, prefix, extension = parsed[0], parsed[1], parsed[3].lower()
+    source_aspect = source_header.width * source_header.pixel_aspect / source_header.height
+
+    found = None
+    for proxy_dir in iter_proxy_dirs(directory):
+        try:
+            sequences = [seq for seq in iter_sequences(proxy_dir)
+                         if seq.prefix == prefix and seq.extension.lower() == extension]
+        except OSError:
+            continue
+        for sequence in sequences:
+            if not all(frame in sequence.frames for frame in frames):
+                continue
+            header = read_header(sequence.frame_path(frames.start))
+            if header is None or header.width < min_width:
+                continue
+            aspect = header.width * header.pixel_aspect / header.height
+            if abs(aspect - source_aspect) / source_aspect > ASPECT_TOLERANCE:
+                continue
+            if found is None or header.width < found[1].width:
+                found = (sequence, header)
+    return found
@@ -0,0 +1,198 @@
+import os
+import time
+import platform
+import threading
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, read_json, atomic_write_json, touch, file_lock
+from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.tracing import span, record_span
+from mvl_make_dailies.host_slots import DCC_TOOL_NAMES
+
+DEFAULT_TTL = 3600
+TTL_ENV = "MVL_MAKE_DAILIES_REZ_CACHE_TTL"
+CONTEXT_CACHE_VERSION = 1
+
+
+def get_tool_request(tool) -> list:
+    """
+    Build the package request used to run a DCC tool from the current rez environment:
+    the tool package plus the packages requested for the current context ($REZ_USED_REQUEST).
+
+    This is not the request mvl_rezboot's Resolver builds for "<tool> <args>": the Resolver may
+    add studio or show packages of its own, so a cached context can resolve other package
+    versions than a Resolver launch. This is why the cache is only used with --rez-cache.
+
+    Args:
+        tool (str): Tool name, e.g. "nuke"; tools such as "hython" request the package of their DCC.
+
+    Returns:
+        list: Package request strings.
+    """
+    from rez.utils.formatting import PackageRequest
+
+    package = DCC_TOOL_NAMES.get(tool, tool)
+    current = os.environ.get("REZ_USED_REQUEST", "").split()
+    return [package] + [request for request in current if PackageRequest(request).name != package]
+
+
+class RezContextCache:
+    """
+    Cache of resolved rez contexts, stored as .rxt files under <cache dir>/rez_contexts.
+
+    Contexts are keyed by the package request, the rez packages path and the platform.
+    A cached context is reused while it is younger than the TTL and the package families it
+    resolved have not changed in any package repository (a new version released into a family
+    changes the mtime of the family directory). Concurrent processes resolving the same request
+    wait for each other, so a bulk run resolves once per request. One cache is shared by the
+    segment and chunk threads of a process, its counters and loaded contexts are guarded by a lock.
+
+    Args:
+        cache_dir (str, optional): Cache root (see cache_utils.get_cache_root).
+        ttl (float, optional): Seconds a resolved context stays valid.
+            Defaults to $MVL_MAKE_DAILIES_REZ_CACHE_TTL or one hour.
+    """
+
+    def __init__(self, cache_dir=None, ttl=None):
+        self.directory = get_cache_dir("rez_contexts", cache_dir)
+        self.ttl = float(ttl if ttl is not None else os.environ.get(TTL_ENV, DEFAULT_TTL))
+        self.hits = 0
+        self.misses = 0
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _key(self, request):
+        from rez.config import config
+        return hash_key(CONTEXT_CACHE_VERSION, " ".join(request), os.pathsep.join(config.packages_path),
+                        platform.system(), platform.machine())
+
+    @staticmethod
+    def _repo_state(families):
+        from rez.config import config
+
+        state = {}
+        for family in sorted(families):
+            mtimes = []
+            for repository in config.packages_path:
+                try:
+                    mtimes.append(os.stat(os.path.join(repository, family)).st_mtime_ns)
+                except OSError:
+                    mtimes.append(None)
+            state[family] = mtimes
+        return state
+
+    def _load_valid(self, key):
+        context_path = os.path.join(self.directory, key + ".rxt")
+        meta = read_json(os.path.join(self.directory, key + ".json"))
+        if not meta or not os.path.exists(context_path):
+            return None
+        if time.time() - meta["created"] > self.ttl:
+            return None
+        if self._repo_state(meta["state"]) != meta["state"]:
+            return None
+
+        from rez.resolved_context import ResolvedContext
+        context = ResolvedContext.load(context_path)
+        touch(context_path)
+        return context
+
+    def get_context(self, request):
+        """
+        Return a resolved context for a package request, from the cache when valid.
+
+        Args:
+            request (list): Package request strings.
+
+        Returns:
+            ResolvedContext: The resolved context.
+
+        Raises:
+            RuntimeError: If the request cannot be resolved.
+        """
+        request = list(request)
+        key = self._key(request)
+        with self._lock:
+            if key in self._loaded:
+                self.hits += 1
+                return self._loaded[key]
+
+        started = time.time()
+        context = self._load_valid(key)
+        if context is not None:
+            logger.info(f"Rez context cache hit for '{' '.join(request)}' (loaded in {time.time() - started:.2f}s)")
+            record_span("rez context load", started, category="launch", request=request)
+            return self._remember(key, context, hit=True)
+
+        with file_lock(os.path.join(self.directory, key + ".lock")):
+            # Another process may have resolved the request while we waited for the lock.
+            context = self._load_valid(key)
+            if context is not None:
+                logger.info(f"Rez context cache hit for '{' '.join(request)}' after waiting {time.time() - started:.2f}s")
+                return self._remember(key, context, hit=True)
+
+            from rez.resolved_context import ResolvedContext
+            context = ResolvedContext(request)
+            if not context.success:
+                raise RuntimeError(f"Failed to resolve '{' '.join(request)}': {context.failure_description}")
+
+            context_path = os.path.join(self.directory, key + ".rxt")
+            temp_path = f"{context_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            context.save(temp_path)
+            os.replace(temp_path, context_path)
+            atomic_write_json(os.path.join(self.directory, key + ".json"), {
+                "request": request,
+                "created": time.time(),
+                "state": self._repo_state(package.name for package in context.resolved_packages),
+            })
+            logger.info(f"Rez context cache miss for '{' '.join(request)}', resolved in {time.time() - started:.2f}s")
+            record_span("rez resolve", started, category="launch", request=request)
+
+        return self._remember(key, context, hit=False)
+
+    def _remember(self, key, context, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            # Keep the first context loaded for a key, so every thread runs the same one.
+            return self._loaded.setdefault(key, context)
+
+    def run_tool(self, tool, args) -> int:
+        """
+        Run a tool with arguments in the cached context of its package.
+
+        Args:
+            tool (str): Tool and package name, e.g. "nuke".
+            args (list): Tool arguments.
+
+        Returns:
+            int: The tool exit code.
+        """
+        context = self.get_context(get_tool_request(tool))
+        with span(f"{tool} process", "launch"):
+            process = context.execute_command([tool] + list(args))
+            return process.wait()
+
+    def clear(self) -> int:
+        """
+        Remove every cached context.
+
+        Returns:
+            int: Number of contexts removed.
+        """
+        with self._lock:
+            self._loaded.clear()
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith((".rxt", ".json")):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                removed += name.endswith(".rxt")
+        return removed
+
+    def log_stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        logger.info(f"Rez context cache: {hits} hits, {misses} misses ({self.directory})")
@@ -0,0 +1,139 @@
+import os
+import time
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, read_json, atomic_write_json, touch, evict_lru
+from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.sequence_utils import IMAGE_EXTENSIONS, Sequence, FrameSet, iter_sequences, match_sequence
+
+INDEX_VERSION = 1
+
+
+class SequenceIndexCache:
+    """
+    Persistent on-disk index of the sequences found in render directories.
+
+    Each scanned directory gets one JSON entry holding its sequences (as compact frame sets),
+    the directory mtime and its number of entries at scan time:
+    - unchanged mtime: the cached sequences are returned without listing the directory.
+    - changed mtime: frames appended after the last cached frame of each sequence are probed;
+      if they account for every new directory entry the entry is updated in place,
+      otherwise the directory is rescanned.
+    The cache directory is kept under max_bytes by evicting the least recently used entries.
+
+    Args:
+        cache_dir (str, optional): Cache root (see cache_utils.get_cache_root).
+        max_bytes (int): Size limit of the index on disk.
+        extensions (iterable): Image file extensions to index.
+    """
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    # Maximum number of appended frames probed one by one before falling back to a rescan.
+    PROBE_LIMIT = 256
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, extensions=IMAGE_EXTENSIONS):
+        self.directory = get_cache_dir("sequence_index", cache_dir)
+        self.max_bytes = max_bytes
+        self.extensions = tuple(extensions)
+        self.hits = 0
+        self.updates = 0
+        self.misses = 0
+
+    def _entry_path(self, directory):
+        return os.path.join(self.directory, hash_key(os.path.normcase(directory), *self.extensions) + ".json")
+
+    def get_sequences(self, directory):
+        """
+        Return the sequences of a directory, from the index when it is still valid.
+
+        Args:
+            directory (str): Directory to resolve.
+
+        Returns:
+            list: Sequence objects found in the directory.
+        """
+        directory = os.path.abspath(directory)
+        entry_path = self._entry_path(directory)
+        # Stat before scanning: a directory modified during the scan is seen as changed next time.
+        mtime_ns = os.stat(directory).st_mtime_ns
+
+        entry = read_json(entry_path)
+        if entry and entry.get("version") == INDEX_VERSION and entry.get("directory") == directory:
+            sequences = [Sequence.from_dict(directory, data) for data in entry["sequences"]]
+            if entry["mtime_ns"] == mtime_ns:
+                self.hits += 1
+                touch(entry_path)
+                return sequences
+
+            updated = self._append_new_frames(directory, sequences, entry["entries"])
+            if updated is not None:
+                self.updates += 1
+                sequences, entries = updated
+                self._store(entry_path, directory, mtime_ns, entries, sequences)
+                return sequences
+
+        self.misses += 1
+        stats = {}
+        sequences = list(iter_sequences(directory, self.extensions, stats))
+        self._store(entry_path, directory, mtime_ns, stats.get("entries", 0), sequences)
+        return sequences
+
+    def find_sequence(self, sequence_path):
+        """
+        Return the sequence a sequence path refers to, see sequence_utils.find_sequence.
+
+        Raises:
+            ValueError: If the directory does not exist or no sequence matches.
+        """
+        directory = os.path.dirname(sequence_path) or os.curdir
+        if not os.path.isdir(directory):
+            raise ValueError(f"Invalid sequence path: {sequence_path}. Directory does not exist.")
+        return match_sequence(sequence_path, self.get_sequences(directory))
+
+    def _append_new_frames(self, directory, sequences, cached_entries):
+        """
+        Probe frames following the last cached frame of each sequence.
+
+        Returns:
+            tuple: (sequences, entry count) if the appended frames explain every new
+            directory entry, None if the directory needs a full rescan.
+        """
+        updated = []
+        appended_total = 0
+        for sequence in sequences:
+            frame = sequence.last + 1
+            appended = 0
+            while os.path.isfile(sequence.frame_path(frame)):
+                appended += 1
+                if appended > self.PROBE_LIMIT:
+                    return None
+                frame += 1
+            if appended:
+                frames = sequence.frames.union(FrameSet([(sequence.last + 1, frame - 1)]))
+                sequence = Sequence(directory, sequence.prefix, sequence.padding, sequence.extension, frames)
+            appended_total += appended
+            updated.append(sequence)
+
+        if not appended_total:
+            return None
+        with os.scandir(directory) as entries:
+            entry_count = sum(1 for _ in entries)
+        if entry_count != cached_entries + appended_total:
+            return None
+        return updated, entry_count
+
+    def _store(self, entry_path, directory, mtime_ns, entries, sequences):
+        try:
+            atomic_write_json(entry_path, {
+                "version": INDEX_VERSION,
+                "directory": directory,
+                "mtime_ns": mtime_ns,
+                "entries": entries,
+                "scanned": time.time(),
+                "sequences": [sequence.to_dict() for sequence in sequences],
+            })
+            evict_lru(self.directory, max_bytes=self.max_bytes, suffix=".json")
+        except OSError as e:
+            logger.warning(f"Could not update sequence index cache {entry_path}: {e}")
+
+    def log_stats(self):
+        logger.info(f"Sequence index cache: {self.hits} hits, {self.updates} incremental updates, "
+                    f"{self.misses} misses ({self.directory})")
@@ -0,0 +1,411 @@
+import os
+import re
+from bisect import bisect_right
+
+IMAGE_EXTENSIONS = ("exr", "dpx", "jpg", "jpeg", "png", "tif", "tiff")
+
+# Matches "<prefix><frame>.<ext>", the frame being the digits right before the extension.
+# The prefix is non-greedy so "shot_v001.1001.exr" splits into "shot_v001." and "1001".
+FRAME_FILE_PATTERN = re.compile(r'^(?P<prefix>.*?)(?P<frame>\d+)\.(?P<ext>[A-Za-z0-9]+)$')
+
+# Matches "<prefix><padding token>.<ext>" for the padding styles used across the pipeline:
+# "####" / "@@@@" (Nuke), "%04d" (printf) and "$F4" (Houdini).
+PADDED_PATH_PATTERN = re.compile(r'^(?P<prefix>.*?)(?P<token>#+|@+|%0?\d*d|\$F\d*)\.(?P<ext>[A-Za-z0-9]+)$')
+
+# Matches a part of a frame set string: "1001", "1001-1050", "-5", "-10--5".
+FRAME_SET_PART_PATTERN = re.compile(r'^(?P<start>-?\d+)(?:-(?P<end>-?\d+))?$')
+
+# Frame spans above this size are collected in a set instead of a bitmap.
+_MAX_BITMAP_SPAN = 1 << 24
+
+
+class FrameSet:
+    """
+    Compact, immutable set of frame numbers stored as sorted inclusive (start, end) ranges.
+    A 100k frame sequence without gaps is stored as a single range.
+    """
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ranges=()):
+        starts, ends = [], []
+        for start, end in sorted((int(s), int(e)) for s, e in ranges):
+            if start > end:
+                raise ValueError(f"Invalid frame range: start ({start}) is greater than end ({end}).")
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = tuple(starts)
+        self._ends = tuple(ends)
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Build a FrameSet from an iterable of frame numbers, in any order."""
+        collector = _FrameCollector()
+        for frame in frames:
+            collector.add(frame)
+        return collector.to_frameset()
+
+    @classmethod
+    def from_string(cls, value):
+        """Parse a frame set string such as "1001-1050,1052,1054-1100" or "-10--5,0-2"."""
+        ranges = []
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            found = FRAME_SET_PART_PATTERN.match(part)
+            if found is None:
+                raise ValueError(f"Invalid frame set: {value}")
+            start = int(found.group("start"))
+            ranges.append((start, int(found.group("end")) if found.group("end") else start))
+        return cls(ranges)
+
+    @property
+    def ranges(self):
+        """Tuple of inclusive (start, end) ranges."""
+        return tuple(zip(self._starts, self._ends))
+
+    @property
+    def first(self):
+        return self._starts[0] if self._starts else None
+
+    @property
+    def last(self):
+        return self._ends[-1] if self._ends else None
+
+    @property
+    def frame_range(self) -> range:
+        """Range covering first to last frame, last frame included."""
+        if not self._starts:
+            return range(0)
+        return range(self.first, self.last + 1)
+
+    def has_gaps(self):
+        return len(self._starts) > 1
+
+    def missing(self):
+        """Return a FrameSet of the frames missing between first and last."""
+        return FrameSet((end + 1, start - 1) for end, start in zip(self._ends, self._starts[1:]))
+
+    def union(self, other):
+        return FrameSet(self.ranges + other.ranges)
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+
+    def __contains__(self, frame):
+        index = bisect_right(self._starts, frame) - 1
+        return index >= 0 and frame <= self._ends[index]
+
+    def __eq__(self, other):
+        return isinstance(other, FrameSet) and self.ranges == other.ranges
+
+    def __hash__(self):
+        return hash(self.ranges)
+
+    def __str__(self):
+        return ",".join(str(s) if s == e else f"{s}-{e}" for s, e in self.ranges)
+
+    def __repr__(self):
+        return f"FrameSet('{self}')"
+
+
+class _FrameCollector:
+    """
+    Accumulates frame numbers arriving in directory order (usually unsorted) without
+    keeping a list of them: frames are flagged in a bytearray spanning first to last frame.
+    """
+    __slots__ = ("base", "bits", "overflow")
+
+    def __init__(self):
+        self.base = None
+        self.bits = bytearray()
+        self.overflow = None
+
+    def add(self, frame):
+        if self.overflow is not None:
+            self.overflow.add(frame)
+            return
+        if self.base is None:
+            self.base = frame
+            self.bits = bytearray(b"\x01")
+            return
+
+        offset = frame - self.base
+        size = len(self.bits)
+        if offset < 0 or offset >= size:
+            low = min(self.base, frame)
+            high = max(self.base + size - 1, frame)
+            if high - low >= _MAX_BITMAP_SPAN:
+                self.overflow = set(self._iter_bitmap())
+                self.overflow.add(frame)
+                return
+            # Grow by at least the current size so unsorted input grows in amortised O(1).
+            if offset < 0:
+                grow = max(-offset, size)
+                self.bits[0:0] = bytes(grow)
+                self.base -= grow
+                offset += grow
+            else:
+                self.bits.extend(bytes(max(offset - size + 1, size)))
+        self.bits[offset] = 1
+
+    def update(self, frameset):
+        for start, end in frameset.ranges:
+            for frame in range(start, end + 1):
+                self.add(frame)
+
+    def _iter_ranges(self):
+        bits, base = self.bits, self.base
+        pos = bits.find(1)
+        while pos != -1:
+            end = bits.find(0, pos)
+            if end == -1:
+                end = len(bits)
+            yield base + pos, base + end - 1
+            pos = bits.find(1, end)
+
+    def _iter_bitmap(self):
+        for start, end in self._iter_ranges():
+            yield from range(start, end + 1)
+
+    def to_frameset(self):
+        if self.overflow is not None:
+            frames = sorted(self.overflow)
+            ranges = []
+            for frame in frames:
+                if ranges and ranges[-1][1] + 1 == frame:
+                    ranges[-1][1] = frame
+                else:
+                    ranges.append([frame, frame])
+            return FrameSet(ranges)
+        if self.base is None:
+            return FrameSet()
+        return FrameSet(self._iter_ranges())
+
+
+class Sequence:
+    """
+    A numbered image sequence in a single directory, e.g. "/renders/shot.####.exr".
+
+    Args:
+        directory (str): Directory containing the frames.
+        prefix (str): File name part before the frame number (e.g. "shot.").
+        padding (int): Minimum number of digits of the frame number.
+        extension (str): File extension without the dot (e.g. "exr").
+        frames (FrameSet): Frames present on disk.
+    """
+
+    def __init__(self, directory, prefix, padding, extension, frames):
+        self.directory = directory
+        self.prefix = prefix
+        self.padding = padding
+        self.extension = extension
+        self.frames = frames
+
+    @property
+    def key(self):
+        return (self.prefix, self.padding, self.extension)
+
+    @property
+    def pattern(self) -> str:
+        """Nuke style path of the sequence, e.g. "/renders/shot.####.exr"."""
+        return os.path.join(self.directory, f"{self.prefix}{'#' * self.padding}.{self.extension}")
+
+    @property
+    def printf_pattern(self) -> str:
+        """printf style path of the sequence, e.g. "/renders/shot.%04d.exr"."""
+        return os.path.join(self.directory, f"{self.prefix}%0{self.padding}d.{self.extension}")
+
+    @property
+    def first(self):
+        return self.frames.first
+
+    @property
+    def last(self):
+        return self.frames.last
+
+    @property
+    def frame_range(self) -> range:
+        return self.frames.frame_range
+
+    def frame_path(self, frame) -> str:
+        return os.path.join(self.directory, f"{self.prefix}{frame:0{self.padding}d}.{self.extension}")
+
+    def to_dict(self):
+        return {
+            "prefix": self.prefix,
+            "padding": self.padding,
+            "extension": self.extension,
+            "frames": str(self.frames),
+        }
+
+    @classmethod
+    def from_dict(cls, directory, data):
+        return cls(directory, data["prefix"], data["padding"], data["extension"], FrameSet.from_string(data["frames"]))
+
+    def __repr__(self):
+        return f"Sequence('{self.pattern}', '{self.frames}')"
+
+
+def iter_frame_files(directory, extensions=IMAGE_EXTENSIONS, stats=None):
+    """
+    Yield (prefix, frame_digits, extension) for every frame numbered image file in a directory.
+    Uses a single os.scandir pass; file types come from the directory listing itself,
+    so no per-file stat call is made on filesystems that report them (NFS, ext4, NTFS...).
+
+    Args:
+        directory (str): Directory to scan.
+        extensions (iterable): Image file extensions to accept, case insensitive.
+        stats (dict, optional): Receives the number of directory entries seen under "entries".
+    """
+    extensions = {ext.lower().lstrip(".") for ext in extensions}
+    match = FRAME_FILE_PATTERN.match
+    count = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                count += 1
+                found = match(entry.name)
+                if found is None or found.group("ext").lower() not in extensions:
+                    continue
+                if not entry.is_file():
+                    continue
+                yield found.group("prefix"), found.group("frame"), found.group("ext")
+    finally:
+        if stats is not None:
+            stats["entries"] = count
+
+
+def iter_sequences(directory, extensions=IMAGE_EXTENSIONS, stats=None):
+    """
+    Scan a directory and yield every image sequence found in it.
+    Files are grouped by prefix, frame padding and extension, so "shot.####.exr",
+    "shot.####.jpg" and "shot_matte.####.exr" in the same folder are separate sequences.
+    Frames are accumulated into compact frame sets while streaming the directory
+    listing, so memory depends on the number of sequences rather than files.
+
+    Args:
+        directory (str): Directory to scan.
+        extensions (iterable): Image file extensions to accept, case insensitive.
+        stats (dict, optional): Receives the number of directory entries seen under "entries".
+
+    Yields:
+        Sequence: Sequences ordered by prefix, extension and padding.
+    """
+    groups = {}
+    for prefix, digits, ext in iter_frame_files(directory, extensions, stats):
+        # A leading zero fixes the padding; frames without one ("1001") fit any padding up to their width.
+        padded = len(digits) > 1 and digits[0] == "0"
+        widths = groups.setdefault((prefix, ext), {})
+        collector = widths.get((padded, len(digits)))
+        if collector is None:
+            collector = widths[(padded, len(digits))] = _FrameCollector()
+        collector.add(int(digits))
+
+    for (prefix, ext), widths in sorted(groups.items()):
+        padded = {width: collector for (is_padded, width), collector in widths.items() if is_padded}
+        unpadded = {}
+        for (is_padded, width), collector in sorted(widths.items()):
+            if is_padded:
+                continue
+            fitting = [pad for pad in padded if pad <= width]
+            if fitting:
+                padded[max(fitting)].update(collector.to_frameset())
+            else:
+                unpadded[width] = collector
+
+        if unpadded:
+            padding = min(unpadded)
+            merged = unpadded.pop(padding)
+            for collector in unpadded.values():
+                merged.update(collector.to_frameset())
+            padded[padding] = merged
+
+        for padding in sorted(padded):
+            yield Sequence(directory, prefix, padding, ext, padded[padding].to_frameset())
+
+
+def parse_sequence_path(sequence_path):
+    """
+    Split a sequence path into its parts.
+    Accepts padded patterns ("shot.####.exr", "shot.%04d.exr", "shot.$F4.exr")
+    and paths to a single frame ("shot.1001.exr").
+
+    Returns:
+        tuple: (directory, prefix, padding, extension), or None if the path has no frame number.
+    """
+    directory, file_name = os.path.split(sequence_path)
+    found = PADDED_PATH_PATTERN.match(file_name)
+    if found:
+        token = found.group("token")
+        if token[0] in "#@":
+            padding = len(token)
+        else:
+            digits = re.sub(r"\D", "", token)
+            padding = int(digits) if digits else 1
+        return directory, found.group("prefix"), padding, found.group("ext")
+
+    found = FRAME_FILE_PATTERN.match(file_name)
+    if found:
+        return directory, found.group("prefix"), len(found.group("frame")), found.group("ext")
+    return None
+
+
+def match_sequence(sequence_path, sequences):
+    """
+    Pick the sequence matching a sequence path from already scanned sequences.
+
+    Args:
+        sequence_path (str): Sequence pattern or frame path (see parse_sequence_path).
+        sequences (iterable): Sequence objects, e.g. from iter_sequences.
+
+    Returns:
+        Sequence: The matching sequence.
+
+    Raises:
+        ValueError: If the path has no frame number or no single sequence matches it.
+    """
+    parsed = parse_sequence_path(sequence_path)
+    if parsed is None:
+        raise ValueError(f"No frame number or padding found in sequence path: {sequence_path}")
+    _directory, prefix, padding, ext = parsed
+
+    candidates = [seq for seq in sequences if seq.prefix == prefix and seq.extension.lower() == ext.lower()]
+    exact = [seq for seq in candidates if seq.padding == padding]
+    if exact:
+        return exact[0]
+    if len(candidates) == 1:
+        return candidates[0]
+    if not candidates:
+        raise ValueError(f"No image sequence matching {sequence_path} found.")
+    raise ValueError(f"Several sequences match {sequence_path}: {', '.join(seq.pattern for seq in candidates)}")
+
+
+def find_sequence(sequence_path, extensions=IMAGE_EXTENSIONS):
+    """
+    Scan the directory of a sequence path and return the sequence it refers to.
+
+    Args:
+        sequence_path (str): Sequence pattern or frame path, e.g. "/renders/shot.####.exr".
+        extensions (iterable): Image file extensions to accept.
+
+    Returns:
+        Sequence: The matching sequence with the frames present on disk.
+
+    Raises:
+        ValueError: If the directory does not exist or no sequence matches.
+    """
+    directory = os.path.dirname(sequence_path) or os.curdir
+    if not os.path.isdir(directory):
+        raise ValueError(f"Invalid sequence path: {sequence_path}. Directory does not exist.")
+    return match_sequence(sequence_path, iter_sequences(directory, extensions))
@@ -0,0 +1,110 @@
+import os
+import json
+import uuid
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, touch, evict_lru
+
+SLATE_CACHE_VERSION = 1
+# Directory of the slate cache, e.g. on a network share used by every render host.
+SLATE_CACHE_DIR_ENV = "MVL_MAKE_DAILIES_SLATE_CACHE_DIR"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# Stills used this recently are never evicted, another host may be about to read them.
+MIN_EVICT_AGE = 15 * 60
+
+
+def get_slate_cache_dir(slate_cache_dir=None, cache_dir=None) -> str:
+    """
+    Get (and create) the slate cache directory.
+
+    Args:
+        slate_cache_dir (str, optional): Explicit directory, e.g. from --slate-cache-dir.
+        cache_dir (str, optional): Cache root used when no slate cache directory is configured.
+
+    Returns:
+        str: The slate cache directory.
+    """
+    directory = slate_cache_dir or os.environ.get(SLATE_CACHE_DIR_ENV)
+    if not directory:
+        return get_cache_dir("slate_frames", cache_dir)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def file_fingerprint(path):
+    """Return (size, mtime) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class SlateCache:
+    """
+    Cache of rendered slate frames, stored as <key>.exr stills in a directory that may be
+    shared between hosts.
+
+    A still is keyed by the slate knob values, the format and colorspace settings, the template
+    and the thumbnail frame it shows. Stills are published with an atomic rename, so a reader on
+    any host sees either the complete file or none, and are evicted least recently used first.
+
+    Args:
+        directory (str): Slate cache directory, see get_slate_cache_dir.
+        max_bytes (int): Maximum total size of the cached stills.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def get_key(slate_data, reformat_data, colorspace_data, root_format, template_hash, thumbnail) -> str:
+        """
+        Build the cache key of a slate frame.
+
+        Args:
+            slate_data (dict): Slate knob values, frame range included.
+            reformat_data (dict): Reformat knob values.
+            colorspace_data (dict): Colorspace knob values.
+            root_format (str): Format of the script.
+            template_hash (str): Hash of the Nuke template.
+            thumbnail (list): Fingerprint of the source frame shown on the slate, see file_fingerprint.
+
+        Returns:
+            str: The cache key.
+        """
+        payload = json.dumps([slate_data, reformat_data, colorspace_data, root_format, thumbnail], sort_keys=True, default=str)
+        return hash_key(SLATE_CACHE_VERSION, template_hash, payload)
+
+    def get_path(self, key) -> str:
+        return os.path.join(self.directory, f"{key}.exr")
+
+    def get_temp_path(self, key) -> str:
+        """Path to render a still to before it is published with store()."""
+        return os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp.exr")
+
+    def lookup(self, key):
+        """
+        Return the cached still for a key, or None on a miss.
+        """
+        path = self.get_path(key)
+        if os.path.isfile(path):
+            touch(path)
+            return path
+        return None
+
+    def store(self, temp_path, key) -> str:
+        """
+        Publish a rendered still under its key and evict old stills.
+
+        Args:
+            temp_path (str): Rendered still, see get_temp_path.
+            key (str): The cache key.
+
+        Returns:
+            str: Path of the cached still.
+        """
+        path = self.get_path(key)
+        os.replace(temp_path, path)
+        evict_lru(self.directory, max_bytes=self.max_bytes, suffix=".exr", min_age=MIN_EVICT_AGE)
+        return path
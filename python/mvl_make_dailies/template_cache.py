@@ -0,0 +1,89 @@
+import os
+import json
+import hashlib
+
+from mvl_make_dailies.cache_utils import get_cache_dir, hash_key, touch, evict_lru
+from mvl_make_dailies.knob_schema import NODE_NAMES
+
+# Bump when the way variants are baked changes, so variants baked by older versions are not reused.
+BAKE_VERSION = 1
+MAX_BAKED_TEMPLATES = 64
+
+_file_hashes = {}
+
+
+def hash_file(path) -> str:
+    """
+    Return the sha1 of a file's content, memoized per process on the file size and mtime.
+    """
+    stat = os.stat(path)
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
+
+
+def get_show_payload(node_payloads, schema) -> dict:
+    """
+    Extract the show-level knob values (knobs marked "scope: show") from the job payloads.
+
+    Args:
+        node_payloads (dict): Knob values per template node, as in a Nuke job payload.
+        schema (KnobSchema): The compiled knob schema.
+
+    Returns:
+        dict: Show-level knob values per template node.
+    """
+    return {
+        name: {k: v for k, v in (node_payloads.get(name) or {}).items()
+               if k in schema.nodes[name].show_keys and v is not None}
+        for name in NODE_NAMES
+    }
+
+
+class TemplateCache:
+    """
+    Cache of baked Nuke template variants, stored as <key>.nk under <cache dir>/baked_templates.
+
+    A baked variant is the dailies template with the show-level knob values already applied.
+    It is keyed by the content of the source template, the knobs_template.yaml it was baked
+    with, the show-level values and BAKE_VERSION, so editing the template or the knob config
+    bakes new variants automatically. The least recently used variants are evicted.
+
+    Args:
+        cache_dir (str, optional): Cache root (see cache_utils.get_cache_root).
+        max_entries (int): Maximum number of baked variants kept.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=MAX_BAKED_TEMPLATES):
+        self.directory = get_cache_dir("baked_templates", cache_dir)
+        self.max_entries = max_entries
+
+    def get_path(self, template_path, schema, show_payload) -> str:
+        key = hash_key(BAKE_VERSION, hash_file(template_path), schema.source_hash,
+                       json.dumps(show_payload, sort_keys=True))
+        return os.path.join(self.directory, f"{key}.nk")
+
+    def lookup(self, template_path, schema, show_payload) -> tuple:
+        """
+        Find the baked variant of a template for the given show-level values.
+
+        Args:
+            template_path (str): Source Nuke template.
+            schema (KnobSchema): The compiled knob schema.
+            show_payload (dict): Show-level knob values, see get_show_payload.
+
+        Returns:
+            tuple: (path of the baked variant, whether it is already baked)
+        """
+        baked_path = self.get_path(template_path, schema, show_payload)
+        if os.path.isfile(baked_path):
+            touch(baked_path)
+            return baked_path, True
+        # Make room for the variant about to be baked.
+        evict_lru(self.directory, max_entries=max(self.max_entries - 1, 0), suffix=".nk")
+        return baked_path, False
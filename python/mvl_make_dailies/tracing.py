@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import threading
+import functools
+from contextlib import contextmanager
+
+# Trace file of the current make_movie run. Set by start_trace and inherited by the DCC
+# processes it launches, which add their events to the same trace.
+TRACE_ENV = "MVL_MAKE_DAILIES_TRACE"
+# Seconds between two CPU and RSS samples of a traced process.
+SAMPLE_INTERVAL = 0.5
+# Buffered events written to the process part file at once.
+FLUSH_EVENTS = 5000
+DEFAULT_CATEGORY = "dailies"
+
+_tracer = None
+
+
+def _now_us() -> float:
+    # Wall clock, so the events of every process of the run share one time base.
+    return time.time() * 1e6
+
+
+def _thread_id() -> int:
+    return getattr(threading, "get_native_id", threading.get_ident)()
+
+
+def get_parts_dir(trace_path) -> str:
+    """Directory where each traced process writes its events before they are merged."""
+    return f"{trace_path}.parts"
+
+
+def read_rss() -> int:
+    """Resident set size of this process in bytes, 0 when unknown."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak RSS, in kB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def _process_start_time():
+    """Wall clock time this process started at (Linux only), or None."""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            # The command name may hold spaces, fields are counted after its closing parenthesis.
+            start_ticks = int(f.read().rsplit(b")", 1)[1].split()[19])
+        # The boot time of /proc/stat is in whole seconds, the uptime is in hundredths.
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Tracer:
+    """
+    Collect the Chrome trace events of one process: spans, instants and CPU/RSS counters.
+    Events are appended to a part file of the trace, one JSON event per line; the process that
+    started the trace merges every part into the trace file when it exits.
+
+    Args:
+        trace_path (str): Trace file of the run.
+        process_name (str): Name the process is shown under, e.g. "make_movie" or "nuke".
+    """
+
+    def __init__(self, trace_path, process_name):
+        import socket
+
+        self.trace_path = trace_path
+        self.pid = os.getpid()
+        self.part_path = os.path.join(get_parts_dir(trace_path), f"{socket.gethostname()}.{self.pid}.jsonl")
+        self._events = []
+        self._lock = threading.Lock()
+        self._open_frames = {}
+        self._stop = threading.Event()
+        self._sampler = None
+        self._last_cpu = None
+        self.emit({"ph": "M", "name": "process_name", "args": {"name": f"{process_name} ({self.pid})"}})
+
+    def emit(self, event):
+        event.setdefault("pid", self.pid)
+        event.setdefault("tid", _thread_id())
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) < FLUSH_EVENTS:
+                return
+            events, self._events = self._events, []
+        self._write(events)
+
+    def complete(self, name, start_us, end_us, category=DEFAULT_CATEGORY, args=None):
+        self.emit({"ph": "X", "name": name, "cat": category, "ts": start_us,
+                   "dur": max(0.0, end_us - start_us), "args": args or {}})
+
+    def instant(self, name, category=DEFAULT_CATEGORY, args=None):
+        self.emit({"ph": "i", "s": "p", "name": name, "cat": category, "ts": _now_us(), "args": args or {}})
+
+    def counter(self, name, values):
+        self.emit({"ph": "C", "name": name, "ts": _now_us(), "args": values, "tid": 0})
+
+    def begin_frame(self, frame, key="", **args):
+        """Start timing a frame, ending the previous frame of the same key if still open."""
+        self.end_frame(key)
+        self._open_frames[key] = (frame, _now_us(), args)
+
+    def end_frame(self, key=""):
+        opened = self._open_frames.pop(key, None)
+        if opened is not None:
+            frame, start_us, args = opened
+            self.complete(f"frame {frame}", start_us, _now_us(), "frame", dict(args, frame=frame))
+
+    def sample(self):
+        """Record the CPU usage (percent of one core) since the last sample and the RSS."""
+        times = os.times()
+        cpu, wall = times[0] + times[1], time.time()
+        values = {"rss_mb": round(read_rss() / 1048576.0, 1)}
+        if self._last_cpu is not None and wall > self._last_cpu[1]:
+            values["cpu_percent"] = round(100.0 * (cpu - self._last_cpu[0]) / (wall - self._last_cpu[1]), 1)
+        self._last_cpu = (cpu, wall)
+        self.counter("process", values)
+
+    def _sample_loop(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def start_sampling(self):
+        self.sample()
+        self._sampler = threading.Thread(target=self._sample_loop, name="trace-sampler", daemon=True)
+        self._sampler.start()
+
+    def _write(self, events):
+        os.makedirs(os.path.dirname(self.part_path), exist_ok=True)
+        with open(self.part_path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+    def close(self):
+        """Stop sampling, end the open frames and write the remaining events."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(SAMPLE_INTERVAL * 2)
+        for key in list(self._open_frames):
+            self.end_frame(key)
+        self.sample()
+        with self._lock:
+            events, self._events = self._events, []
+        try:
+            self._write(events)
+        except OSError:
+            pass
+
+
+def merge_trace(trace_path) -> int:
+    """
+    Merge the part files of every traced process into the Chrome trace-event file and remove them.
+
+    Returns:
+        int: Number of events written.
+    """
+    parts_dir = get_parts_dir(trace_path)
+    events = []
+    if os.path.isdir(parts_dir):
+        for name in sorted(os.listdir(parts_dir)):
+            with open(os.path.join(parts_dir, name), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # Last line of a process killed while writing.
+                        continue
+    events.sort(key=lambda event: event.get("ts", 0))
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    return len(events)
+
+
+def get_tracer():
+    return _tracer
+
+
+def start_trace(trace_path, process_name="make_movie"):
+    """
+    Start tracing this run into a Chrome trace-event file (chrome://tracing, ui.perfetto.dev).
+    DCC processes launched from here inherit the trace through $MVL_MAKE_DAILIES_TRACE; the
+    trace file is written when this process exits.
+
+    Args:
+        trace_path (str): Trace file to write.
+        process_name (str): Name this process is shown under.
+
+    Returns:
+        Tracer: The tracer of this process.
+    """
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    trace_path = os.path.abspath(trace_path)
+    shutil.rmtree(get_parts_dir(trace_path), ignore_errors=True)
+    os.environ[TRACE_ENV] = trace_path
+    _tracer = Tracer(trace_path, process_name)
+    _tracer.start_sampling()
+
+    def finish():
+        _tracer.close()
+        count = merge_trace(trace_path)
+        print(f"Trace of {count} events written to {trace_path}", file=sys.stderr)
+
+    atexit.register(finish)
+    return _tracer
+
+
+def init_trace(process_name):
+    """
+    Join the trace of the make_movie run that launched this process, when there is one.
+    The process startup, from its creation to this call, is recorded as a span.
+
+    Args:
+        process_name (str): Name this process is shown under, e.g. "nuke".
+
+    Returns:
+        Tracer: The tracer of this process, or None when the run is not traced.
+    """
+    global _tracer
+    trace_path = os.environ.get(TRACE_ENV)
+    if _tracer is not None or not trace_path:
+        return _tracer
+    _tracer = Tracer(trace_path, process_name)
+    started = _process_start_time()
+    if started is not None:
+        _tracer.complete(f"{process_name} startup", started * 1e6, _now_us(), "startup")
+    _tracer.start_sampling()
+    atexit.register(_tracer.close)
+    return _tracer
+
+
+@contextmanager
+def span(name, category=DEFAULT_CATEGORY, **args):
+    """Record the duration of the block as a span; does nothing when the run is not traced."""
+    if _tracer is None:
+        yield
+        return
+    start_us = _now_us()
+    try:
+        yield
+    finally:
+        _tracer.complete(name, start_us, _now_us(), category, args)
+
+
+def record_span(name, started, ended=None, category=DEFAULT_CATEGORY, **args):
+    """Record a span from wall clock times in seconds, for durations the caller already measures."""
+    if _tracer is not None:
+        _tracer.complete(name, started * 1e6, (ended or time.time()) * 1e6, category, args)
+
+
+def traced(name=None, category=DEFAULT_CATEGORY):
+    """Decorator recording every call of a function as a span, see span."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instant(name, category=DEFAULT_CATEGORY, **args):
+    if _tracer is not None:
+        _tracer.instant(name, category, args)
+
+
+def begin_frame(frame, key="", **args):
+    """Start timing the render of a frame, see Tracer.begin_frame."""
+    if _tracer is not None:
+        _tracer.begin_frame(frame, key, **args)
+
+
+def end_frame(key=""):
+    if _tracer is not None:
+        _tracer.end_frame(key)
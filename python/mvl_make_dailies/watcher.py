@@ -0,0 +1,377 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from concurrent.futures import ThreadPoolExecutor
+
+from mvl_make_dailies.common_utils import logger
+from mvl_make_dailies.sequence_utils import IMAGE_EXTENSIONS, FRAME_FILE_PATTERN, iter_sequences
+
+DEFAULT_SETTLE = 30.0
+DEFAULT_POLL_INTERVAL = 10.0
+DEFAULT_MAX_JOBS = 2
+DEFAULT_OUTPUT_TEMPLATE = os.path.join("{directory}", "dailies", "{name}.mov")
+
+# inotify(7) event masks.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+# Fixed size read buffer, memory use does not grow with the number of events.
+_EVENT_BUFFER_SIZE = 64 * 1024
+
+
+def sequence_key(prefix, extension) -> tuple:
+    """Key identifying a sequence within a directory, independent of its frame padding."""
+    return prefix, extension.lower()
+
+
+def frame_file_key(file_name, extensions=IMAGE_EXTENSIONS):
+    """Return the sequence key of a frame file name, or None if it is not a frame of an image sequence."""
+    found = FRAME_FILE_PATTERN.match(file_name)
+    if not found or found.group("ext").lower() not in extensions:
+        return None
+    return sequence_key(found.group("prefix"), found.group("ext"))
+
+
+def iter_subdirectories(directory):
+    """Yield the visible subdirectories of a directory. Hidden ones hold our own segments."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False):
+                        yield entry.path
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+
+def walk_directories(root):
+    """Yield root and every visible directory below it, one scandir per directory."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        yield directory
+        stack.extend(iter_subdirectories(directory))
+
+
+def scan_sequence_keys(directory) -> dict:
+    """Map the sequence keys of a directory to a signature of their frames."""
+    try:
+        return {sequence_key(seq.prefix, seq.extension): f"{seq.padding}:{seq.frames}" for seq in iter_sequences(directory)}
+    except OSError:
+        return {}
+
+
+class InotifyWatcher:
+    """
+    Report frame files written under render roots, using Linux inotify through ctypes.
+    There is one watch per directory and no per-file state.
+
+    Args:
+        roots (list): Directories to watch recursively.
+
+    Raises:
+        OSError: If inotify is not available or the watch limit is reached.
+    """
+
+    def __init__(self, roots):
+        library = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories = {}
+        for root in roots:
+            for directory in walk_directories(root):
+                self._add_watch(directory)
+        logger.info(f"Watching {len(self._directories)} directories with inotify")
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOENT:
+                return
+            raise OSError(error, f"inotify_add_watch failed for {directory}: {os.strerror(error)}")
+        self._directories[wd] = directory
+
+    def _watch_new_tree(self, directory, changes):
+        # Frames may land before the watch exists, report everything already there.
+        for new_directory in walk_directories(directory):
+            self._add_watch(new_directory)
+            keys = set(scan_sequence_keys(new_directory))
+            if keys:
+                changes.setdefault(new_directory, set()).update(keys)
+
+    def read_changes(self, timeout) -> dict:
+        """
+        Wait up to timeout seconds for file events.
+
+        Returns:
+            dict: Directory to the set of sequence keys written in it.
+        """
+        changes = {}
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return changes
+        try:
+            data = os.read(self._fd, _EVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return changes
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0"))
+            offset += _EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify event queue overflowed, some frames may be picked up late")
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith("."):
+                    self._watch_new_tree(os.path.join(directory, name), changes)
+                continue
+            key = frame_file_key(name)
+            if key is not None and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changes.setdefault(directory, set()).add(key)
+        return changes
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    Report changed sequences under render roots by polling directory modification times.
+    Each poll costs one stat per directory; a directory is only listed when its mtime changed.
+    Used where inotify is not available (other platforms, watch limit reached).
+
+    Args:
+        roots (list): Directories to watch recursively.
+        interval (float): Seconds between polls.
+    """
+
+    def __init__(self, roots, interval=DEFAULT_POLL_INTERVAL):
+        self.roots = list(roots)
+        self.interval = interval
+        self._state = {}
+        self._next_poll = time.time() + interval
+        for root in self.roots:
+            for directory in walk_directories(root):
+                self._state[directory] = (self._mtime(directory), scan_sequence_keys(directory))
+        logger.info(f"Polling {len(self._state)} directories every {interval}s")
+
+    @staticmethod
+    def _mtime(directory):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def read_changes(self, timeout) -> dict:
+        """
+        Wait up to timeout seconds, polling when the interval elapsed.
+
+        Returns:
+            dict: Directory to the set of sequence keys that changed in it.
+        """
+        wait = min(max(timeout, 0), max(self._next_poll - time.time(), 0))
+        time.sleep(wait)
+        if time.time() < self._next_poll:
+            return {}
+        self._next_poll = time.time() + self.interval
+
+        changes = {}
+        for directory, (mtime, signatures) in list(self._state.items()):
+            current_mtime = self._mtime(directory)
+            if current_mtime is None:
+                del self._state[directory]
+                continue
+            # Frames overwritten in place do not change the directory mtime of every filesystem,
+            # but new frames always do.
+            if current_mtime == mtime:
+                continue
+            current = scan_sequence_keys(directory)
+            changed = {key for key, signature in current.items() if signatures.get(key) != signature}
+            if changed:
+                changes[directory] = changed
+            self._state[directory] = (current_mtime, current)
+
+            for subdirectory in iter_subdirectories(directory):
+                if subdirectory not in self._state:
+                    for new_directory in walk_directories(subdirectory):
+                        keys = scan_sequence_keys(new_directory)
+                        self._state[new_directory] = (self._mtime(new_directory), keys)
+                        if keys:
+                            changes.setdefault(new_directory, set()).update(keys)
+        return changes
+
+    def close(self):
+        self._state.clear()
+
+
+def create_watcher(roots, poll_interval=DEFAULT_POLL_INTERVAL, force_polling=False):
+    """
+    Create the best watcher for this platform: inotify on Linux, polling otherwise or when
+    inotify cannot watch every directory.
+    """
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except OSError as e:
+            logger.warning(f"inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(roots, poll_interval)
+
+
+def get_output_path(output_template, sequence) -> str:
+    """
+    Build the movie path of a sequence from an output template.
+    Fields: {directory} of the frames, {parent} directory name, {name} of the sequence
+    (prefix without trailing separators) and {extension} of the frames.
+    """
+    name = sequence.prefix.rstrip("._-") or os.path.basename(sequence.directory)
+    return os.path.normpath(output_template.format(
+        directory=sequence.directory,
+        parent=os.path.basename(sequence.directory),
+        name=name,
+        extension=sequence.extension,
+    ))
+
+
+class DailiesWatcher:
+    """
+    Dispatch a daily for every sequence written under the render roots.
+    File events are debounced per directory: a daily is dispatched once no frame of the
+    directory was written for `settle` seconds. Dailies run on a bounded pool of workers and
+    a sequence still rendering its previous daily is dispatched again once that one finished.
+
+    Args:
+        watcher: InotifyWatcher or PollingWatcher.
+        dispatch (callable): Called with (input sequence pattern, output movie path) per daily.
+        output_template (str): Movie path template, see get_output_path.
+        settle (float): Seconds without new frames before a sequence is considered complete.
+        max_jobs (int): Maximum number of dailies rendering at once.
+    """
+
+    def __init__(self, watcher, dispatch, output_template=DEFAULT_OUTPUT_TEMPLATE, settle=DEFAULT_SETTLE,
+                 max_jobs=DEFAULT_MAX_JOBS):
+        self.watcher = watcher
+        self.dispatch = dispatch
+        self.output_template = output_template
+        self.settle = settle
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs)
+        self._pending = {}
+        self._running = {}
+        self.dispatched = 0
+        self.failed = 0
+
+    def _add_changes(self, changes):
+        deadline = time.time() + self.settle
+        for directory, keys in changes.items():
+            _, pending_keys = self._pending.get(directory, (None, set()))
+            self._pending[directory] = (deadline, pending_keys | keys)
+
+    def _run(self, input_path, output_path):
+        try:
+            self.dispatch(input_path, output_path)
+        except (Exception, SystemExit) as e:
+            self.failed += 1
+            logger.error(f"Daily of {input_path} failed: {e}")
+
+    def _fire(self, directory, keys):
+        try:
+            sequences = [seq for seq in iter_sequences(directory) if sequence_key(seq.prefix, seq.extension) in keys]
+        except OSError as e:
+            logger.warning(f"Could not scan {directory}: {e}")
+            return
+        for sequence in sequences:
+            output_path = get_output_path(self.output_template, sequence)
+            running = self._running.get(output_path)
+            if running is not None and not running.done():
+                # Render it again with the new frames once the current daily is done.
+                self._add_changes({directory: {sequence_key(sequence.prefix, sequence.extension)}})
+                continue
+            logger.info(f"Sequence {sequence.pattern} ({sequence.frames}) settled, dispatching daily {output_path}")
+            self._running[output_path] = self._pool.submit(self._run, sequence.pattern, output_path)
+            self.dispatched += 1
+
+    def run(self, duration=None):
+        """
+        Watch and dispatch until interrupted, or for duration seconds.
+        """
+        stop_at = time.time() + duration if duration else None
+        try:
+            while stop_at is None or time.time() < stop_at:
+                now = time.time()
+                next_deadline = min((deadline for deadline, _ in self._pending.values()), default=now + 60)
+                if stop_at is not None:
+                    next_deadline = min(next_deadline, stop_at)
+                self._add_changes(self.watcher.read_changes(next_deadline - now))
+
+                now = time.time()
+                for directory, (deadline, keys) in list(self._pending.items()):
+                    if deadline <= now:
+                        del self._pending[directory]
+                        self._fire(directory, keys)
+                self._running = {path: future for path, future in self._running.items() if not future.done()}
+        except KeyboardInterrupt:
+            logger.info("Stopping the watcher, waiting for running dailies")
+        finally:
+            self.watcher.close()
+            self._pool.shutdown(wait=True)
+            logger.info(f"Watcher stopped: {self.dispatched} dailies dispatched, {self.failed} failed")
+
+
+def watch_roots(roots, dispatch, output_template=None, settle=None, max_jobs=None, poll_interval=None,
+                force_polling=False):
+    """
+    Watch render roots and dispatch a daily of every sequence once its frames stopped landing.
+    Runs until interrupted.
+
+    Args:
+        roots (list): Render roots, watched recursively.
+        dispatch (callable): Called with (input sequence pattern, output movie path) per daily.
+        output_template (str, optional): Movie path template, see get_output_path.
+        settle (float, optional): Seconds without new frames before a sequence is rendered.
+        max_jobs (int, optional): Maximum number of dailies rendering at once.
+        poll_interval (float, optional): Seconds between scans when inotify is not available.
+        force_polling (bool): Scan directories instead of using inotify.
+
+    Raises:
+        FileNotFoundError: If a render root does not exist.
+    """
+    roots = [os.path.abspath(root) for root in roots]
+    missing = [root for root in roots if not os.path.isdir(root)]
+    if missing:
+        raise FileNotFoundError(f"Render roots not found: {', '.join(missing)}")
+
+    watcher = create_watcher(roots, poll_interval or DEFAULT_POLL_INTERVAL, force_polling=force_polling)
+    DailiesWatcher(
+        watcher,
+        dispatch,
+        output_template=output_template or DEFAULT_OUTPUT_TEMPLATE,
+        settle=DEFAULT_SETTLE if settle is None else settle,
+        max_jobs=max_jobs or DEFAULT_MAX_JOBS,
+    ).run()
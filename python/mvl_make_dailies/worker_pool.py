@@ -0,0 +1,447 @@
+import os
+import re
+import json
+import time
+import queue
+import select
+import socket
+import threading
+
+from mvl_make_dailies.cache_utils import get_cache_dir
+from mvl_make_dailies.common_utils import logger
+
+# Address of the worker pool: a Unix socket path, or "host:port" on the local host.
+POOL_SOCKET_ENV = "MVL_MAKE_DAILIES_POOL_SOCKET"
+DEFAULT_WORKERS = 2
+# Jobs a worker renders before it is replaced by a fresh Nuke process.
+DEFAULT_MAX_WORKER_JOBS = 50
+# Workers exiting sooner than this are relaunched after a delay, doubled up to MAX_RELAUNCH_DELAY.
+MIN_WORKER_LIFETIME = 30.0
+RELAUNCH_DELAY = 5.0
+MAX_RELAUNCH_DELAY = 300.0
+POLL_INTERVAL = 1.0
+# Seconds a job waits for a free worker before its client is told to launch Nuke itself.
+DEFAULT_JOB_WAIT = 30.0
+
+TCP_ADDRESS = re.compile(r'^(?P<host>[\w.-]+):(?P<port>\d+)$')
+
+
+class PoolError(RuntimeError):
+    """Raised when the worker pool went away while it had a job."""
+
+
+def get_pool_address(address=None, cache_dir=None) -> str:
+    """
+    Get the address of the worker pool: address, $MVL_MAKE_DAILIES_POOL_SOCKET or
+    <cache root>/serve/nuke.sock. Where Unix sockets are not available, the pool listens on
+    a localhost port and writes "127.0.0.1:<port>" to that file instead.
+    """
+    return address or os.environ.get(POOL_SOCKET_ENV) or os.path.join(get_cache_dir("serve", cache_dir), "nuke.sock")
+
+
+def _resolve(address):
+    """Return the (family, socket address) to connect to for a pool address."""
+    if os.path.isfile(address):
+        with open(address, "r", encoding="utf-8") as f:
+            address = f.read().strip()
+    match = TCP_ADDRESS.match(address)
+    if match:
+        return socket.AF_INET, (match.group("host"), int(match.group("port")))
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError(f"Unix sockets are not available, use a host:port pool address instead of {address}")
+    return socket.AF_UNIX, address
+
+
+def connect(address, timeout=None) -> socket.socket:
+    """
+    Connect to a worker pool.
+
+    Raises:
+        OSError: If no pool is listening on the address.
+    """
+    family, target = _resolve(address)
+    conn = socket.socket(family, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    try:
+        conn.connect(target)
+    except OSError:
+        conn.close()
+        raise
+    conn.settimeout(None)
+    return conn
+
+
+def create_listener(address):
+    """
+    Listen on a pool address. A stale socket file of a pool that died is replaced.
+
+    Returns:
+        tuple: (listening socket, address the workers and clients connect to)
+    """
+    match = TCP_ADDRESS.match(address)
+    if match or not hasattr(socket, "AF_UNIX"):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind((match.group("host"), int(match.group("port"))) if match else ("127.0.0.1", 0))
+        host, port = listener.getsockname()[:2]
+        bound = f"{host}:{port}"
+        if not match:
+            # Local stand-in for the Unix socket: the file names the port clients connect to.
+            with open(address, "w", encoding="utf-8") as f:
+                f.write(bound)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(address)
+        os.chmod(address, 0o600)
+        bound = address
+    listener.listen(64)
+    listener.settimeout(POLL_INTERVAL)
+    return listener, bound
+
+
+def send_message(stream, message):
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def read_message(stream):
+    """Read a message, or None once the other end closed the connection."""
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
+
+
+def request(address, message):
+    """
+    Send one message to the worker pool and wait for its reply.
+
+    Returns:
+        dict: The reply, or None when no pool is listening on the address.
+
+    Raises:
+        PoolError: If the pool closed the connection before replying.
+    """
+    try:
+        conn = connect(address, timeout=POLL_INTERVAL * 5)
+    except OSError:
+        return None
+    try:
+        with conn, conn.makefile("rwb") as stream:
+            send_message(stream, message)
+            reply = read_message(stream)
+    except (OSError, ValueError) as e:
+        raise PoolError(f"Lost the worker pool on {address}: {e}")
+    if reply is None:
+        raise PoolError(f"The worker pool on {address} closed the connection")
+    return reply
+
+
+def submit_job(address, job, wait=DEFAULT_JOB_WAIT):
+    """
+    Render a Nuke job payload (see movie_commands.build_nuke_job) in a worker of the pool.
+    Blocks until a worker rendered it.
+
+    Args:
+        address (str): Pool address.
+        job (dict): Job payload.
+        wait (float): Seconds the job waits for a free worker. Once a worker took it, the job
+            is waited for until it is rendered.
+
+    Returns:
+        dict: The result (status, error, worker pid, seconds), or None when no pool is running,
+        it is shutting down or no worker was free within wait seconds.
+
+    Raises:
+        PoolError: If the pool went away during the job.
+    """
+    reply = request(address, {"type": "job", "job": job, "wait": wait})
+    if reply is None or reply.get("status") == "unavailable":
+        return None
+    return reply
+
+
+def _is_closed(conn) -> bool:
+    """Whether the other end of an idle connection closed it."""
+    try:
+        readable, _, _ = select.select([conn], [], [], 0)
+        return bool(readable) and not conn.recv(1, socket.MSG_PEEK)
+    except (OSError, ValueError):
+        return True
+
+
+class PendingJob:
+    def __init__(self, job):
+        self.job = job
+        self.result = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._state = None
+
+    def claim(self) -> bool:
+        """Take the job for a worker, unless its client withdrew it."""
+        with self._lock:
+            if self._state == "withdrawn":
+                return False
+            self._state = "claimed"
+            return True
+
+    def release(self):
+        """Give back a claimed job that never reached its worker."""
+        with self._lock:
+            self._state = None
+
+    def withdraw(self) -> bool:
+        """Withdraw a job no worker took yet; returns False once a worker has it."""
+        with self._lock:
+            if self._state == "claimed":
+                return False
+            self._state = "withdrawn"
+            return True
+
+    def finish(self, result):
+        self.result = result
+        self.done.set()
+
+
+class WorkerPool:
+    """
+    Keep warm Nuke processes rendering the jobs clients send to the pool address.
+    Every worker runs the Nuke launcher script in its job loop (nuke/main.py --worker): it
+    connects back to the pool, renders one job at a time and clears the script between jobs.
+    A job no worker takes within the wait its client asked for (see submit_job) is handed back
+    as unavailable, and the client launches Nuke itself.
+    A worker is replaced by a fresh process after max_worker_jobs jobs, when its RSS went over
+    max_worker_rss_mb, or when it died.
+
+    Args:
+        address (str): Pool address, see get_pool_address.
+        launch_worker (callable): Called with the address workers connect to; runs one worker
+            process and returns when it exits.
+        workers (int): Number of worker processes.
+        max_worker_jobs (int): Jobs rendered by a worker before it is recycled.
+        max_worker_rss_mb (float, optional): RSS in MB above which a worker is recycled after its job.
+    """
+
+    def __init__(self, address, launch_worker, workers=DEFAULT_WORKERS, max_worker_jobs=DEFAULT_MAX_WORKER_JOBS,
+                 max_worker_rss_mb=None):
+        if workers < 1 or max_worker_jobs < 1:
+            raise ValueError("--workers and --max-worker-jobs must be positive")
+        self.address = address
+        self.launch_worker = launch_worker
+        self.workers = workers
+        self.max_worker_jobs = max_worker_jobs
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self._jobs = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._connected = 0
+        self.stats = {"succeeded": 0, "failed": 0, "recycled": 0, "started": time.time()}
+
+    def serve(self):
+        """
+        Start the workers and serve clients until stopped by a stop request or Ctrl+C.
+
+        Raises:
+            RuntimeError: If a pool is already running on the address.
+        """
+        if request(self.address, {"type": "ping"}) is not None:
+            raise RuntimeError(f"A worker pool is already running on {self.address}")
+        listener, bound = create_listener(self.address)
+        logger.info(f"Worker pool listening on {bound} with {self.workers} Nuke workers")
+
+        threads = [threading.Thread(target=self._supervise, args=(index, bound), name=f"pool-worker-{index}",
+                                    daemon=True) for index in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            logger.info("Stopping the worker pool after the running jobs")
+        finally:
+            with self._lock:
+                self._stop.set()
+            listener.close()
+            if os.path.exists(self.address) and not TCP_ADDRESS.match(self.address):
+                os.remove(self.address)
+            self._fail_pending()
+            for thread in threads:
+                thread.join()
+            logger.info(f"Worker pool stopped: {self.stats['succeeded']} jobs succeeded, "
+                        f"{self.stats['failed']} failed, {self.stats['recycled']} workers recycled")
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "address": self.address,
+                "workers": self.workers,
+                "connected": self._connected,
+                "busy": self._busy,
+                "queued": self._jobs.qsize(),
+                "succeeded": self.stats["succeeded"],
+                "failed": self.stats["failed"],
+                "recycled": self.stats["recycled"],
+                "uptime": round(time.time() - self.stats["started"]),
+            }
+
+    def _fail_pending(self):
+        """Hand the jobs no worker took back to their clients, which launch Nuke themselves."""
+        while True:
+            try:
+                self._jobs.get_nowait().finish({"status": "unavailable"})
+            except queue.Empty:
+                return
+
+    def _supervise(self, index, bound):
+        """Run worker process index, relaunching it whenever it exits, until the pool stops."""
+        delay = RELAUNCH_DELAY
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                self.launch_worker(bound)
+            except Exception as e:
+                logger.error(f"Nuke worker {index} failed: {e}")
+            if self._stop.is_set():
+                return
+            if time.time() - started < MIN_WORKER_LIFETIME:
+                logger.warning(f"Nuke worker {index} exited after {time.time() - started:.0f}s, relaunching in {delay:.0f}s")
+                self._stop.wait(delay)
+                delay = min(delay * 2, MAX_RELAUNCH_DELAY)
+            else:
+                delay = RELAUNCH_DELAY
+
+    def _handle_connection(self, conn):
+        with conn, conn.makefile("rwb") as stream:
+            try:
+                message = read_message(stream)
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            kind = message.get("type")
+            try:
+                if kind == "worker":
+                    self._serve_worker(conn, stream, message)
+                elif kind == "job":
+                    pending = PendingJob(message["job"])
+                    with self._lock:
+                        if self._stop.is_set():
+                            pending.finish({"status": "unavailable"})
+                        else:
+                            self._jobs.put(pending)
+                    if not pending.done.wait(message.get("wait")) and pending.withdraw():
+                        logger.info(f"No free worker for {pending.job.get('dst')}, the client launches Nuke")
+                        pending.finish({"status": "unavailable"})
+                    pending.done.wait()
+                    send_message(stream, pending.result)
+                elif kind == "status":
+                    send_message(stream, self.status())
+                elif kind == "stop":
+                    self._stop.set()
+                    send_message(stream, {"status": "stopping"})
+                else:
+                    send_message(stream, {"status": "ok"})
+            except OSError as e:
+                logger.warning(f"Worker pool connection lost: {e}")
+
+    def _serve_worker(self, conn, stream, hello):
+        """Send jobs to a connected worker until it is recycled, dies or the pool stops."""
+        pid = hello.get("pid")
+        jobs = 0
+        with self._lock:
+            self._connected += 1
+        logger.info(f"Nuke worker {pid} ready")
+        try:
+            while not self._stop.is_set():
+                if _is_closed(conn):
+                    logger.warning(f"Nuke worker {pid} exited")
+                    return
+                try:
+                    pending = self._jobs.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if not pending.claim():
+                    continue
+                if not self._run_job(pid, stream, pending):
+                    return
+                jobs += 1
+                rss_mb = pending.result.get("rss_mb") or 0
+                if jobs >= self.max_worker_jobs or (self.max_worker_rss_mb and rss_mb > self.max_worker_rss_mb):
+                    logger.info(f"Recycling Nuke worker {pid} after {jobs} jobs ({rss_mb:.0f} MB RSS)")
+                    with self._lock:
+                        self.stats["recycled"] += 1
+                    break
+            send_message(stream, {"type": "stop"})
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._connected -= 1
+
+    def _run_job(self, pid, stream, pending) -> bool:
+        """Render a job on a worker. Returns False when the worker was lost."""
+        with self._lock:
+            self._busy += 1
+        try:
+            try:
+                send_message(stream, {"type": "job", "job": pending.job})
+            except OSError:
+                # Never reached the worker, another one takes it.
+                pending.release()
+                self._jobs.put(pending)
+                return False
+            try:
+                result = read_message(stream)
+            except (OSError, ValueError):
+                result = None
+            if result is None:
+                pending.finish({"status": "failed", "error": f"Nuke worker {pid} exited during the job", "pid": pid,
+                                "transient": True})
+                with self._lock:
+                    self.stats["failed"] += 1
+                return False
+            result["pid"] = pid
+            pending.finish(result)
+            with self._lock:
+                self.stats["succeeded" if result.get("status") == "succeeded" else "failed"] += 1
+            logger.info(f"Worker {pid}: {pending.job.get('dst')} {result.get('status')} in {result.get('seconds')}s")
+            return True
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+
+def report_pool(address, action="status"):
+    """
+    Log the workers and job counts of the pool running on address ("status"), or ask it to
+    stop once its running jobs are done ("stop").
+
+    Args:
+        address (str): Pool address, see get_pool_address.
+        action (str): "status" or "stop".
+
+    Raises:
+        PoolError: If the pool closed the connection before replying.
+    """
+    reply = request(address, {"type": action})
+    if reply is None:
+        logger.info(f"No worker pool running on {address}")
+    elif action == "stop":
+        logger.info(f"Worker pool on {address} stopping after its running jobs")
+    else:
+        logger.info(f"Worker pool {reply['address']}, up {reply['uptime']}s")
+        logger.info(f"  workers: {reply['connected']} of {reply['workers']} ready, {reply['busy']} busy, "
+                    f"{reply['queued']} jobs waiting")
+        logger.info(f"  jobs: {reply['succeeded']} succeeded, {reply['failed']} failed, "
+                    f"{reply['recycled']} workers recycled")
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mvl_make_dailies.chunked_render import (DEFAULT_GOP_SIZE, align_chunk_size, create_segment_dir, find_ffmpeg,
+                                             get_common_gop_size, get_gop_size, get_segment_path, split_frame_range)
+
+
+class GopSizeTest(unittest.TestCase):
+
+    def test_gop_size(self):
+        self.assertEqual(get_gop_size({}), DEFAULT_GOP_SIZE)
+        self.assertEqual(get_gop_size({"mov64_codec": "h264", "mov64_gop_size": 24}), 24)
+        self.assertEqual(get_gop_size({"mov64_codec": "appr", "mov64_gop_size": 24}), 24)
+        for codec in ("prores_ks", "apch", "DNxHD", "mjpeg"):
+            with self.subTest(codec=codec):
+                self.assertEqual(get_gop_size({"mov64_codec": codec, "mov64_gop_size": 24}), 1)
+
+    def test_common_gop_size(self):
+        self.assertEqual(get_common_gop_size([]), 1)
+        self.assertEqual(get_common_gop_size([{"mov64_gop_size": 12}, {"mov64_gop_size": 8},
+                                              {"mov64_codec": "prores_ks"}]), 24)
+
+    def test_align_chunk_size(self):
+        self.assertEqual(align_chunk_size(100, 12), 108)
+        self.assertEqual(align_chunk_size(96, 12), 96)
+        self.assertEqual(align_chunk_size(5, 12), 12)
+        self.assertEqual(align_chunk_size(7, 1), 7)
+
+
+class SplitFrameRangeTest(unittest.TestCase):
+
+    def assertContiguous(self, segments, frame_range):
+        self.assertEqual([frame for segment in segments for frame in segment], list(frame_range))
+
+    def test_chunks(self):
+        segments = split_frame_range(range(1001, 1101), chunks=4)
+        self.assertEqual(segments, [range(1001, 1026), range(1026, 1051), range(1051, 1076), range(1076, 1101)])
+
+    def test_uneven_chunks(self):
+        segments = split_frame_range(range(1000, 1101), chunks=4)
+        self.assertEqual([len(segment) for segment in segments], [26, 26, 26, 23])
+        self.assertContiguous(segments, range(1000, 1101))
+
+    def test_segments_start_on_keyframes(self):
+        frame_range = range(1000, 1241)
+        segments = split_frame_range(frame_range, chunks=4, gop_size=12)
+        self.assertContiguous(segments, frame_range)
+        for segment in segments:
+            self.assertEqual((segment.start - frame_range.start) % 12, 0)
+        self.assertEqual([len(segment) for segment in segments], [72, 72, 72, 25])
+
+    def test_chunk_size_takes_precedence(self):
+        segments = split_frame_range(range(1, 101), chunks=2, chunk_size=30, gop_size=12)
+        self.assertEqual(segments, [range(1, 37), range(37, 73), range(73, 101)])
+
+    def test_fewer_frames_than_chunks(self):
+        self.assertEqual(split_frame_range(range(1, 4), chunks=8), [range(1, 2), range(2, 3), range(3, 4)])
+        self.assertEqual(split_frame_range(range(1, 4), chunks=8, gop_size=12), [range(1, 4)])
+
+    def test_no_split(self):
+        self.assertEqual(split_frame_range(range(1, 11)), [range(1, 11)])
+        self.assertEqual(split_frame_range(range(1, 11), chunks=0), [range(1, 11)])
+        self.assertEqual(split_frame_range(range(0)), [])
+
+    def test_negative_frames(self):
+        segments = split_frame_range(range(-10, 10), chunks=2)
+        self.assertEqual(segments, [range(-10, 0), range(0, 10)])
+
+
+class SegmentFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_segment_dir_is_hidden_next_to_the_output(self):
+        output = os.path.join(self.directory, "dailies", "sh010.mov")
+        segment_dir = create_segment_dir(output)
+        self.assertEqual(os.path.dirname(segment_dir), os.path.dirname(output))
+        self.assertTrue(os.path.basename(segment_dir).startswith(".sh010_segments_"))
+        self.assertNotEqual(create_segment_dir(output), segment_dir)
+        self.assertTrue(os.path.basename(create_segment_dir(output, "frames")).startswith(".sh010_frames_"))
+
+    def test_segment_paths_sort_in_playback_order(self):
+        paths = [get_segment_path("/tmp/seg", index) for index in (0, 2, 10)]
+        self.assertEqual(paths, sorted(paths))
+        self.assertEqual(get_segment_path("/tmp/seg", 3, output=1), "/tmp/seg/segment.0003.output1.mov")
+
+    def test_find_ffmpeg(self):
+        with mock.patch.dict(os.environ, {"MVL_FFMPEG": "/opt/ffmpeg/bin/ffmpeg"}):
+            self.assertEqual(find_ffmpeg(), "/opt/ffmpeg/bin/ffmpeg")
+        with mock.patch.dict(os.environ, {"MVL_FFMPEG": ""}), mock.patch("shutil.which", return_value=None):
+            with self.assertRaises(FileNotFoundError):
+                find_ffmpeg()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import functools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mvl_make_dailies import movie_commands
+from mvl_make_dailies.follow import FrameFollower
+
+from test_preflight import exr_file
+
+POLL_INTERVAL = 0.05
+STABLE_AGE = 0.2
+
+
+def write_frame(directory, frame, height=64):
+    with open(os.path.join(directory, f"shot.{frame}.exr"), "wb") as f:
+        f.write(exr_file(3, height))
+
+
+def write_frames_later(directory, frames, delay=0.3):
+    """Write frames from a thread after delay seconds, as a renderer still running would."""
+    def write():
+        time.sleep(delay)
+        for frame in frames:
+            write_frame(directory, frame)
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+class FrameFollowerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pattern = os.path.join(self.directory, "shot.####.exr")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def follower(self, **kwargs):
+        kwargs.setdefault("timeout", 5)
+        return FrameFollower(self.pattern, poll_interval=POLL_INTERVAL, stable_age=STABLE_AGE, **kwargs)
+
+    def test_given_first_frame_is_waited_for(self):
+        writer = write_frames_later(self.directory, [1001])
+        follower = self.follower(first=1001, last=1001)
+        self.assertEqual(follower.wait_for_first(), 1001)
+        writer.join()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "shot.1001.exr")))
+
+    def test_first_frame_defaults_to_the_first_to_appear(self):
+        writer = write_frames_later(self.directory, [1005, 1006])
+        self.assertEqual(self.follower().wait_for_first(), 1005)
+        writer.join()
+
+    def test_missing_first_frame_times_out(self):
+        follower = self.follower(first=1001, timeout=0.2)
+        self.assertIsNone(follower.wait_for_first())
+        self.assertTrue(follower.timed_out)
+
+    def test_frames_are_yielded_in_order_until_last(self):
+        writer = write_frames_later(self.directory, range(1001, 1005))
+        frames = list(self.follower(first=1001, last=1004).iter_frames())
+        writer.join()
+        self.assertEqual(frames, [1001, 1002, 1003, 1004])
+
+    def test_finished_sequence_stops_at_the_first_missing_frame(self):
+        for frame in (1001, 1002, 1004):
+            write_frame(self.directory, frame)
+        finished = threading.Event()
+        finished.set()
+        follower = self.follower(first=1001, last=1004, finished=finished)
+        self.assertEqual(list(follower.iter_frames()), [1001, 1002])
+        self.assertTrue(follower.stopped)
+
+
+class RenderFollowingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.jobs = []
+        patches = [
+            # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+            mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator")),
+            mock.patch.object(movie_commands, "FrameFollower",
+                              functools.partial(FrameFollower, poll_interval=POLL_INTERVAL, stable_age=STABLE_AGE)),
+            mock.patch.object(movie_commands, "find_ffmpeg", return_value="ffmpeg"),
+            mock.patch.object(movie_commands, "build_nuke_job", side_effect=self.build_nuke_job),
+            mock.patch.object(movie_commands, "build_previews_payload", return_value=None),
+            mock.patch.object(movie_commands, "get_job_gop_size", return_value=1),
+            mock.patch.object(movie_commands, "run_nuke_job"),
+            mock.patch.object(movie_commands, "concat_job_segments"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_nuke_job(self, args_dict, frame_range):
+        self.jobs.append(args_dict)
+        return {"dst": os.path.join(self.directory, "daily.mov"), "write": {}, "first": frame_range.start}
+
+    def test_headers_are_read_from_a_first_frame_rendered_later(self):
+        args_dict = {
+            "input": os.path.join(self.directory, "shot.####.exr"),
+            "output": os.path.join(self.directory, "daily.mov"),
+            "first": 1001,
+            "last": 1004,
+            "format": movie_commands.AUTO_FORMAT,
+            "cache_dir": os.path.join(self.directory, "cache"),
+            "chunk_size": 2,
+            "max_parallel": 1,
+        }
+        writer = write_frames_later(self.directory, range(1001, 1005))
+        movie_commands.render_following(args_dict)
+        writer.join()
+
+        self.assertEqual(len(self.jobs), 1)
+        self.assertEqual(self.jobs[0]["f_resolution"], "4x64")
+        self.assertNotEqual(self.jobs[0]["format"], movie_commands.AUTO_FORMAT)
+        segments = [call.args[0] for call in movie_commands.run_nuke_job.call_args_list]
+        self.assertEqual([(job["render_first"], job["render_last"]) for job in segments], [(1001, 1002), (1003, 1004)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+import yaml
+
+from mvl_make_dailies.generate_movie import get_trace_path
+from mvl_make_dailies.knob_schema import load_knob_schema
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules make_movie --help and argument errors must not import, see benchmarks/bench_startup.py.
+LAZY_MODULES = ("logging", "tempfile", "socket", "uuid", "threading", "mvl_make_dailies.tracing",
+                "mvl_make_dailies.sequence_utils", "mvl_make_dailies.movie_commands", "rez", "mvl_rezboot",
+                "mvl_core_pipeline")
+
+CHILD_SCRIPT = """
+import io, sys, json, contextlib
+from mvl_make_dailies import generate_movie
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    try:
+        generate_movie.main(json.loads(sys.argv[1]))
+    except SystemExit:
+        pass
+print(json.dumps(sorted(name for name in json.loads(sys.argv[2]) if name in sys.modules)))
+"""
+
+
+class TracePathTest(unittest.TestCase):
+
+    def test_trace_path(self):
+        self.assertEqual(get_trace_path(["daily", "--trace", "/tmp/run.json", "--input", "a"]), "/tmp/run.json")
+        self.assertEqual(get_trace_path(["daily", "--trace=/tmp/run.json"]), "/tmp/run.json")
+        self.assertIsNone(get_trace_path(["daily", "--input", "a"]))
+        self.assertIsNone(get_trace_path(["daily", "--trace"]))
+
+
+class StartupImportsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        # Fill the knob schema cache, as a previous make_movie run would, so the child process
+        # does not need the config system.
+        config_path = os.path.join(REPO_ROOT, "configs", "knobs_template.yaml")
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        load_knob_schema(config_path, lambda: config, cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def imported(self, argv):
+        env = dict(os.environ, PYTHONPATH=os.path.join(REPO_ROOT, "python"), REZ_MVL_MAKE_DAILIES_ROOT=REPO_ROOT,
+                   MVL_MAKE_DAILIES_CACHE_DIR=self.cache_dir)
+        env.pop("MVL_MAKE_DAILIES_TRACE", None)
+        output = subprocess.check_output([sys.executable, "-c", CHILD_SCRIPT, json.dumps(argv), json.dumps(LAZY_MODULES)],
+                                         env=env, universal_newlines=True)
+        return json.loads(output.strip().splitlines()[-1])
+
+    def test_help_and_argument_errors_stay_light(self):
+        for argv in (["--help"], ["daily"]):
+            with self.subTest(argv=argv):
+                self.assertEqual(self.imported(argv), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
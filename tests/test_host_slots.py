@@ -0,0 +1,71 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mvl_make_dailies.host_slots import DCC_LIMITS_ENV, dcc_slot, get_dcc_limits, parse_dcc_limits
+
+
+class DccLimitsTest(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_dcc_limits(["nuke=4", " Maya = 2 ,houdini=0", ""]), {"nuke": 4, "maya": 2, "houdini": 0})
+        with self.assertRaises(ValueError):
+            parse_dcc_limits(["nuke"])
+
+    def test_overrides(self):
+        with mock.patch.dict(os.environ, {DCC_LIMITS_ENV: "nuke=3,maya=2"}):
+            self.assertEqual(get_dcc_limits(["nuke=1"]), {"nuke": 1, "maya": 2})
+        with mock.patch.dict(os.environ, {DCC_LIMITS_ENV: ""}):
+            self.assertEqual(get_dcc_limits(), {"nuke": 2})
+
+
+class DccSlotTest(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_slots_are_shared_up_to_the_limit(self):
+        limits = {"nuke": 2}
+        with dcc_slot("nuke", limits, self.cache_dir) as first, dcc_slot("nuke", limits, self.cache_dir) as second:
+            self.assertEqual({first, second}, {0, 1})
+            waited = []
+
+            def third():
+                started = time.time()
+                with dcc_slot("nuke", limits, self.cache_dir, poll_interval=0.05) as slot:
+                    waited.append((slot, time.time() - started))
+
+            thread = threading.Thread(target=third)
+            thread.start()
+            time.sleep(0.3)
+            self.assertEqual(waited, [])
+        thread.join()
+        self.assertGreaterEqual(waited[0][1], 0.3)
+
+    def test_tools_map_to_their_dcc(self):
+        with dcc_slot("hython", {"houdini": 1}, self.cache_dir) as slot:
+            self.assertEqual(slot, 0)
+            lock_files = [name for _root, _dirs, files in os.walk(self.cache_dir) for name in files]
+            self.assertEqual(lock_files, ["houdini.0.lock"])
+
+    def test_unlimited_dcc(self):
+        with dcc_slot("nuke", {"nuke": 0}, self.cache_dir) as slot:
+            self.assertIsNone(slot)
+        with dcc_slot("blender", {}, self.cache_dir) as slot:
+            self.assertIsNone(slot)
+
+
+if __name__ == "__main__":
+    unittest.main()
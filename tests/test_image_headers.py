@@ -0,0 +1,176 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from mvl_make_dailies import image_headers
+from mvl_make_dailies.image_headers import (ImageHeader, format_size, nuke_format_for, read_header,
+                                            read_sequence_headers, summarize_headers)
+from mvl_make_dailies.sequence_utils import FrameSet
+
+from test_preflight import exr_attribute, exr_file, exr_header
+
+
+def dpx_file(width, height, descriptor=50, aspect=(1, 1), timecode=0xFFFFFFFF) -> bytes:
+    """Big endian DPX file and image headers, without pixels."""
+    data = bytearray(2048)
+    data[:4] = b"SDPX"
+    struct.pack_into(">II", data, 772, width, height)
+    data[800] = descriptor
+    struct.pack_into(">II", data, 1628, *aspect)
+    struct.pack_into(">I", data, 1920, timecode)
+    return bytes(data)
+
+
+def png_chunk(chunk_type, value) -> bytes:
+    return struct.pack(">I", len(value)) + chunk_type + value + b"\0" * 4
+
+
+def png_file(width, height, color_type=2, density=None) -> bytes:
+    content = b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+    if density:
+        content += png_chunk(b"pHYs", struct.pack(">IIB", *density, 0))
+    return content + png_chunk(b"IDAT", b"\0" * 8)
+
+
+def jpeg_file(width, height, components=3, density=(1, 1), progressive=False) -> bytes:
+    app0 = b"JFIF\0" + bytes([1, 1]) + struct.pack(">BHH", 0, *density) + b"\0\0"
+    sof = struct.pack(">BHHB", 8, height, width, components) + b"\0" * 3 * components
+    return (b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", len(app0) + 2) + app0
+            + (b"\xff\xc2" if progressive else b"\xff\xc0") + struct.pack(">H", len(sof) + 2) + sof)
+
+
+def header(width, height, pixel_aspect=1.0) -> ImageHeader:
+    box = (0, 0, width - 1, height - 1)
+    return ImageHeader("exr", width, height, box, box, "R,G,B", "zip", pixel_aspect, None)
+
+
+class ReadHeaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_exr(self):
+        result = read_header(self.write("shot.1001.exr", exr_file(3, 8)))
+        self.assertEqual(result, ImageHeader("exr", 4, 8, (0, 0, 3, 7), (0, 0, 3, 7), "R", "zip", 1.0, None))
+
+    def test_exr_aspect_and_timecode(self):
+        content = exr_header(7, 8)[:-1] \
+            + exr_attribute("pixelAspectRatio", "float", struct.pack("<f", 2.0)) \
+            + exr_attribute("timeCode", "timecode", struct.pack("<II", 0x01020304, 0)) + b"\0"
+        result = read_header(self.write("shot.1001.exr", content))
+        self.assertEqual((result.compression, result.pixel_aspect, result.timecode), ("b44a", 2.0, "01:02:03:04"))
+
+    def test_dpx(self):
+        result = read_header(self.write("shot.1001.dpx", dpx_file(2048, 1556, timecode=0x01020304)))
+        self.assertEqual(result, ImageHeader("dpx", 2048, 1556, (0, 0, 2047, 1555), (0, 0, 2047, 1555),
+                                             "RGB", "none", 1.0, "01:02:03:04"))
+        result = read_header(self.write("shot.1002.dpx", dpx_file(720, 576, descriptor=51, aspect=(59, 54))))
+        self.assertEqual((result.channels, result.pixel_aspect, result.timecode), ("RGBA", 1.0926, None))
+
+    def test_png(self):
+        result = read_header(self.write("shot.1001.png", png_file(1920, 1080, color_type=6)))
+        self.assertEqual((result.file_format, result.width, result.height, result.channels, result.pixel_aspect),
+                         ("png", 1920, 1080, "RGBA", 1.0))
+        result = read_header(self.write("shot.1002.png", png_file(1920, 1080, density=(1000, 2000))))
+        self.assertEqual(result.pixel_aspect, 2.0)
+
+    def test_jpeg(self):
+        result = read_header(self.write("shot.1001.jpg", jpeg_file(1280, 720)))
+        self.assertEqual((result.file_format, result.width, result.height, result.channels, result.compression),
+                         ("jpeg", 1280, 720, "RGB", "baseline"))
+        result = read_header(self.write("shot.1002.jpg", jpeg_file(1280, 720, components=1, progressive=True)))
+        self.assertEqual((result.channels, result.compression), ("Y", "progressive"))
+
+    def test_unreadable_files(self):
+        self.assertIsNone(read_header(os.path.join(self.directory, "missing.exr")))
+        self.assertIsNone(read_header(self.write("empty.exr", b"")))
+        self.assertIsNone(read_header(self.write("notes.txt", b"not an image")))
+        self.assertIsNone(read_header(self.write("truncated.exr", exr_header(3, 8)[:40])))
+        self.assertIsNone(read_header(self.write("truncated.jpg", b"\xff\xd8\xff\xe0")))
+
+
+class ReadSequenceHeadersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.pattern = os.path.join(self.directory, "shot.####.exr")
+        for frame in range(1001, 1004):
+            self.write(frame, exr_file(3, 8))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, frame, content):
+        with open(self.pattern.replace("####", f"{frame:04d}"), "wb") as f:
+            f.write(content)
+
+    def read(self, frames=range(1001, 1005)):
+        return read_sequence_headers(self.pattern, frames, cache_dir=self.cache_dir, workers=2)
+
+    def test_headers(self):
+        headers = self.read()
+        self.assertEqual(sorted(headers), [1001, 1002, 1003, 1004])
+        self.assertEqual({headers[frame].height for frame in range(1001, 1004)}, {8})
+        self.assertIsNone(headers[1004])
+
+    def test_only_changed_frames_are_read_again(self):
+        first = self.read()
+        self.write(1002, exr_file(3, 16))
+        with mock.patch.object(image_headers, "read_header", wraps=read_header) as read:
+            headers = self.read()
+        self.assertEqual([call.args[0] for call in read.call_args_list], [self.pattern.replace("####", "1002")])
+        self.assertEqual(headers[1001], first[1001])
+        self.assertEqual(headers[1002].height, 16)
+
+    def test_invalid_path(self):
+        with self.assertRaises(ValueError):
+            read_sequence_headers(os.path.join(self.directory, "shot.exr"), [1], cache_dir=self.cache_dir)
+
+
+class SummarizeHeadersTest(unittest.TestCase):
+
+    def test_common_resolution(self):
+        headers = {1001: header(1920, 1080), 1002: header(1920, 1080), 1003: header(2048, 1080),
+                   1004: None, 1005: header(1920, 1080, 2.0), 1006: header(1920, 1080)}
+        reference, mismatched = summarize_headers(headers)
+        self.assertIs(reference, headers[1001])
+        self.assertEqual(mismatched, FrameSet([(1003, 1003), (1005, 1005)]))
+
+    def test_no_readable_frame(self):
+        self.assertEqual(summarize_headers({1001: None}), (None, FrameSet()))
+
+
+class NukeFormatTest(unittest.TestCase):
+
+    def test_builtin_formats(self):
+        self.assertEqual(nuke_format_for(header(1920, 1080)), "HD_1080")
+        self.assertEqual(nuke_format_for(header(720, 576, 1.09)), "PAL")
+        self.assertEqual(format_size("HD_1080"), (1920, 1080, 1.0))
+
+    def test_custom_formats(self):
+        self.assertEqual(nuke_format_for(header(1998, 1080)), "1998 1080 1 MVL_1998x1080")
+        value = nuke_format_for(header(1920, 1080, 2.0))
+        self.assertEqual(value, "1920 1080 2 MVL_1920x1080_2")
+        self.assertEqual(format_size(value), (1920, 1080, 2.0))
+        self.assertEqual(nuke_format_for(header(1828, 1556, 1.5)), "1828 1556 1.5 MVL_1828x1556_1p5")
+
+    def test_unknown_format(self):
+        self.assertIsNone(format_size("not_a_format"))
+        self.assertIsNone(format_size(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
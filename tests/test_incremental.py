@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mvl_make_dailies.incremental import (SLATE_SEGMENT, find_dirty_segments, get_segment_file, get_segment_store_dir,
+                                          plan_segments, write_manifest)
+
+
+class DirtySegmentsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.segment_dir = get_segment_store_dir(os.path.join(self.directory, "sh010.mov"))
+        os.makedirs(self.segment_dir)
+        # Slate frame 1000, source frames 1001-1100.
+        for frame in range(1001, 1101):
+            self.write_frame(frame)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_frame(self, frame, content=b"frame"):
+        with open(os.path.join(self.directory, f"sh010.{frame:04d}.exr"), "wb") as f:
+            f.write(content)
+
+    def job(self, **overrides):
+        job = {
+            "src": os.path.join(self.directory, "sh010.####.exr"),
+            "dst": os.path.join(self.directory, "sh010.mov"),
+            "first": 1000,
+            "last": 1100,
+            "slate": {"slate": True, "f_version": "v001"},
+            "read": {},
+            "burnin": {"f_show": "GEN63"},
+            "write": {"mov64_codec": "h264"},
+        }
+        job.update(overrides)
+        return job
+
+    def render(self, job):
+        """Plan the segments of a job and record them as rendered, as render_incremental does."""
+        segments = plan_segments(job, 25, 1)
+        for segment in segments:
+            open(get_segment_file(self.segment_dir, segment), "w").close()
+        open(job["dst"], "w").close()
+        write_manifest(job, segments)
+        return segments
+
+    def dirty(self, job):
+        return [segment["name"] for segment in find_dirty_segments(job, plan_segments(job, 25, 1), self.segment_dir)]
+
+    def test_plan(self):
+        segments = plan_segments(self.job(), 25, 1)
+        self.assertEqual([(segment["name"], segment["first"], segment["last"]) for segment in segments], [
+            (SLATE_SEGMENT, 1000, 1000), ("0000", 1001, 1025), ("0001", 1026, 1050), ("0002", 1051, 1075),
+            ("0003", 1076, 1100)])
+        # Segments keep their boundaries on a grid aligned on the GOP.
+        self.assertEqual([segment["first"] for segment in plan_segments(self.job(), 25, 12)], [1000, 1001, 1037, 1073])
+
+    def test_first_render_renders_everything(self):
+        self.assertEqual(len(self.dirty(self.job())), 5)
+
+    def test_unchanged_movie_is_clean(self):
+        self.render(self.job())
+        self.assertEqual(self.dirty(self.job()), [])
+
+    def test_rerendered_frames_dirty_their_segments(self):
+        self.render(self.job())
+        self.write_frame(1030, b"rerendered frame")
+        self.write_frame(1100, b"rerendered frame")
+        # The slate shows a thumbnail of the source, it is rendered again too.
+        self.assertEqual(self.dirty(self.job()), [SLATE_SEGMENT, "0001", "0003"])
+
+    def test_missing_frame_dirties_its_segment(self):
+        self.render(self.job())
+        os.remove(os.path.join(self.directory, "sh010.1060.exr"))
+        self.assertEqual(self.dirty(self.job()), [SLATE_SEGMENT, "0002"])
+
+    def test_slate_change_only_dirties_the_slate(self):
+        self.render(self.job())
+        self.assertEqual(self.dirty(self.job(slate={"slate": True, "f_version": "v002"})), [SLATE_SEGMENT])
+
+    def test_movie_payload_change_dirties_everything(self):
+        self.render(self.job())
+        for overrides in ({"burnin": {"f_show": "GEN64"}}, {"write": {"mov64_codec": "prores_ks"}},
+                          {"read": {"bad_frames": "1050"}}):
+            with self.subTest(overrides=overrides):
+                self.assertEqual(len(self.dirty(self.job(**overrides))), 5)
+
+    def test_longer_range_adds_segments(self):
+        self.render(self.job())
+        for frame in range(1101, 1111):
+            self.write_frame(frame)
+        self.assertEqual(self.dirty(self.job(last=1110)), [SLATE_SEGMENT, "0004"])
+
+    def test_moved_poster_frame_dirties_its_segments(self):
+        previews = {"poster_frame": 1050, "first": 1001, "last": 1100, "interval": 10, "columns": 10, "tile_width": 160}
+        self.render(self.job(previews=previews))
+        self.assertEqual(self.dirty(self.job(previews=dict(previews, columns=5))), [])
+        self.assertEqual(self.dirty(self.job(previews=dict(previews, poster_frame=1080))), ["0001", "0003"])
+        self.assertEqual(len(self.dirty(self.job(previews=dict(previews, interval=5)))), 4)
+
+    def test_deleted_segment_is_rendered_again(self):
+        segments = self.render(self.job())
+        os.remove(get_segment_file(self.segment_dir, segments[2]))
+        self.assertEqual(self.dirty(self.job()), ["0001"])
+
+    def test_deleted_movie_renders_everything(self):
+        self.render(self.job())
+        os.remove(self.job()["dst"])
+        self.assertEqual(len(self.dirty(self.job())), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
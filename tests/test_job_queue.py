@@ -0,0 +1,150 @@
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from mvl_make_dailies import job_queue
+from mvl_make_dailies.common_utils import LaunchError
+from mvl_make_dailies.job_queue import (FAILED, QUEUED, RETRY_DELAY, RUNNING, SUCCEEDED, JobQueue, run_queued_job,
+                                        work_queue)
+
+
+class JobQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = JobQueue(os.path.join(self.directory, "jobs.sqlite"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def counts(self):
+        return {status: sum(modes.values()) for status, modes in self.queue.status()["counts"].items()}
+
+    def test_claim_order(self):
+        low = self.queue.enqueue("daily", {"input": "a"})
+        high = self.queue.enqueue("daily", {"input": "b"}, priority=10)
+        later_low = self.queue.enqueue("daily", {"input": "c"})
+        claimed = [self.queue.claim("worker")["id"] for _ in range(3)]
+        self.assertEqual(claimed, [high, low, later_low])
+        self.assertIsNone(self.queue.claim("worker"))
+
+    def test_claimed_job(self):
+        self.queue.enqueue("daily", {"input": "a.####.exr", "first": 1001}, max_attempts=5)
+        job = self.queue.claim("worker")
+        self.assertEqual((job["mode"], job["args"], job["attempts"], job["max_attempts"]),
+                         ("daily", {"input": "a.####.exr", "first": 1001}, 1, 5))
+        self.assertEqual(self.counts(), {RUNNING: 1})
+        self.queue.complete(job["id"])
+        self.assertEqual(self.counts(), {SUCCEEDED: 1})
+        self.assertEqual(self.queue.status()["succeeded"], 1)
+
+    def test_retry_backs_off(self):
+        self.queue.enqueue("daily", {}, max_attempts=3)
+        now = 1000000.0
+        with mock.patch.object(job_queue.time, "time", return_value=now):
+            job = self.queue.claim("worker")
+            self.assertTrue(self.queue.fail(job["id"], "no licence", retry=True))
+            # Not runnable before the retry delay.
+            self.assertIsNone(self.queue.claim("worker"))
+            self.assertTrue(self.queue.has_pending())
+
+        with mock.patch.object(job_queue.time, "time", return_value=now + RETRY_DELAY):
+            job = self.queue.claim("worker")
+            self.assertEqual(job["attempts"], 2)
+            self.assertTrue(self.queue.fail(job["id"], "no licence", retry=True))
+            self.assertIsNone(self.queue.claim("worker"))
+
+        with mock.patch.object(job_queue.time, "time", return_value=now + RETRY_DELAY * 3):
+            job = self.queue.claim("worker")
+            self.assertEqual(job["attempts"], 3)
+            # Out of attempts.
+            self.assertFalse(self.queue.fail(job["id"], "no licence", retry=True))
+        self.assertEqual(self.counts(), {FAILED: 1})
+        self.assertFalse(self.queue.has_pending())
+
+    def test_failure_without_retry(self):
+        self.queue.enqueue("daily", {})
+        job = self.queue.claim("worker")
+        self.assertFalse(self.queue.fail(job["id"], "invalid job"))
+        self.assertEqual(self.counts(), {FAILED: 1})
+
+    def test_jobs_of_dead_workers_are_requeued(self):
+        for _ in range(3):
+            self.queue.enqueue("daily", {})
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        host = socket.gethostname()
+        self.queue.claim(f"{host}:{process.pid}")
+        self.queue.claim(f"{host}:{os.getpid()}")
+        self.queue.claim(f"other-host:{process.pid}")
+        self.assertEqual(self.queue.requeue_orphans(), 1)
+        self.assertEqual(self.counts(), {QUEUED: 1, RUNNING: 2})
+
+    def test_concurrent_claims_take_distinct_jobs(self):
+        for index in range(40):
+            self.queue.enqueue("daily", {"index": index})
+        claimed = []
+
+        def work():
+            queue = JobQueue(self.queue.path)
+            while True:
+                job = queue.claim()
+                if job is None:
+                    return
+                claimed.append(job["id"])
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(claimed), list(range(1, 41)))
+
+
+class RunQueuedJobTest(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.directory = tempfile.mkdtemp()
+        self.queue = JobQueue(os.path.join(self.directory, "jobs.sqlite"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_job(self, error):
+        self.queue.enqueue("daily", {"input": "in.####.exr", "output": "out.mov"}, max_attempts=3)
+        job = self.queue.claim("worker")
+        run_queued_job(self.queue, job, {"daily": mock.Mock(side_effect=error)})
+        return self.queue.status()["counts"]
+
+    def test_success(self):
+        self.assertEqual(self.run_job(None), {SUCCEEDED: {"daily": 1}})
+
+    def test_transient_failure_is_queued_again(self):
+        self.assertEqual(self.run_job(LaunchError("no licence")), {QUEUED: {"daily": 1}})
+
+    def test_job_error_fails_right_away(self):
+        self.assertEqual(self.run_job(LaunchError("bad template", transient=False)), {FAILED: {"daily": 1}})
+        self.assertEqual(self.run_job(ValueError("invalid job")), {FAILED: {"daily": 2}})
+
+    def test_drained_queue(self):
+        for index in range(5):
+            self.queue.enqueue("daily", {"index": index})
+        rendered = []
+        work_queue(self.queue, {"daily": lambda args: rendered.append(args["index"])}, workers=2, drain=True)
+        self.assertEqual(sorted(rendered), list(range(5)))
+        self.assertFalse(self.queue.has_pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
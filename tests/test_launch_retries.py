@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+import unittest
+from unittest import mock
+
+from mvl_make_dailies import movie_commands
+from mvl_make_dailies.host_slots import DCC_LIMITS_ENV
+from mvl_make_dailies.movie_commands import LaunchError, get_parallel_budget, render_frame_chunks
+
+
+class LaunchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+
+class RenderFrameChunksTest(LaunchTestCase):
+
+    def render(self, launch_chunk, chunks=(range(1, 3), range(3, 5)), **args):
+        args.setdefault("dcc_limit", ["houdini=1"])
+        render_frame_chunks(list(chunks), launch_chunk, args, "houdini")
+
+    def test_transient_failures_are_retried(self):
+        attempts = []
+
+        def launch_chunk(chunk, threads):
+            attempts.append(chunk.start)
+            if attempts.count(chunk.start) == 1 and chunk.start == 3:
+                raise LaunchError("killed by signal 9")
+
+        self.render(launch_chunk)
+        self.assertEqual(attempts, [1, 3, 3])
+
+    def test_transient_failures_give_up_after_the_retries(self):
+        launch_chunk = mock.Mock(side_effect=LaunchError("no licence"))
+        with self.assertRaises(LaunchError) as raised:
+            self.render(launch_chunk, chunks=[range(1, 3)], chunk_retries=1)
+        self.assertEqual(launch_chunk.call_count, 2)
+        self.assertTrue(raised.exception.transient)
+
+    def test_job_errors_fail_fast(self):
+        def fail(chunk, threads):
+            time.sleep(0.1)
+            raise LaunchError("bad scene", transient=False)
+
+        launch_chunk = mock.Mock(side_effect=fail)
+        with self.assertRaises(LaunchError) as raised:
+            self.render(launch_chunk, chunks=[range(1, 3), range(3, 5), range(5, 7)], chunk_retries=2)
+        # No chunk is rendered again, and the chunks not started yet are dropped.
+        chunks = [call.args[0] for call in launch_chunk.call_args_list]
+        self.assertEqual(len(chunks), len(set(chunks)))
+        self.assertLess(len(chunks), 3)
+        self.assertFalse(raised.exception.transient)
+
+
+class ParallelBudgetTest(LaunchTestCase):
+
+    def budget(self, dcc, count, **args):
+        with mock.patch.dict(os.environ, {DCC_LIMITS_ENV: ""}), mock.patch("os.cpu_count", return_value=32):
+            return get_parallel_budget(args, dcc, count, default=32)
+
+    def test_chunks_split_the_cores(self):
+        self.assertEqual(self.budget("houdini", 4), (4, 8))
+        self.assertEqual(self.budget("maya", 64), (32, 1))
+        self.assertEqual(self.budget("houdini", 4, max_parallel=2), (2, 16))
+
+    def test_dcc_limit_caps_the_processes(self):
+        self.assertEqual(self.budget("nuke", 4), (2, 16))
+        self.assertEqual(self.budget("houdini", 4, dcc_limit=["houdini=1"]), (1, 32))
+
+
+class LaunchToolTest(LaunchTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.resolver = mock.Mock()
+        modules = {"rez": mock.Mock(), "rez.exceptions": mock.Mock(PackageCommandError=OSError),
+                   "mvl_rezboot": mock.Mock(), "mvl_rezboot.resolver": mock.Mock(Resolver=self.resolver)}
+        for patch in (mock.patch.dict("sys.modules", modules),
+                      mock.patch.object(movie_commands, "dcc_slot", return_value=mock.MagicMock())):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def launch(self, exit_code):
+        cache = mock.Mock(**{"run_tool.return_value": exit_code})
+        with mock.patch.object(movie_commands, "get_rez_context_cache", return_value=cache):
+            movie_commands.launch_tool("nuke", [], {"rez_cache": True})
+
+    def test_resolver_by_default(self):
+        with mock.patch.object(movie_commands, "get_rez_context_cache") as get_cache:
+            movie_commands.launch_tool("nuke", ["-t", "launcher.py"])
+        self.resolver.assert_called_once_with("nuke -t launcher.py")
+        self.resolver.return_value.run.assert_called_once_with()
+        get_cache.assert_not_called()
+
+    def test_exit_codes(self):
+        self.launch(0)
+        for exit_code, transient in ((1, True), (-9, True), (movie_commands.RENDER_ERROR_EXIT_CODE, True),
+                                     (movie_commands.JOB_ERROR_EXIT_CODE, False)):
+            with self.subTest(exit_code=exit_code):
+                with self.assertRaises(LaunchError) as raised:
+                    self.launch(exit_code)
+                self.assertEqual(raised.exception.transient, transient)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import struct
+import shutil
+import tempfile
+import unittest
+
+from mvl_make_dailies.preflight import (EXR_MAGIC, CORRUPT, MISSING, TOO_SMALL, check_frame, preflight_sequence,
+                                        _exr_scanline_chunks)
+
+# Scanlines per chunk of every EXR compression, from the OpenEXR file layout.
+EXPECTED_LINES_PER_CHUNK = {
+    0: 1,     # NO_COMPRESSION
+    1: 1,     # RLE
+    2: 1,     # ZIPS
+    3: 16,    # ZIP
+    4: 32,    # PIZ
+    5: 16,    # PXR24
+    6: 32,    # B44
+    7: 32,    # B44A
+    8: 32,    # DWAA
+    9: 256,   # DWAB
+}
+
+
+def exr_attribute(name, type_name, value) -> bytes:
+    return name.encode() + b"\0" + type_name.encode() + b"\0" + struct.pack("<i", len(value)) + value
+
+
+def exr_header(compression, height, width=4, version=2) -> bytes:
+    """Single-part scanline EXR header up to the end of the attributes, the offset table follows."""
+    return (EXR_MAGIC + struct.pack("<I", version)
+            + exr_attribute("channels", "chlist", b"R\0" + struct.pack("<iBBBBii", 1, 0, 0, 0, 0, 1, 1) + b"\0")
+            + exr_attribute("compression", "compression", bytes([compression]))
+            + exr_attribute("dataWindow", "box2i", struct.pack("<iiii", 0, 0, width - 1, height - 1))
+            + exr_attribute("displayWindow", "box2i", struct.pack("<iiii", 0, 0, width - 1, height - 1))
+            + b"\0")
+
+
+def exr_file(compression, height, chunk_bytes=16, drop_bytes=0) -> bytes:
+    """A complete EXR with one chunk of chunk_bytes per EXPECTED_LINES_PER_CHUNK scanlines."""
+    header = exr_header(compression, height)
+    lines = EXPECTED_LINES_PER_CHUNK[compression]
+    chunks = (height + lines - 1) // lines
+    data_start = len(header) + chunks * 8
+    chunk_size = 8 + chunk_bytes
+    table = b"".join(struct.pack("<Q", data_start + index * chunk_size) for index in range(chunks))
+    data = b"".join(struct.pack("<ii", index * lines, chunk_bytes) + b"\0" * chunk_bytes for index in range(chunks))
+    content = header + table + data
+    return content[:len(content) - drop_bytes] if drop_bytes else content
+
+
+class ExrChunkTableTest(unittest.TestCase):
+
+    def test_chunk_count_per_compression(self):
+        for compression, lines in EXPECTED_LINES_PER_CHUNK.items():
+            for height in (1, 31, 32, 33, 1080):
+                with self.subTest(compression=compression, height=height):
+                    header = exr_header(compression, height)
+                    chunks, table_offset = _exr_scanline_chunks(header)
+                    self.assertEqual(chunks, (height + lines - 1) // lines)
+                    self.assertEqual(table_offset, len(header))
+
+    def test_tiled_and_multipart_are_skipped(self):
+        self.assertIsNone(_exr_scanline_chunks(exr_header(3, 64, version=2 | 0x200)))
+        self.assertIsNone(_exr_scanline_chunks(exr_header(3, 64, version=2 | 0x1000)))
+
+    def test_unknown_compression_is_skipped(self):
+        self.assertIsNone(_exr_scanline_chunks(exr_header(42, 64)))
+
+    def test_incomplete_header_is_skipped(self):
+        header = exr_header(3, 64)
+        self.assertIsNone(_exr_scanline_chunks(header[:40]))
+
+
+class CheckFrameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_valid_exr_of_every_compression(self):
+        for compression in EXPECTED_LINES_PER_CHUNK:
+            with self.subTest(compression=compression):
+                path = self.write(f"valid_{compression}.exr", exr_file(compression, 100))
+                self.assertEqual(check_frame(path), (None, None))
+
+    def test_truncated_exr(self):
+        path = self.write("truncated.exr", exr_file(7, 100, drop_bytes=4))
+        self.assertEqual(check_frame(path)[0], CORRUPT)
+
+    def test_missing_empty_and_foreign_frames(self):
+        self.assertEqual(check_frame(os.path.join(self.directory, "missing.exr"))[0], MISSING)
+        self.assertEqual(check_frame(self.write("empty.exr", b""))[0], TOO_SMALL)
+        self.assertEqual(check_frame(self.write("small.exr", b"x" * 10), min_size=100)[0], TOO_SMALL)
+        self.assertEqual(check_frame(self.write("text.exr", b"not an exr file"))[0], CORRUPT)
+
+    def test_truncated_png_and_jpeg(self):
+        png = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+        self.assertEqual(check_frame(self.write("good.png", png + b"IEND\xaeB`\x82")), (None, None))
+        self.assertEqual(check_frame(self.write("bad.png", png))[0], CORRUPT)
+        jpeg = b"\xff\xd8\xff\xe0" + b"\0" * 32
+        self.assertEqual(check_frame(self.write("good.jpg", jpeg + b"\xff\xd9")), (None, None))
+        self.assertEqual(check_frame(self.write("bad.jpg", jpeg))[0], CORRUPT)
+
+    def test_preflight_sequence_report(self):
+        for frame in (1001, 1002, 1004):
+            self.write(f"shot.{frame}.exr", exr_file(7, 64))
+        self.write("shot.1005.exr", exr_file(7, 64, drop_bytes=4))
+        report = preflight_sequence(os.path.join(self.directory, "shot.####.exr"), range(1001, 1006))
+        self.assertEqual({item["frame"]: item["status"] for item in report["bad"]}, {1003: MISSING, 1005: CORRUPT})
+        self.assertEqual((report["checked"], report[MISSING], report[CORRUPT]), (5, "1003", "1005"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from mvl_make_dailies.rez_context_cache import RezContextCache, get_tool_request
+
+
+class PackageRequest:
+    """Stand-in for rez.utils.formatting.PackageRequest, only the name is used."""
+
+    def __init__(self, request):
+        self.name = request.lstrip("~!").split("-")[0].split("<")[0].split(">")[0].split("=")[0]
+
+
+class RezContextCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_tool_request(self):
+        modules = {"rez": mock.Mock(), "rez.utils": mock.Mock(),
+                   "rez.utils.formatting": mock.Mock(PackageRequest=PackageRequest)}
+        environ = {"REZ_USED_REQUEST": "mvl_make_dailies-2 nuke-14 ocio_configs ~python-3"}
+        with mock.patch.dict("sys.modules", modules), mock.patch.dict(os.environ, environ):
+            self.assertEqual(get_tool_request("nuke"), ["nuke", "mvl_make_dailies-2", "ocio_configs", "~python-3"])
+            self.assertEqual(get_tool_request("hython"), ["houdini", "mvl_make_dailies-2", "nuke-14", "ocio_configs",
+                                                          "~python-3"])
+
+    def test_threads_share_one_context(self):
+        cache = RezContextCache(self.cache_dir)
+        results = []
+
+        def get_contexts():
+            results.extend(cache.get_context(["nuke"]) for _ in range(50))
+
+        with mock.patch.object(RezContextCache, "_key", return_value="key"), \
+                mock.patch.object(RezContextCache, "_load_valid", side_effect=lambda key: object()):
+            threads = [threading.Thread(target=get_contexts) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual((cache.hits, cache.misses), (400, 0))
+        self.assertEqual(len({id(context) for context in results}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
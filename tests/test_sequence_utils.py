@@ -0,0 +1,166 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from mvl_make_dailies.sequence_utils import (FrameSet, Sequence, find_sequence, iter_sequences, match_sequence,
+                                             parse_sequence_path)
+
+
+class FrameSetTest(unittest.TestCase):
+
+    def test_ranges_are_sorted_and_merged(self):
+        frames = FrameSet([(1010, 1020), (1001, 1005), (1006, 1008), (1015, 1030)])
+        self.assertEqual(frames.ranges, ((1001, 1008), (1010, 1030)))
+        self.assertEqual((frames.first, frames.last, len(frames)), (1001, 1030, 29))
+        self.assertEqual(frames.frame_range, range(1001, 1031))
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            FrameSet([(1010, 1001)])
+
+    def test_gaps(self):
+        frames = FrameSet.from_frames([1001, 1002, 1004, 1007, 1008])
+        self.assertTrue(frames.has_gaps())
+        self.assertEqual(str(frames), "1001-1002,1004,1007-1008")
+        self.assertEqual(list(frames.missing()), [1003, 1005, 1006])
+        self.assertIn(1004, frames)
+        self.assertNotIn(1005, frames)
+        self.assertNotIn(1000, frames)
+        self.assertFalse(FrameSet([(1, 10)]).has_gaps())
+
+    def test_unsorted_frames(self):
+        frames = list(range(1, 5001)) + list(range(6001, 7001))
+        random.Random(7).shuffle(frames)
+        self.assertEqual(FrameSet.from_frames(frames).ranges, ((1, 5000), (6001, 7000)))
+
+    def test_sparse_frames_beyond_the_bitmap(self):
+        frames = FrameSet.from_frames([1, 2, 3, 1 << 30, 5])
+        self.assertEqual(frames.ranges, ((1, 3), (5, 5), (1 << 30, 1 << 30)))
+
+    def test_negative_frames(self):
+        frames = FrameSet.from_frames([-3, -2, -1, 0, 1, 5])
+        self.assertEqual(frames.ranges, ((-3, 1), (5, 5)))
+        self.assertEqual((frames.first, frames.last), (-3, 5))
+        self.assertEqual(list(frames.missing()), [2, 3, 4])
+
+    def test_string_round_trip(self):
+        for value in ("1001-1050,1052,1054-1100", "-10--5,-3,0-2", "-1", ""):
+            with self.subTest(value=value):
+                self.assertEqual(str(FrameSet.from_string(value)), value)
+        self.assertEqual(FrameSet.from_string(" 1-3 , 5 "), FrameSet([(1, 3), (5, 5)]))
+
+    def test_empty(self):
+        frames = FrameSet()
+        self.assertFalse(frames)
+        self.assertEqual((frames.first, frames.last, len(frames)), (None, None, 0))
+        self.assertEqual(frames.frame_range, range(0))
+
+    def test_union(self):
+        self.assertEqual(FrameSet([(1, 3)]).union(FrameSet([(4, 6), (9, 9)])), FrameSet([(1, 6), (9, 9)]))
+
+
+class ParseSequencePathTest(unittest.TestCase):
+
+    def test_padding_styles(self):
+        for file_name, padding in (("shot.####.exr", 4), ("shot.@@@.exr", 3), ("shot.%04d.exr", 4),
+                                   ("shot.%d.exr", 1), ("shot.$F4.exr", 4), ("shot.$F.exr", 1)):
+            with self.subTest(file_name=file_name):
+                self.assertEqual(parse_sequence_path(os.path.join("/renders", file_name)),
+                                 ("/renders", "shot.", padding, "exr"))
+
+    def test_frame_path(self):
+        self.assertEqual(parse_sequence_path("/renders/shot_v001.01001.exr"), ("/renders", "shot_v001.", 5, "exr"))
+        self.assertEqual(parse_sequence_path("shot.1001.jpg"), ("", "shot.", 4, "jpg"))
+
+    def test_no_frame_number(self):
+        self.assertIsNone(parse_sequence_path("/renders/shot.exr"))
+        self.assertIsNone(parse_sequence_path("/renders/shot.mov.bak"))
+
+
+class IterSequencesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def touch(self, *names):
+        for name in names:
+            open(os.path.join(self.directory, name), "w").close()
+
+    def sequences(self, **kwargs):
+        return {os.path.basename(seq.pattern): str(seq.frames) for seq in iter_sequences(self.directory, **kwargs)}
+
+    def test_sequences_are_split_by_prefix_extension_and_padding(self):
+        self.touch("shot.01001.exr", "shot.01002.exr", "shot.1001.jpg", "shot_matte.1001.exr",
+                   "shot.001.exr", "shot.002.exr", "notes.txt", "shot.exr")
+        os.mkdir(os.path.join(self.directory, "shot.01003.exr"))
+        self.assertEqual(self.sequences(), {
+            "shot.###.exr": "1-2",
+            "shot.#####.exr": "1001-1002",
+            "shot.####.jpg": "1001",
+            "shot_matte.####.exr": "1001",
+        })
+
+    def test_frames_without_leading_zero_join_the_widest_fitting_padding(self):
+        # "1001" is what both shot.##.exr and shot.####.exr write for frame 1001.
+        self.touch("shot.01.exr", "shot.02.exr", "shot.1001.exr", "shot.00005.exr")
+        self.assertEqual(self.sequences(), {"shot.##.exr": "1-2,1001", "shot.#####.exr": "5"})
+
+    def test_gaps_and_frames_past_the_padding(self):
+        self.touch("shot.0998.exr", "shot.0999.exr", "shot.1000.exr", "shot.1002.exr", "shot.10000.exr")
+        self.assertEqual(self.sequences(), {"shot.####.exr": "998-1000,1002,10000"})
+
+    def test_unpadded_frames(self):
+        self.touch("shot.8.exr", "shot.9.exr", "shot.10.exr", "shot.11.exr")
+        self.assertEqual(self.sequences(), {"shot.#.exr": "8-11"})
+
+    def test_extensions_filter(self):
+        self.touch("shot.1001.exr", "shot.1001.JPG")
+        self.assertEqual(self.sequences(extensions=("jpg",)), {"shot.####.JPG": "1001"})
+
+    def test_negative_frames_are_part_of_the_prefix(self):
+        # The scanner only reads unsigned frame numbers: a minus sign stays in the prefix.
+        self.touch("shot.-001.exr", "shot.0000.exr", "shot.0001.exr")
+        self.assertEqual(self.sequences(), {"shot.-###.exr": "1", "shot.####.exr": "0-1"})
+
+    def test_stats(self):
+        self.touch("shot.1001.exr", "notes.txt")
+        stats = {}
+        list(iter_sequences(self.directory, stats=stats))
+        self.assertEqual(stats, {"entries": 2})
+
+    def test_find_and_match_sequence(self):
+        self.touch("shot.1001.exr", "shot.1002.exr", "plate.1001.exr", "plate.01001.exr")
+        self.assertEqual(str(find_sequence(os.path.join(self.directory, "shot.####.exr")).frames), "1001-1002")
+        # A single sequence of another padding still matches.
+        self.assertEqual(find_sequence(os.path.join(self.directory, "shot.%02d.exr")).padding, 4)
+        sequences = list(iter_sequences(self.directory))
+        with self.assertRaises(ValueError):
+            match_sequence(os.path.join(self.directory, "plate.###.exr"), sequences)
+        with self.assertRaises(ValueError):
+            match_sequence(os.path.join(self.directory, "other.####.exr"), sequences)
+        with self.assertRaises(ValueError):
+            find_sequence(os.path.join(self.directory, "missing", "shot.####.exr"))
+
+
+class SequenceTest(unittest.TestCase):
+
+    def test_paths(self):
+        sequence = Sequence("/renders", "shot.", 4, "exr", FrameSet([(998, 1001)]))
+        self.assertEqual(sequence.pattern, "/renders/shot.####.exr")
+        self.assertEqual(sequence.printf_pattern, "/renders/shot.%04d.exr")
+        self.assertEqual(sequence.frame_path(999), "/renders/shot.0999.exr")
+        self.assertEqual(sequence.frame_path(12345), "/renders/shot.12345.exr")
+
+    def test_dict_round_trip(self):
+        sequence = Sequence("/renders", "shot.", 4, "exr", FrameSet([(-5, -1), (3, 9)]))
+        restored = Sequence.from_dict("/renders", sequence.to_dict())
+        self.assertEqual((restored.key, restored.frames), (sequence.key, sequence.frames))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mvl_make_dailies.watcher import DailiesWatcher, PollingWatcher, watch_roots
+
+
+class WatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def touch(self, *names):
+        for name in names:
+            open(os.path.join(self.root, name), "w").close()
+
+    def test_missing_root(self):
+        with self.assertRaises(FileNotFoundError):
+            watch_roots([os.path.join(self.root, "missing")], mock.Mock())
+
+    def test_settled_sequence_is_dispatched_once(self):
+        dispatched = []
+        watcher = DailiesWatcher(PollingWatcher([self.root], interval=0.05),
+                                 lambda *paths: dispatched.append(paths), settle=0.2)
+        thread = threading.Thread(target=watcher.run, kwargs={"duration": 1.0})
+        thread.start()
+        time.sleep(0.1)
+        # Frames land over several polls, the daily waits until the last one settled.
+        for frame in range(1001, 1004):
+            self.touch(f"shot.{frame}.exr")
+            time.sleep(0.05)
+        thread.join()
+        self.assertEqual(dispatched, [(os.path.join(self.root, "shot.####.exr"),
+                                       os.path.join(self.root, "dailies", "shot.mov"))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from mvl_make_dailies.worker_pool import (WorkerPool, connect, read_message, report_pool, request, send_message,
+                                          submit_job)
+
+
+def run_fake_worker(address, render_seconds=0.0):
+    """Job loop of nuke/main.py serve_worker, rendering every job in render_seconds."""
+    with connect(address) as conn, conn.makefile("rwb") as stream:
+        send_message(stream, {"type": "worker", "pid": os.getpid()})
+        while True:
+            message = read_message(stream)
+            if message is None or message.get("type") != "job":
+                return
+            time.sleep(render_seconds)
+            send_message(stream, {"type": "result", "status": "succeeded", "error": None, "seconds": render_seconds})
+
+
+class WorkerPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        # The pipeline logger comes from mvl_core_pipeline, which the tests do not need.
+        patch = mock.patch("mvl_make_dailies.common_utils.get_logger", return_value=logging.getLogger("movie_generator"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.directory = tempfile.mkdtemp()
+        self.address = os.path.join(self.directory, "nuke.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def start_pool(self, launch_worker, workers=1):
+        pool = WorkerPool(self.address, launch_worker, workers=workers)
+        thread = threading.Thread(target=pool.serve)
+        thread.start()
+
+        def stop():
+            pool.stop()
+            thread.join()
+        self.addCleanup(stop)
+        deadline = time.time() + 5
+        while request(self.address, {"type": "ping"}) is None:
+            self.assertLess(time.time(), deadline, "the pool did not start")
+            time.sleep(0.05)
+        return pool
+
+    def test_jobs_render_in_workers(self):
+        self.start_pool(run_fake_worker)
+        result = submit_job(self.address, {"dst": "sh010.mov"})
+        self.assertEqual(result["status"], "succeeded")
+        self.assertEqual(result["pid"], os.getpid())
+
+    def test_job_without_free_worker_is_handed_back(self):
+        # The only worker stays busy with the first job for longer than the second job waits.
+        self.start_pool(lambda address: run_fake_worker(address, render_seconds=1.0))
+        first = threading.Thread(target=submit_job, args=(self.address, {"dst": "sh010.mov"}))
+        first.start()
+        time.sleep(0.2)
+        started = time.time()
+        self.assertIsNone(submit_job(self.address, {"dst": "sh020.mov"}, wait=0.2))
+        self.assertLess(time.time() - started, 0.9)
+        first.join()
+
+    def test_job_taken_by_a_worker_is_waited_for(self):
+        self.start_pool(lambda address: run_fake_worker(address, render_seconds=0.5))
+        time.sleep(0.2)
+        result = submit_job(self.address, {"dst": "sh010.mov"}, wait=0.1)
+        self.assertEqual(result["status"], "succeeded")
+
+    def test_report_and_stop(self):
+        with self.assertLogs("movie_generator", "INFO") as logs:
+            report_pool(self.address)
+        self.assertIn("No worker pool running", logs.output[0])
+
+        self.start_pool(run_fake_worker)
+        submit_job(self.address, {"dst": "sh010.mov"})
+        with self.assertLogs("movie_generator", "INFO") as logs:
+            report_pool(self.address, "status")
+        self.assertTrue(any("jobs: 1 succeeded, 0 failed" in line for line in logs.output))
+        report_pool(self.address, "stop")
+        deadline = time.time() + 5
+        while request(self.address, {"type": "ping"}) is not None:
+            self.assertLess(time.time(), deadline, "the pool did not stop")
+            time.sleep(0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()